@@ -0,0 +1,43 @@
+"""Compares loading past years from calendarweek folders with loading them from year archives.
+
+the load is a full load_weeks like init_manager without a date window does it,
+the files are the directory entries the data directory needs.
+
+    python -m benchmarks.bench_archive --years 5 --repeat 5
+"""
+from argparse import ArgumentParser
+from os import walk
+from os.path import join
+from tempfile import TemporaryDirectory
+
+from src.Tagesgericht import FolderStorage
+from benchmarks.bench_storage import measure
+from benchmarks.synthetic_data import WEEKDAY_MAP, create_synthetic_tree
+
+
+def count_entries(data_dir: str) -> int:
+    return sum(len(dirnames) + len(filenames) for _, dirnames, filenames in walk(data_dir))
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp_dir:
+        data_dir = join(tmp_dir, "Data")
+        files = create_synthetic_tree(data_dir=data_dir, first_year=2015, years=args.years)
+        storage = FolderStorage(data_dir=data_dir, weekday_map=WEEKDAY_MAP, translate={})
+        print("{} day files in {} years".format(files, args.years))
+        print("{:10s} {:>10s} {:>12s}".format("", "entries", "load_weeks"))
+        folders = measure(call=storage.load_weeks, repeat=args.repeat)
+        print("{:10s} {:10d} {:10.3f}ms".format("folders", count_entries(data_dir=data_dir), folders * 1000))
+        for year in range(2015, 2015 + args.years):
+            storage.archive_year(year=str(year))
+        archives = measure(call=storage.load_weeks, repeat=args.repeat)
+        print("{:10s} {:10d} {:10.3f}ms".format("archives", count_entries(data_dir=data_dir), archives * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Measures time and peak memory of exporting the whole history as ndjson and as a single json document.
+
+the export is written to a temporary file like a cron job redirecting stdout, json.dumps of a list of all
+items is measured as the comparison that holds the whole document in memory.
+
+    python -m benchmarks.bench_export --years 10
+"""
+import tracemalloc
+from argparse import ArgumentParser
+from json import dumps
+from os.path import join
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from src.Tagesgericht import TagesgerichtManager
+from benchmarks.synthetic_data import WEEKDAY_MAP, create_synthetic_tree
+
+
+def measure(call) -> list:
+    tracemalloc.start()
+    start = perf_counter()
+    call()
+    duration = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return [duration, peak]
+
+
+def dump_list(cwm: TagesgerichtManager, path: str) -> None:
+    with open(path, mode="w", encoding="utf-8") as file:
+        file.write(dumps([item.get_export() for item in cwm.iter_items()], ensure_ascii=False))
+
+
+def export(cwm: TagesgerichtManager, path: str, export_format: str) -> None:
+    with open(path, mode="w", encoding="utf-8") as file:
+        cwm.export_items(output=file, export_format=export_format)
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, default=10)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp_dir:
+        data_dir = join(tmp_dir, "Data")
+        files = create_synthetic_tree(data_dir=data_dir, first_year=2010, years=args.years)
+        cwm = TagesgerichtManager(active_days=[0, 1, 2, 3, 4], data_dir=data_dir,
+                                  translation={"weekday_map": WEEKDAY_MAP}, specialdays={}, credentials={})
+        path = join(tmp_dir, "export")
+        print("{} day files in {} years".format(files, args.years))
+        for name, call in [("ndjson", lambda: export(cwm=cwm, path=path, export_format="ndjson")),
+                           ("json", lambda: export(cwm=cwm, path=path, export_format="json")),
+                           ("json list", lambda: dump_list(cwm=cwm, path=path))]:
+            duration, peak = measure(call=call)
+            print("{:10s} {:10.2f}ms {:10.2f}MB peak".format(name, duration * 1000, peak / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Compares creating the html dashboard with sphinx against the built-in html renderer.
+
+the sphinx path is create_rst_data plus a html build of the report, it is only measured if sphinx is installed.
+the built-in path is create_html_data, which writes the same planned and history dashboard as one page.
+
+    python -m benchmarks.bench_html --years 5 --repeat 5
+"""
+from argparse import ArgumentParser
+from os.path import join
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from src.Tagesgericht import TagesgerichtManager, create_folder, write_file
+from benchmarks.bench_storage import measure
+from benchmarks.synthetic_data import WEEKDAY_MAP, create_synthetic_tree
+
+INDEX = """Tagesgericht
+============
+
+.. toctree::
+   :maxdepth: 2
+
+   report/planned_status
+   report/history
+"""
+
+
+def sphinx_report(cwm: TagesgerichtManager, source_dir: str) -> float:
+    from sphinx.cmd.build import build_main
+    start = perf_counter()
+    cwm.create_rst_data(stream=True)
+    build_main(["-q", "-b", "html", source_dir, join(source_dir, "_build")])
+    return perf_counter() - start
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp_dir:
+        data_dir = join(tmp_dir, "Data")
+        files = create_synthetic_tree(data_dir=data_dir, first_year=2015, years=args.years)
+        cwm = TagesgerichtManager(active_days=[0, 1, 2, 3, 4], data_dir=data_dir,
+                                  translation={"weekday_map": WEEKDAY_MAP}, specialdays={}, credentials={})
+        source_dir = join(tmp_dir, "sphinx")
+        cwm.report_build_folder = join(source_dir, "report")
+        cwm.html_build_folder = join(tmp_dir, "html-report")
+        print("{} day files in {} years".format(files, args.years))
+        html = measure(call=lambda: cwm.create_html_data(stream=True), repeat=args.repeat)
+        print("{:10s} {:10.2f}ms".format("built-in", html * 1000))
+        try:
+            import sphinx  # noqa: F401
+        except ImportError:
+            print("{:10s} {:>12s}".format("sphinx", "not installed"))
+            return
+        create_folder(dir_path=source_dir)
+        write_file(path=join(source_dir, "conf.py"), json=False, data="project = 'Tagesgericht'\n")
+        write_file(path=join(source_dir, "index.rst"), json=False, data=INDEX)
+        print("{:10s} {:10.2f}ms".format("sphinx", sphinx_report(cwm=cwm, source_dir=source_dir) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Compares the memory of the slotted calendar model with the former dataclass model.
+
+every site is a separate load of the same synthetic data directory, like several installations sharing one archive.
+the former model is rebuilt here as it was: dataclasses with a __dict__, one date object per item
+and the logentrys as the dicts read from log.json. memory is what tracemalloc sees retained after loading.
+
+    python -m benchmarks.bench_memory --years 10 --sites 3
+"""
+import tracemalloc
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from datetime import date, timedelta
+from gc import collect
+from os import listdir
+from os.path import join
+from tempfile import TemporaryDirectory
+from unicodedata import normalize
+
+from src.Tagesgericht import FolderStorage, IsoWeekTable, read_file
+from benchmarks.synthetic_data import WEEKDAY_MAP, create_synthetic_tree
+
+
+@dataclass
+class LegacyCalendaritem:
+    message: str
+    filepath: str
+    item_date: date
+    message_length: int
+    message_length_exceeded: bool
+    message_sendable: bool
+    message_icon: str
+    logentrys: list
+    specialday: str
+
+
+@dataclass
+class LegacyCalendarweek:
+    year: str
+    week: str
+    first_day_of_week: date
+    last_day_of_week: date
+    items: dict
+    week_icon: str
+
+
+def load_legacy(data_dir: str) -> dict:
+    weeks = {}
+    for year in listdir(data_dir):
+        for week in listdir(join(data_dir, year)):
+            week_dir = join(data_dir, year, week)
+            january_4th = date(int(year), 1, 4)
+            first_day = january_4th + timedelta(weeks=int(week) - 1, days=-january_4th.weekday())
+            cw_obj = LegacyCalendarweek(year=year, week=week, first_day_of_week=first_day,
+                                        last_day_of_week=first_day + timedelta(days=6), items={}, week_icon="")
+            logs = read_file(path=join(week_dir, "log.json"), json=True)
+            for filename in sorted(listdir(week_dir)):
+                if not filename.endswith(".txt"):
+                    continue
+                day_num = int(filename.split("_")[0])
+                message = normalize("NFC", read_file(path=join(week_dir, filename), json=False))
+                cw_obj.items[day_num] = LegacyCalendaritem(
+                    message=message, filepath=join(week_dir, filename), item_date=first_day + timedelta(days=day_num),
+                    message_length=len(message), message_length_exceeded=len(message) > 280,
+                    message_sendable=bool(message), message_icon="", logentrys=logs.get(str(day_num), []),
+                    specialday="")
+            weeks[(year, week)] = cw_obj
+    return weeks
+
+
+def load_current(data_dir: str) -> dict:
+    return FolderStorage(data_dir=data_dir, weekday_map=WEEKDAY_MAP, translate={}).load_weeks()
+
+
+def measure(load, data_dir: str, sites: int) -> int:
+    IsoWeekTable.tables = {}
+    collect()
+    tracemalloc.start()
+    loaded = [load(data_dir) for _ in range(sites)]
+    collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del loaded
+    return retained
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--sites", type=int, default=3)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp_dir:
+        data_dir = join(tmp_dir, "Data")
+        files = create_synthetic_tree(data_dir=data_dir, first_year=2012, years=args.years, days=args.days)
+        print("{} day files per site, {} sites".format(files, args.sites))
+        legacy = measure(load=load_legacy, data_dir=data_dir, sites=args.sites)
+        current = measure(load=load_current, data_dir=data_dir, sites=args.sites)
+        print("{:10s} {:10.2f}MB {:8.0f} bytes per day".format("dataclass", legacy / 2 ** 20, legacy / files / args.sites))
+        print("{:10s} {:10.2f}MB {:8.0f} bytes per day".format("slotted", current / 2 ** 20,
+                                                               current / files / args.sites))
+        print("saved {:.1f}%".format(100 - current * 100 / legacy))
+
+
+if __name__ == '__main__':
+    main()
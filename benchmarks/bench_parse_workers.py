@@ -0,0 +1,67 @@
+"""Compares serial and thread pool parsing of a synthetic data directory.
+
+slow storage like network shares or sd cards is simulated by adding a fixed latency to every file read.
+
+    python -m benchmarks.bench_parse_workers --years 5 --workers 8 --latency 0.002
+"""
+from argparse import ArgumentParser
+from tempfile import TemporaryDirectory
+from time import perf_counter, sleep
+
+import src.Tagesgericht as tagesgericht
+from benchmarks.synthetic_data import WEEKDAY_MAP, create_synthetic_tree
+
+
+def get_manager(data_dir: str, workers: int) -> tagesgericht.TagesgerichtManager:
+    return tagesgericht.TagesgerichtManager(
+        active_days=[0, 1, 2, 3, 4],
+        data_dir=data_dir,
+        translation={"weekday_map": WEEKDAY_MAP},
+        specialdays={},
+        credentials={},
+        parse_workers=workers,
+    )
+
+
+def measure(data_dir: str, workers: int, repeat: int) -> (float, dict):
+    cwm = get_manager(data_dir=data_dir, workers=workers)
+    best = None
+    result = {}
+    for _ in range(repeat):
+        start = perf_counter()
+        result = cwm.storage.load_weeks()
+        duration = perf_counter() - start
+        best = duration if best is None else min(best, duration)
+    return best, result
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.002, help="seconds added to every file read")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    original_read_file = tagesgericht.read_file
+
+    def slow_read_file(path: str, json: bool):
+        sleep(args.latency)
+        return original_read_file(path=path, json=json)
+
+    tagesgericht.read_file = slow_read_file
+    with TemporaryDirectory() as data_dir:
+        files = create_synthetic_tree(data_dir=data_dir, first_year=2015, years=args.years)
+        serial, serial_result = measure(data_dir=data_dir, workers=0, repeat=args.repeat)
+        parallel, parallel_result = measure(data_dir=data_dir, workers=args.workers, repeat=args.repeat)
+    tagesgericht.read_file = original_read_file
+
+    print("{} day files, {}s latency per read".format(files, args.latency))
+    print("serial:            {:8.3f}s".format(serial))
+    print("{:2d} workers:        {:8.3f}s".format(args.workers, parallel))
+    print("speedup:           {:8.2f}x".format(serial / parallel))
+    print("identical result:  {}".format(serial_result == parallel_result))
+
+
+if __name__ == '__main__':
+    main()
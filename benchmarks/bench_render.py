@@ -0,0 +1,53 @@
+"""Compares rendering calendarweeks to rst one after another, in a thread pool and in a process pool.
+
+every mode renders the same growing amount of weeks, the pool start is part of the time, like in create_rst_data
+where the report cache is empty. the crossovers of TagesgerichtManager.render_weeks are taken from this table.
+render_weeks only uses the thread pool on a python build without GIL, with GIL the threads column is serial.
+
+    python -m benchmarks.bench_render --years 40 --workers 4 --repeat 3
+"""
+from argparse import ArgumentParser
+from os.path import join
+from tempfile import TemporaryDirectory
+
+from src.Tagesgericht import TagesgerichtManager
+from benchmarks.bench_storage import measure
+from benchmarks.synthetic_data import WEEKDAY_MAP, create_synthetic_tree
+
+
+def render(cwm: TagesgerichtManager, weeks: list, render_crossover: int, process_crossover: int) -> None:
+    cwm.render_crossover = render_crossover
+    cwm.process_crossover = process_crossover
+    pools = {}
+    cwm.render_weeks(weeks=weeks, pools=pools)
+    for pool in pools.values():
+        pool.shutdown()
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp_dir:
+        data_dir = join(tmp_dir, "Data")
+        create_synthetic_tree(data_dir=data_dir, first_year=1990, years=args.years)
+        cwm = TagesgerichtManager(active_days=[0, 1, 2, 3, 4], data_dir=data_dir,
+                                  translation={"weekday_map": WEEKDAY_MAP}, specialdays={}, credentials={},
+                                  render_workers=args.workers)
+        weeks = list(cwm.iter_weeks())
+        modes = [("serial", 10 ** 9, 10 ** 9), ("threads", 0, 10 ** 9), ("processes", 0, 0)]
+        print("{:>6s}".format("weeks") + "".join("{:>12s}".format(name) for name, _, _ in modes))
+        amount = 32
+        while amount <= len(weeks):
+            times = [measure(call=lambda: render(cwm=cwm, weeks=weeks[:amount], render_crossover=render_crossover,
+                                                 process_crossover=process_crossover), repeat=args.repeat)
+                     for _, render_crossover, process_crossover in modes]
+            print("{:6d}".format(amount) + "".join("{:10.2f}ms".format(time * 1000) for time in times))
+            amount *= 2
+
+
+if __name__ == '__main__':
+    main()
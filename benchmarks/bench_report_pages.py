@@ -0,0 +1,70 @@
+"""Compares sphinx build times of the single page history with one page per calendarweek.
+
+for both layouts the report is built once from scratch, then one past calendarweek is changed
+and the report is created and built again, which is what happens after sending a message.
+needs sphinx from requirements.txt.
+
+    python -m benchmarks.bench_report_pages --years 5
+"""
+from argparse import ArgumentParser
+from datetime import date
+from os.path import join
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from sphinx.cmd.build import build_main
+
+from src.Tagesgericht import TagesgerichtManager, write_file
+from benchmarks.synthetic_data import WEEKDAY_MAP, create_synthetic_tree
+
+INDEX = """Tagesgericht
+============
+
+.. toctree::
+   :maxdepth: 2
+
+   report/planned_status
+   report/history
+"""
+
+
+def build(source_dir: str, build_dir: str) -> float:
+    start = perf_counter()
+    build_main(["-q", "-b", "html", source_dir, build_dir])
+    return perf_counter() - start
+
+
+def measure(data_dir: str, tmp_dir: str, pages: bool) -> list:
+    source_dir = join(tmp_dir, "pages" if pages else "single")
+    build_dir = join(source_dir, "_build")
+    cwm = TagesgerichtManager(active_days=[0, 1, 2, 3, 4], data_dir=data_dir,
+                              translation={"weekday_map": WEEKDAY_MAP}, specialdays={}, credentials={})
+    cwm.report_build_folder = join(source_dir, "report")
+    cwm.create_rst_data(stream=True, pages=pages)
+    write_file(path=join(source_dir, "conf.py"), json=False, data="project = 'Tagesgericht'\n")
+    write_file(path=join(source_dir, "index.rst"), json=False, data=INDEX)
+    full = build(source_dir=source_dir, build_dir=build_dir)
+    write_file(path=join(data_dir, "2016", "10", "0_Montag.txt"), json=False, data=str(date.today()) + str(pages))
+    start = perf_counter()
+    cwm.create_rst_data(stream=True, pages=pages)
+    report = perf_counter() - start
+    return [full, report + build(source_dir=source_dir, build_dir=build_dir)]
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp_dir:
+        data_dir = join(tmp_dir, "Data")
+        files = create_synthetic_tree(data_dir=data_dir, first_year=2015, years=args.years)
+        print("{} day files in {} years".format(files, args.years))
+        print("{:12s} {:>12s} {:>14s}".format("", "full build", "one week edit"))
+        for name, pages in [("single page", False), ("week pages", True)]:
+            full, rebuild = measure(data_dir=data_dir, tmp_dir=tmp_dir, pages=pages)
+            print("{:12s} {:11.2f}s {:13.2f}s".format(name, full, rebuild))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Compares rendering the history with the former string concatenation and with the RstWriter.
+
+the former path built every piece with += on growing strings and the underlines one character at a time,
+the writer streams the pieces into the report file. the time per week should stay flat with a growing history.
+
+    python -m benchmarks.bench_rst --years 12 --repeat 5
+"""
+from argparse import ArgumentParser
+from os.path import join
+from tempfile import TemporaryDirectory
+
+from src.Tagesgericht import RstWriter, TagesgerichtManager
+from benchmarks.bench_storage import measure
+from benchmarks.synthetic_data import WEEKDAY_MAP, create_synthetic_tree
+
+
+def legacy_line(string: str, linetype: str) -> str:
+    line = ""
+    for i in range(len(string) + 1):
+        line += linetype
+    return line
+
+
+def legacy_header(message: str, doubled: bool, linetype: str) -> str:
+    rst_line = legacy_line(string=message, linetype=linetype)
+    result = ""
+    if doubled:
+        result += rst_line + "\n"
+    result += message + "\n"
+    result += rst_line + "\n\n"
+    return result
+
+
+def legacy_quote(quote: str, message: str) -> str:
+    result = ""
+    result += ":{}:\n\n".format(quote)
+    for line in message.split("\n"):
+        result += "    {}\n".format(line.strip())
+    result += "\n"
+    return result
+
+
+def legacy_week(cwm: TagesgerichtManager, week) -> str:
+    ret = legacy_header(message="calendarweek {} {}".format(week.week, week.week_icon), doubled=True, linetype="=")
+    for day_num, day_data in sorted(week.items.items()):
+        day_header = "{}, {} {}".format(cwm.weekday_map.get(str(day_num)), day_data.item_date.strftime("%d.%m.%Y"),
+                                        day_data.message_icon)
+        ret += legacy_header(message=day_header, doubled=False, linetype="^")
+        has_been_sent = day_data.has_been_sent(translate=cwm.translate)
+        if has_been_sent:
+            ret += legacy_quote(quote="Info", message=has_been_sent)
+        ret += legacy_quote(quote="", message=day_data.message)
+    return ret
+
+
+def render_legacy(cwm: TagesgerichtManager, weeks: list, path: str) -> None:
+    history = ""
+    for week in weeks:
+        history += legacy_week(cwm=cwm, week=week)
+    with open(path, mode="w", encoding="utf-8") as file:
+        file.write(history)
+
+
+def render_writer(cwm: TagesgerichtManager, weeks: list, path: str) -> None:
+    with open(path, mode="w", encoding="utf-8") as file:
+        writer = RstWriter(output=file)
+        for week in weeks:
+            cwm.write_week_rst(week=week, writer=writer)
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp_dir:
+        data_dir = join(tmp_dir, "Data")
+        create_synthetic_tree(data_dir=data_dir, first_year=2010, years=args.years)
+        cwm = TagesgerichtManager(active_days=[0, 1, 2, 3, 4], data_dir=data_dir,
+                                  translation={"weekday_map": WEEKDAY_MAP}, specialdays={}, credentials={})
+        weeks = list(cwm.iter_weeks())
+        print("{:>6s} {:>12s} {:>12s} {:>14s} {:>14s}".format("weeks", "former", "writer", "former/week",
+                                                               "writer/week"))
+        amount = 65
+        while amount <= len(weeks):
+            times = [measure(call=lambda: render(cwm=cwm, weeks=weeks[:amount], path=join(tmp_dir, "history.rst")),
+                             repeat=args.repeat) for render in [render_legacy, render_writer]]
+            print("{:6d} {:10.2f}ms {:10.2f}ms {:12.1f}us {:12.1f}us".format(
+                amount, times[0] * 1000, times[1] * 1000, times[0] / amount * 10 ** 6, times[1] / amount * 10 ** 6))
+            amount *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Compares the folder storage with the SQLite storage on a synthetic data directory.
+
+startup is a full load of all calendarweeks, like init_manager does it,
+the queries are a single day, the current calendarweek and a four week report window.
+
+    python -m benchmarks.bench_storage --years 5 --repeat 20
+"""
+from argparse import ArgumentParser
+from datetime import timedelta
+from os.path import join
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from src.Tagesgericht import Calendarweek, FolderStorage, SQLiteStorage, migrate_storage
+from benchmarks.synthetic_data import WEEKDAY_MAP, create_synthetic_tree
+
+
+def measure(call, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = perf_counter()
+        call()
+        duration = perf_counter() - start
+        best = duration if best is None else min(best, duration)
+    return best
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp_dir:
+        data_dir = join(tmp_dir, "Data")
+        files = create_synthetic_tree(data_dir=data_dir, first_year=2015, years=args.years)
+        folder = FolderStorage(data_dir=data_dir, weekday_map=WEEKDAY_MAP, translate={})
+        sqlite = SQLiteStorage(path=join(tmp_dir, "tagesgericht.sqlite"), weekday_map=WEEKDAY_MAP)
+        start = perf_counter()
+        weeks = migrate_storage(source=folder, target=sqlite)
+        migration = perf_counter() - start
+
+        year, week = sorted(folder.list_weeks(), key=lambda key: (int(key[0]), int(key[1])))[-1]
+        last_day = Calendarweek(year=year, week=week).last_day_of_week
+        since, until = last_day - timedelta(weeks=4), last_day
+        queries = [
+            ("startup (load_weeks)", lambda storage: storage.load_weeks()),
+            ("load_day", lambda storage: storage.load_day(year=year, week=week, day_num=0)),
+            ("load_week", lambda storage: storage.load_week(year=year, week=week)),
+            ("4 week window", lambda storage: storage.load_weeks(since=since, until=until)),
+        ]
+        print("{} day files in {} calendarweeks, migration took {:.3f}s".format(files, weeks, migration))
+        print("{:22s} {:>12s} {:>12s}".format("", "folder", "sqlite"))
+        for name, query in queries:
+            folder_time = measure(call=lambda: query(folder), repeat=args.repeat)
+            sqlite_time = measure(call=lambda: query(sqlite), repeat=args.repeat)
+            print("{:22s} {:10.3f}ms {:10.3f}ms".format(name, folder_time * 1000, sqlite_time * 1000))
+        sqlite.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Compares the peak memory of a full history report from the data property with a streamed report.
+
+the report is print_data plus create_rst_data without a date window, the output goes to a temporary folder.
+run it with a growing amount of years, the streamed peak only grows by the cached ISO calendar of each year.
+
+    python -m benchmarks.bench_stream --years 5
+"""
+import tracemalloc
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+from io import StringIO
+from os.path import join
+from tempfile import TemporaryDirectory
+
+from src.Tagesgericht import TagesgerichtManager
+from benchmarks.synthetic_data import WEEKDAY_MAP, create_synthetic_tree
+
+
+def report(cwm: TagesgerichtManager, stream: bool) -> int:
+    tracemalloc.start()
+    with redirect_stdout(StringIO()):
+        if not stream:
+            cwm.data = cwm.load_weeks()
+        cwm.print_data(stream=stream)
+        cwm.create_rst_data(stream=stream)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    cwm.data = {}
+    return peak
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmp_dir:
+        data_dir = join(tmp_dir, "Data")
+        files = create_synthetic_tree(data_dir=data_dir, first_year=2015, years=args.years)
+        cwm = TagesgerichtManager(active_days=[0, 1, 2, 3, 4], data_dir=data_dir,
+                                  translation={"weekday_map": WEEKDAY_MAP}, specialdays={}, credentials={})
+        cwm.report_build_folder = join(tmp_dir, "report")
+        print("{} day files in {} years".format(files, args.years))
+        for name, stream in [("data", False), ("streamed", True)]:
+            print("{:10s} {:10.2f}MB peak".format(name, report(cwm=cwm, stream=stream) / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""Reports the syscalls the scandir based walker makes for a full parse and a report run,
+compared with the former listdir/isdir/isfile path.
+
+    python -m benchmarks.bench_walker --years 5
+"""
+from argparse import ArgumentParser
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from src.Tagesgericht import TagesgerichtManager
+from benchmarks.synthetic_data import WEEKDAY_MAP, create_synthetic_tree
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--manifest", action="store_true", help="enable the scan manifest")
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as data_dir:
+        files = create_synthetic_tree(data_dir=data_dir, first_year=2015, years=args.years)
+        cwm = TagesgerichtManager(
+            active_days=[0, 1, 2, 3, 4],
+            data_dir=data_dir,
+            translation={"weekday_map": WEEKDAY_MAP},
+            specialdays={},
+            credentials={},
+            scan_manifest=args.manifest,
+        )
+        start = perf_counter()
+        cwm.init_manager()
+        duration = perf_counter() - start
+        report = cwm.storage.walker.get_report()
+
+    print("{} day files, init_manager took {:.3f}s".format(files, duration))
+    print("scandir walker syscalls:   {:8d}".format(report["syscalls"]))
+    print("former path syscalls:      {:8d}".format(report["legacy_syscalls"]))
+    print("saved syscalls:            {:8d}".format(report["saved_syscalls"]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Helpers to create a synthetic data directory for the benchmarks.
+
+the created tree follows the layout TagesgerichtManager expects: year/calendarweek/DAYNUM_DAYNAME.txt
+plus a log.json per week, holding one sent logentry per day.
+"""
+from datetime import date, timedelta
+from os import makedirs
+from os.path import join
+
+from src.Tagesgericht import write_file
+
+WEEKDAY_MAP = {
+    "0": "Montag",
+    "1": "Dienstag",
+    "2": "Mittwoch",
+    "3": "Donnerstag",
+    "4": "Freitag",
+    "5": "Samstag",
+    "6": "Sonntag",
+}
+
+MEALS = [
+    "Schnitzel mit Pommes und Salat",
+    "Gulasch mit Semmelknödeln",
+    "Käsespätzle mit Röstzwiebeln",
+    "Linsensuppe mit Würstchen",
+    "Backfisch mit Kartoffelsalat",
+]
+
+
+def create_synthetic_tree(data_dir: str, first_year: int, years: int, days: int = 5) -> int:
+    """creates years * 52 weeks with a day file for each of the first days of the week,
+    returns the amount of created day files"""
+    created = 0
+    for year in range(first_year, first_year + years):
+        for week in range(1, 53):
+            week_dir = join(data_dir, str(year), str(week))
+            makedirs(week_dir, exist_ok=True)
+            log = {}
+            for day in range(days):
+                meal = MEALS[(week + day) % len(MEALS)]
+                write_file(path=join(week_dir, "{}_{}.txt".format(day, WEEKDAY_MAP[str(day)])), json=False, data=meal)
+                log[str(day)] = [{
+                    "message_sent": True,
+                    "log_date": "{} 11:00:00.000000".format(date(year, 1, 1) + timedelta(weeks=week - 1, days=day)),
+                    "error": "",
+                    "message": meal,
+                    "message_stopped": False,
+                }]
+                created += 1
+            write_file(path=join(week_dir, "log.json"), json=True, data=log)
+    return created
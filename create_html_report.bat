@@ -1,3 +1,2 @@
-%cd%\tagesgericht-venv\Scripts\python.exe "%cd%\main.py" "create_report"
-call create_sphinx_report.bat
-%SystemRoot%\explorer.exe "file:///%cd%\_build\html\index.html"
\ No newline at end of file
+%cd%\tagesgericht-venv\Scripts\python.exe "%cd%\main.py" "build_html"
+%SystemRoot%\explorer.exe "file:///%cd%\Sphinx-docs\_build\html\index.html"
\ No newline at end of file
@@ -1,41 +1,198 @@
-from sys import argv
+from datetime import date
+from os.path import dirname, join
+from sys import argv, stdout
+from time import perf_counter
 
-from src.Tagesgericht import TagesgerichtManager, read_file, twitter_call
+from src.Tagesgericht import TagesgerichtManager, FolderStorage, SQLiteStorage, PublishResult, migrate_storage
+from src.Tagesgericht import read_file, twitter_call
+
+
+def get_report_window(lconfig: dict) -> dict:
+    """returns since and until of the report window, an empty dict loads the full history"""
+    weeks_back = lconfig.get('weeks_back')
+    if weeks_back is None:
+        return {}
+    since, until = lconfig.get('TagesgerichtManager').get_window(weeks_back=weeks_back)
+    return {"since": since, "until": until}
+
+
+def get_folder_storage(lconfig: dict) -> FolderStorage:
+    return FolderStorage(
+        data_dir=lconfig.get('data_dir', 'Data'),
+        weekday_map=lconfig.get('translate', {}).get('weekday_map', {}),
+        translate=lconfig.get('translate', {}),
+        scan_manifest=lconfig.get('scan_manifest', False),
+        parse_workers=lconfig.get('parse_workers', 0),
+    )
+
+
+def get_sqlite_storage(lconfig: dict) -> SQLiteStorage:
+    return SQLiteStorage(
+        path=lconfig.get('sqlite_path', 'Data/tagesgericht.sqlite'),
+        weekday_map=lconfig.get('translate', {}).get('weekday_map', {}),
+    )
+
+
+def get_storage(lconfig: dict):
+    if lconfig.get('storage', 'folder') == 'sqlite':
+        return get_sqlite_storage(lconfig=lconfig)
+    return get_folder_storage(lconfig=lconfig)
+
+
+def queue_or_send(tm: TagesgerichtManager, lconfig: dict, sold_out: bool) -> bool:
+    """sends the message or sold out message for today, with outbox enabled it is queued for the outbox worker"""
+    if not lconfig.get('outbox', False):
+        return tm.send_sold_out_message() if sold_out else tm.send_message_for_today()
+    return tm.queue_sold_out_message() if sold_out else tm.queue_message_for_today()
+
+
+def print_publish_result(result: PublishResult):
+    """prints who posted what, or why the post failed"""
+    if result is None:
+        return
+    if result.success:
+        print("{0} just posted: {1}".format(result.user, result.text))
+    else:
+        print(result.error)
+
+
+def deliver_outbox(tm: TagesgerichtManager) -> int:
+    """delivers the due posts of the outbox, prints their results and returns the amount delivered"""
+    results = []
+    delivered = tm.deliver_outbox(results=results)
+    for result in results:
+        print_publish_result(result=result)
+    return delivered
+
+
+def send_tweet(tm: TagesgerichtManager, lconfig: dict, sold_out: bool):
+    """sends or queues the message or sold out message for today and prints what happened with it.
+    with outbox enabled the queue is delivered once right away, what fails stays queued for the outbox worker"""
+    translate = lconfig.get('translate', {})
+    result = queue_or_send(tm=tm, lconfig=lconfig, sold_out=sold_out)
+    print_publish_result(result=tm.publish_result)
+    if not result:
+        print(translate.get("Tweet was not sent, please see report for reason",
+                            "Tweet was not sent, please see report for reason"))
+        print(translate.get("you can close this window now"))
+    elif not lconfig.get('outbox', False):
+        print(translate.get("Tweet was sent", "Tweet was sent"))
+    else:
+        delivered = deliver_outbox(tm=tm)
+        pending = len(tm.get_outbox().list_pending())
+        print(translate.get("Tweet was queued", "Tweet was queued"))
+        print(translate.get("delivered: {0}, still queued: {1}",
+                            "delivered: {0}, still queued: {1}").format(delivered, pending))
+
+
+def build_html(lconfig: dict) -> dict:
+    """creates the rst report and builds it with sphinx in this process, instead of a separate make html.
+    the pickled environment in Sphinx-docs/_build is reused, so only changed pages are read again.
+    sphinx_parallel > 1 lets sphinx read and write with that many processes. returns the seconds per phase,
+    an empty dict if sphinx reported errors"""
+    tm = lconfig['TagesgerichtManager']
+    window = get_report_window(lconfig=lconfig)
+    stream = lconfig.get('stream_reports', False)
+    timings = {}
+    start = perf_counter()
+    tm.compact_logs()
+    tm.init_manager(load_data=not stream, **window)
+    timings['load'] = perf_counter() - start
+    start = perf_counter()
+    tm.create_rst_data(stream=stream, pages=lconfig.get('report_pages', False), **window)
+    timings['report'] = perf_counter() - start
+    start = perf_counter()
+    from sphinx.application import Sphinx
+    source_dir = dirname(tm.report_build_folder)
+    build_dir = join(source_dir, '_build')
+    app = Sphinx(srcdir=source_dir, confdir=source_dir, outdir=join(build_dir, 'html'),
+                 doctreedir=join(build_dir, 'doctrees'), buildername='html', freshenv=False,
+                 parallel=lconfig.get('sphinx_parallel', 0))
+    timings['sphinx setup'] = perf_counter() - start
+    start = perf_counter()
+    app.build(force_all=False)
+    timings['sphinx build'] = perf_counter() - start
+    if app.statuscode:
+        print("sphinx build failed with status {0}, see the messages above".format(app.statuscode))
+        return {}
+    timings['total'] = sum(timings.values())
+    for phase, seconds in timings.items():
+        print("{:14s} {:10.1f}ms".format(phase, seconds * 1000))
+    return timings
+
+
+def get_print_window(lconfig: dict, option: str) -> dict:
+    """returns since and until of print_report, option or print_window override the report window"""
+    option = option or lconfig.get('print_window')
+    if not option:
+        return get_report_window(lconfig=lconfig)
+    since, until = lconfig.get('TagesgerichtManager').get_print_window(option=option)
+    return {"since": since, "until": until}
 
 
 def bat_handler(larg: str, lconfig: dict):
     tm = config['TagesgerichtManager']
+    window = get_report_window(lconfig=lconfig)
+    stream = lconfig.get('stream_reports', False)
+    larg, _, option = larg.partition('=')
     if larg == 'print_report':
-        tm.init_manager()
-        tm.print_data()
+        window = get_print_window(lconfig=lconfig, option=option)
+        tm.init_manager(load_data=not stream, **window)
+        tm.print_data(stream=stream, **window)
     elif larg == 'create_report':
-        tm.init_manager()
-        tm.create_rst_data()
+        tm.compact_logs()
+        tm.init_manager(load_data=not stream, **window)
+        tm.create_rst_data(stream=stream, pages=lconfig.get('report_pages', False), **window)
+    elif larg == 'build_html':
+        build_html(lconfig=lconfig)
+    elif larg == 'create_html':
+        tm.compact_logs()
+        tm.init_manager(load_data=not stream, **window)
+        tm.html_build_folder = lconfig.get('html_report_folder', 'html-report')
+        print(tm.create_html_data(stream=stream, **window))
+    elif larg == 'export':
+        export_format, _, export_window = option.partition(',')
+        since, until = tm.get_print_window(option=export_window) if export_window else [None, None]
+        tm.export_items(output=stdout, export_format=export_format or lconfig.get('export_format', 'ndjson'),
+                        since=since, until=until)
     elif larg == 'send_tweet':
-        result = tm.send_message_for_today()
-        if not result:
-            print(lconfig.get('translate', {}).get("Tweet was not sent, please see report for reason",
-                                                   "Tweet was not sent, please see report for reason"))
-            print(lconfig.get('translate', {}).get("you can close this window now"))
-        else:
-            print(result)
+        send_tweet(tm=tm, lconfig=lconfig, sold_out=False)
     elif larg == 'stop_tweet':
-        result = tm.send_sold_out_message()
-        if not result:
-            print(lconfig.get('translate', {}).get("Tweet was not sent, please see report for reason",
-                                                   "Tweet was not sent, please see report for reason"))
-            print(lconfig.get('translate', {}).get("you can close this window now"))
-        else:
-            print(result)
+        send_tweet(tm=tm, lconfig=lconfig, sold_out=True)
+    elif larg == 'deliver_outbox':
+        print(deliver_outbox(tm=tm))
+    elif larg == 'outbox_worker':
+        worker = tm.start_outbox_worker(interval=lconfig.get('outbox_interval', 1))
+        try:
+            worker.join()
+        except KeyboardInterrupt:
+            worker.stop()
+    elif larg == 'set_message':
+        day, _, message = option.partition(',')
+        tm.set_message(day=date.fromisoformat(day), message=message)
+    elif larg == 'compact_logs':
+        print(tm.compact_logs())
+    elif larg == 'archive_years':
+        print(tm.archive_past_years())
+    elif larg == 'unpack_archives':
+        print(tm.unpack_archives())
+    elif larg == 'migrate_to_sqlite':
+        print(migrate_storage(source=get_folder_storage(lconfig=lconfig), target=get_sqlite_storage(lconfig=lconfig)))
+    elif larg == 'migrate_to_folder':
+        print(migrate_storage(source=get_sqlite_storage(lconfig=lconfig), target=get_folder_storage(lconfig=lconfig)))
     else:
         print('commend unknown', larg)
 
 
 def create_report(lconfig: dict):
     cwm = lconfig.get('TagesgerichtManager')
-    cwm.init_manager()
-    cwm.print_data()
-    cwm.create_rst_data()
+    window = get_report_window(lconfig=lconfig)
+    stream = lconfig.get('stream_reports', False)
+    cwm.compact_logs()
+    cwm.init_manager(load_data=not stream, **window)
+    cwm.print_data(stream=stream, **window)
+    cwm.create_rst_data(stream=stream, pages=lconfig.get('report_pages', False), **window)
+    cwm.invalidate_snapshot()
 
 
 def close_program(lconfig: dict):
@@ -46,13 +203,17 @@ def close_program(lconfig: dict):
 def send_message(lconfig: dict):
     print("sending message")
     cwm = lconfig.get('TagesgerichtManager')
-    cwm.send_message_for_today()
+    queue_or_send(tm=cwm, lconfig=lconfig, sold_out=False)
+    print_publish_result(result=cwm.publish_result)
+    cwm.invalidate_snapshot()
 
 
 def send_sold_out_message(lconfig: dict):
     print("send_sold_out_message")
     cwm = lconfig.get('TagesgerichtManager')
-    cwm.send_sold_out_message()
+    queue_or_send(tm=cwm, lconfig=lconfig, sold_out=True)
+    print_publish_result(result=cwm.publish_result)
+    cwm.invalidate_snapshot()
 
 
 def get_options(lconfig: dict):
@@ -83,13 +244,20 @@ def load_specialdays() -> dict:
 def main(lconfig: dict):
     from simple_term_menu import TerminalMenu
 
-    while True:
-        options = get_options(lconfig=lconfig)
-        terminal_menu = TerminalMenu(list(options.keys()))
-        menu_entry_index = terminal_menu.show()
-        if not menu_entry_index and menu_entry_index != 0:
-            break
-        options[list(options.keys())[menu_entry_index]](lconfig=config)
+    worker = None
+    if lconfig.get('outbox', False):
+        worker = lconfig.get('TagesgerichtManager').start_outbox_worker(interval=lconfig.get('outbox_interval', 1))
+    try:
+        while True:
+            options = get_options(lconfig=lconfig)
+            terminal_menu = TerminalMenu(list(options.keys()))
+            menu_entry_index = terminal_menu.show()
+            if not menu_entry_index and menu_entry_index != 0:
+                break
+            options[list(options.keys())[menu_entry_index]](lconfig=config)
+    finally:
+        if worker:
+            worker.stop()
 
 
 if __name__ == '__main__':
@@ -99,6 +267,22 @@ if __name__ == '__main__':
         'translate': load_language(code='de'),
         "data_dir": "Data/",
         "active_days": [0, 1, 2, 3, 4],
+        "scan_manifest": True,
+        "parse_workers": 4,
+        "render_workers": 0,
+        "connect_timeout": 5,
+        "read_timeout": 30,
+        "outbox": False,
+        "outbox_interval": 1,
+        "weeks_back": 4,
+        "print_window": None,
+        "export_format": "ndjson",
+        "stream_reports": False,
+        "report_pages": False,
+        "html_report_folder": "html-report",
+        "sphinx_parallel": 0,
+        "storage": "folder",
+        "sqlite_path": "Data/tagesgericht.sqlite",
     }
 
     config['TagesgerichtManager'] = TagesgerichtManager(
@@ -107,6 +291,10 @@ if __name__ == '__main__':
         translation=config.get('translate', {}),
         specialdays=config.get('specialdays', {}),
         credentials=config.get('credentials', {}),
+        storage=get_storage(lconfig=config),
+        render_workers=config.get('render_workers', 0),
+        connect_timeout=config.get('connect_timeout', 5),
+        read_timeout=config.get('read_timeout', 30),
     )
 
     # if main.py has been called with argument
@@ -1,37 +1,121 @@
-from collections import OrderedDict
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
-from json import loads, dumps
-from os import listdir, makedirs
-from os.path import join, isdir, exists, isfile
-from shutil import rmtree
-from typing import List, Union
+from filecmp import cmp
+from hashlib import sha1
+from html import escape
+from itertools import groupby
+from io import StringIO
+from json import JSONEncoder, loads, dumps
+from mmap import ACCESS_READ, mmap
+from os import DirEntry, O_APPEND, O_CREAT, O_EXCL, O_RDWR, O_WRONLY, close, fsync, lseek, makedirs, \
+    name as os_name, open as os_open, remove, replace, scandir, stat, write as os_write
+from os.path import abspath, basename, dirname, join, isdir, exists, isfile, normpath
+from shutil import copyfileobj, rmtree
+from sqlite3 import Connection, IntegrityError, connect
+from string import Template
+import sys
+from sys import intern
+from threading import Event, Lock, Thread, local
+from time import sleep, time, time_ns
+from typing import Callable, Iterator, List, TextIO, Tuple, Union
 from unicodedata import normalize
+from zipfile import ZIP_DEFLATED, ZipFile
 
-from twitter import Api
+from requests import RequestException, Session
+from requests.adapters import HTTPAdapter
+from twitter import Api, TwitterError, __version__ as twitter_version
 
+try:
+    from os import O_BINARY
+except ImportError:
+    O_BINARY = 0
 
-def twitter_call(message: str, credentials: dict):
-    """does a twitter API call
-    taken from official twitter python github page
+try:
+    from fcntl import LOCK_EX, LOCK_NB, LOCK_UN, flock
+except ImportError:
+    flock = None
+    from msvcrt import LK_NBLCK, LK_UNLCK, locking
+
+
+@dataclass
+class PublishResult:
+    """Outcome of a single post, error holds the reason if it failed"""
+    success: bool
+    status_id: int = 0
+    user: str = ""
+    text: str = ""
+    error: str = ""
+
+
+class TimeoutAdapter(HTTPAdapter):
+    """HTTPAdapter sending every request without its own timeout with the given timeout"""
+
+    def __init__(self, timeout: Union[float, Tuple[float, float]], **kwargs) -> None:
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=self.timeout if timeout is None else timeout, **kwargs)
+
+
+class TwitterPublisher:
+    """Posts messages for one set of credentials.
+
+    the twitter.Api and with it its requests session are created on the first post and reused afterwards,
+    so further posts use the pooled keep-alive connection instead of a new TLS handshake.
+    connect_timeout and read_timeout in seconds are handed to every request.
+    BASE_URL in the credentials replaces the twitter api url, like for a local test endpoint.
+    """
+
+    def __init__(self, credentials: dict, connect_timeout: float = 5, read_timeout: float = 30) -> None:
+        self.credentials = credentials
+        self.timeout = (connect_timeout, read_timeout)
+        self.api = None
+
+    def get_api(self) -> Api:
+        """returns the api of the credentials, created once"""
+        if self.api is None:
+            self.api = Api(consumer_key=self.credentials.get("API_KEY", ""),
+                           consumer_secret=self.credentials.get("API_KEY_SECRET", ""),
+                           access_token_key=self.credentials.get("ACCESS_TOKEN", ""),
+                           access_token_secret=self.credentials.get("ACCESS_TOKEN_SECRET", ""),
+                           input_encoding=self.credentials.get("ENCODING", "utf-8"), request_headers=None,
+                           base_url=self.credentials.get("BASE_URL"))
+            # the timeout argument of python-twitter only takes a single number, which it compares with 30.
+            # the api sends its requests without a timeout then, so the adapter mounted on its session applies ours
+            session = getattr(self.api, "_session", None)
+            if isinstance(session, Session):
+                adapter = TimeoutAdapter(timeout=self.timeout)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+            else:
+                print("python-twitter {} has no requests session to apply the timeout to".format(twitter_version))
+        return self.api
+
+    def publish(self, message: str) -> PublishResult:
+        """posts a message, with coordinates if LATITUDE and LONGITUDE are part of the credentials.
+        errors of twitter and of the connection are returned as failed result instead of being raised"""
+        latitude = self.credentials.get("LATITUDE")
+        longitude = self.credentials.get("LONGITUDE")
+        try:
+            if latitude and longitude:
+                status = self.get_api().PostUpdate(message, latitude=latitude, longitude=longitude,
+                                                   display_coordinates=True)
+            else:
+                status = self.get_api().PostUpdate(message)
+        except (TwitterError, RequestException, UnicodeDecodeError) as error:
+            return PublishResult(success=False, error="{}: {}".format(type(error).__name__, error))
+        return PublishResult(success=True, status_id=status.id, user=status.user.name, text=status.text)
+
+
+def twitter_call(message: str, credentials: dict) -> PublishResult:
+    """does a single twitter API call with its own publisher, see TwitterPublisher.
+    based on the official twitter python github page
     https://github.com/bear/python-twitter/blob/master/examples/tweet.py"""
-    consumer_key = credentials.get("API_KEY", "")
-    consumer_secret = credentials.get("API_KEY_SECRET", "")
-    access_key = credentials.get("ACCESS_TOKEN", "")
-    access_secret = credentials.get("ACCESS_TOKEN_SECRET", "")
-    encoding = credentials.get('ENCODING', "utf-8")
-    latitude = credentials.get('LATITUDE', "utf-8")
-    longitude = credentials.get('LONGITUDE', "utf-8")
-    display_coordinates = latitude and longitude
-    api = Api(consumer_key=consumer_key, consumer_secret=consumer_secret,
-              access_token_key=access_key, access_token_secret=access_secret,
-              input_encoding=encoding, request_headers=None)
-    try:
-        status = api.PostUpdate(message, latitude=latitude, longitude=longitude, display_coordinates=display_coordinates)
-        print("{0} just posted: {1}".format(status.user.name, status.text))
-    except UnicodeDecodeError:
-        print("whoopsie")
-        exit(2)
+    return TwitterPublisher(credentials=credentials).publish(message=message)
 
 
 def create_folder(dir_path: str) -> None:
@@ -64,9 +148,260 @@ def read_file(path: str, json: bool) -> Union[str, dict]:
         return data
 
 
+def write_file_if_changed(path: str, data: str) -> bool:
+    """writes a text file only if its content differs, so an unchanged file keeps its mtime. returns if it was written"""
+    if isfile(path) and read_file(path=path, json=False) == data:
+        return False
+    write_file(path=path, json=False, data=data)
+    return True
+
+
+def replace_if_changed(tmp_path: str, path: str) -> bool:
+    """moves a freshly written file over path if their bytes differ, otherwise the temporary file is removed
+    and path keeps its mtime. returns if path was replaced"""
+    if isfile(path) and cmp(tmp_path, path, shallow=False):
+        remove(tmp_path)
+        return False
+    replace(tmp_path, path)
+    return True
+
+
+def append_line(path: str, data: dict) -> None:
+    """appends data as a single json line and flushes it to disk.
+    the line is written by one write call on a file opened in append mode, so concurrent appends dont interleave"""
+    fd = os_open(path, O_WRONLY | O_APPEND | O_CREAT | O_BINARY, 0o644)
+    try:
+        os_write(fd, (dumps(data) + "\n").encode("utf-8"))
+        fsync(fd)
+    finally:
+        close(fd)
+
+
+def read_lines(path: str) -> List[dict]:
+    """reads a json lines file, lines that cant be decoded like a torn last line are skipped"""
+    result = []
+    for line in read_file(path=path, json=False).splitlines():
+        try:
+            result.append(loads(line))
+        except ValueError:
+            continue
+    return result
+
+
+class FileLock:
+    """Advisory lock on a file, shared by all processes working on the same data.
+    acquire never waits, so a second process can give up right away instead of queueing behind the first one"""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.fd = None
+
+    def acquire(self) -> bool:
+        """tries to take the lock, returns False if another process holds it"""
+        fd = os_open(self.path, O_RDWR | O_CREAT | O_BINARY, 0o644)
+        try:
+            if flock:
+                flock(fd, LOCK_EX | LOCK_NB)
+            else:
+                locking(fd, LK_NBLCK, 1)
+        except OSError:
+            close(fd)
+            return False
+        self.fd = fd
+        return True
+
+    def release(self) -> None:
+        """releases the lock if it is held"""
+        if self.fd is None:
+            return
+        if flock:
+            flock(self.fd, LOCK_UN)
+        else:
+            lseek(self.fd, 0, 0)
+            locking(self.fd, LK_UNLCK, 1)
+        close(self.fd)
+        self.fd = None
+
+
+class Outbox:
+    """Durable queue of posts waiting for delivery, kept as a json lines file.
+
+    queueing and every delivery attempt append a line, the newest line of a post wins, so the queue survives
+    restarts and a torn last line like the calendarweek journals do. posts keep the order they were first queued in.
+    a post is identified by its day and action, so the same action for a day is only queued once at a time.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def acquire_lock(self) -> FileLock:
+        """takes the lock of the queue file, it is only held for reading and writing the file, so it is waited for"""
+        lock = FileLock(path=self.path + ".lock")
+        while not lock.acquire():
+            sleep(0.01)
+        return lock
+
+    @staticmethod
+    def get_id(year: str, week: str, day_num: int, action: str) -> str:
+        """returns the id of a post"""
+        return "{}/{}/{}/{}".format(year, week, day_num, action)
+
+    def load(self) -> dict:
+        """returns the newest state of all posts by their id"""
+        posts = {}
+        if isfile(self.path):
+            for post in read_lines(path=self.path):
+                posts[post["id"]] = post
+        return posts
+
+    def list_pending(self) -> List[dict]:
+        """returns the posts waiting for delivery in the order they were queued"""
+        return [post for post in self.load().values() if post["state"] == "pending"]
+
+    def is_pending(self, year: str, week: str, day_num: int, action: str) -> bool:
+        """returns if an action for a day waits for delivery"""
+        post = self.load().get(self.get_id(year=year, week=week, day_num=day_num, action=action))
+        return bool(post) and post["state"] == "pending"
+
+    def put(self, year: str, week: str, day_num: int, action: str, message: str) -> bool:
+        """queues a post, returns False if the same action for the day is already waiting"""
+        lock = self.acquire_lock()
+        try:
+            if self.is_pending(year=year, week=week, day_num=day_num, action=action):
+                return False
+            append_line(path=self.path, data={
+                "id": self.get_id(year=year, week=week, day_num=day_num, action=action),
+                "year": year,
+                "week": week,
+                "day_num": day_num,
+                "action": action,
+                "message": message,
+                "state": "pending",
+                "attempts": 0,
+                "next_attempt": 0,
+                "error": "",
+            })
+        finally:
+            lock.release()
+        return True
+
+    def update(self, post: dict) -> None:
+        """records the new state of a post"""
+        lock = self.acquire_lock()
+        try:
+            append_line(path=self.path, data=post)
+        finally:
+            lock.release()
+
+    def compact(self) -> None:
+        """drops delivered posts and the history of pending ones, the file is removed once nothing is pending"""
+        lock = self.acquire_lock()
+        try:
+            pending = self.list_pending()
+            if not pending:
+                if isfile(self.path):
+                    remove(self.path)
+                return
+            with open(self.path + ".tmp", mode="w", encoding="utf-8") as file:
+                file.write("".join(dumps(post) + "\n" for post in pending))
+                file.flush()
+                fsync(file.fileno())
+            replace(self.path + ".tmp", self.path)
+        finally:
+            lock.release()
+
+
+class IsoWeekTable:
+    """Precomputed ISO 8601 calendar of one year, the same week numbering isocalendar uses for the folders.
+
+    week 1 is the week holding the 4th of january, so a year has 52 or 53 weeks
+    and its first and last days may belong to the neighbouring year.
+    tables are built once per year and cached, lookups in both directions are O(1).
+    """
+    tables = {}
+
+    def __init__(self, year: int) -> None:
+        self.year = year
+        january_4th = date(year, 1, 4)
+        self.first_day = january_4th - timedelta(days=january_4th.weekday())
+        self.weeks = 53 if date(year, 12, 28).isocalendar()[1] == 53 else 52
+        self.days = [self.first_day + timedelta(days=day) for day in range(self.weeks * 7)]
+
+    @classmethod
+    def get(cls, year: int) -> "IsoWeekTable":
+        """returns the cached table of a year"""
+        table = cls.tables.get(year)
+        if table is None:
+            table = cls.tables.setdefault(year, cls(year=year))
+        return table
+
+    @classmethod
+    def get_date(cls, year: Union[int, str], week: Union[int, str], weekday: int) -> date:
+        """returns the date of a weekday in an ISO calendarweek, weekday 0 is monday"""
+        table = cls.get(year=int(year))
+        week = int(week)
+        if not 1 <= week <= table.weeks or not 0 <= weekday <= 6:
+            raise ValueError("{}-W{}-{} is not a valid ISO date".format(year, week, weekday))
+        return table.days[(week - 1) * 7 + weekday]
+
+    @classmethod
+    def intern_date(cls, day: date) -> date:
+        """returns the shared date object of the table for a plain date, so items of all sites share their dates.
+        a date object costs less than its ordinal as int, datetimes are returned as they are"""
+        if type(day) is not date:
+            return day
+        iso_year, week, weekday = cls.get_iso_week(day=day)
+        return cls.get(year=iso_year).days[(week - 1) * 7 + weekday]
+
+    @classmethod
+    def get_iso_week(cls, day: date) -> List[int]:
+        """returns ISO year, week and weekday of a date, weekday 0 is monday"""
+        table = cls.get(year=day.year)
+        offset = (day - table.first_day).days
+        if offset < 0:
+            table = cls.get(year=day.year - 1)
+            offset = (day - table.first_day).days
+        elif offset >= len(table.days):
+            table = cls.get(year=day.year + 1)
+            offset = (day - table.first_day).days
+        return [table.year, offset // 7 + 1, offset % 7]
+
+
+@dataclass
+class DayStatus:
+    """Send state of a day, folded from its logentrys once when they are replayed or added"""
+    __slots__ = ["sent_at", "stopped_at", "failed_attempts"]
+    sent_at: str
+    stopped_at: str
+    failed_attempts: int
+
+    def __init__(self, sent_at: str = "", stopped_at: str = "", failed_attempts: int = 0) -> None:
+        self.sent_at = sent_at
+        self.stopped_at = stopped_at
+        self.failed_attempts = failed_attempts
+
+    def add(self, logentry: dict) -> None:
+        """folds a single logentry into the status, the first sent and stopped entry count"""
+        if not logentry.get("message_sent"):
+            self.failed_attempts += 1
+        elif not logentry.get("message_stopped"):
+            self.sent_at = self.sent_at or logentry.get("log_date", "")
+        else:
+            self.stopped_at = self.stopped_at or logentry.get("log_date", "")
+
+
+LogEntry = namedtuple("LogEntry", ["message_sent", "log_date", "error", "message", "message_stopped"])
+
+
 @dataclass
 class Calendaritem:
-    """Calendaritem represents information about the message, file, sent or sendable status of the message"""
+    """Calendaritem represents information about the message, file, sent or sendable status of the message.
+
+    items are slotted and keep their logentrys as LogEntry tuples with interned strings, so a message repeated in
+    every logentry and across weeks is stored once. logentrys converts them back to the dicts stored on disk.
+    """
+    __slots__ = ["message", "filepath", "item_date", "message_length", "message_length_exceeded", "message_sendable",
+                 "message_icon", "logs", "status", "specialday"]
     message: str
     filepath: str
     item_date: date
@@ -75,14 +410,45 @@ class Calendaritem:
     message_length_exceeded: bool
     message_sendable: bool
     message_icon: str
-    logentrys: list
+    logs: list
+    status: DayStatus
     specialday: str
 
     def __init__(self, filepath: str, item_date: date) -> None:
         self.filepath = filepath
-        self.item_date = item_date
+        self.item_date = IsoWeekTable.intern_date(day=item_date)
         self.specialday = ""
-        self.logentrys = []
+        self.logs = []
+        self.status = DayStatus()
+
+    @staticmethod
+    def pack_log(logentry: dict) -> Union[LogEntry, dict]:
+        """returns a logentry with exactly the default keys as LogEntry tuple, other logentrys are kept as they are"""
+        if len(logentry) != len(LogEntry._fields) or not all(key in logentry for key in LogEntry._fields):
+            return logentry
+        return LogEntry(
+            message_sent=logentry["message_sent"],
+            log_date=logentry["log_date"],
+            error=intern(logentry["error"]) if type(logentry["error"]) is str else logentry["error"],
+            message=intern(logentry["message"]) if type(logentry["message"]) is str else logentry["message"],
+            message_stopped=logentry["message_stopped"],
+        )
+
+    @staticmethod
+    def unpack_log(logentry: Union[LogEntry, dict]) -> dict:
+        """returns a packed logentry as dict again"""
+        if isinstance(logentry, LogEntry):
+            return dict(logentry._asdict())
+        return logentry
+
+    @property
+    def logentrys(self) -> list:
+        """the logentrys of the day as dicts, like they are stored"""
+        return [self.unpack_log(logentry=logentry) for logentry in self.logs]
+
+    @logentrys.setter
+    def logentrys(self, log_list: list) -> None:
+        self.set_logs(log_list=log_list)
 
     @staticmethod
     def normalize_to_nfc(data: str) -> str:
@@ -91,7 +457,7 @@ class Calendaritem:
 
     def load_message(self):
         """loads a day item textfile under $year/$calendarweek/$daynum_$dayname.txt"""
-        self.message = self.normalize_to_nfc(data=read_file(path=self.filepath, json=False))
+        self.message = intern(self.normalize_to_nfc(data=read_file(path=self.filepath, json=False)))
         return self
 
     def initialize(self) -> None:
@@ -103,7 +469,15 @@ class Calendaritem:
 
     def set_logs(self, log_list: list) -> None:
         """initially setting eventual existing logs to the day item after creation by Calendarweek class"""
-        self.logentrys = log_list
+        self.logs = [self.pack_log(logentry=logentry) for logentry in log_list]
+        self.status = DayStatus()
+        for logentry in log_list:
+            self.status.add(logentry=logentry)
+
+    def append_log(self, logentry: dict) -> None:
+        """appends a replayed logentry and updates the status"""
+        self.logs.append(self.pack_log(logentry=logentry))
+        self.status.add(logentry=logentry)
 
     def add_log(self, message_sent: bool, message_stopped: bool, translate: dict) -> None:
         """adds a logentry regarding being sent or being stopped"""
@@ -114,7 +488,7 @@ class Calendaritem:
             "message": self.message,
             "message_stopped": message_stopped,
         }
-        self.logentrys.append(logitem)
+        self.append_log(logentry=logitem)
 
     def get_error_text(self, translate: dict, msg="") -> str:
         """returns a specific errortext depending on the cause of the error"""
@@ -131,24 +505,43 @@ class Calendaritem:
             msg = "Info: " + self.get_error_text(translate=translate)
         return msg
 
+    def is_sent(self) -> bool:
+        """returns if the message has been sent"""
+        return bool(self.status.sent_at)
+
+    def is_stopped(self) -> bool:
+        """returns if the sold out message has been sent"""
+        return bool(self.status.stopped_at)
+
     def has_been_sent(self, translate: dict) -> Union[bool, str]:
         """returns string with time is message has been sent, otherwise False"""
-        for item in self.logentrys:
-            if item.get("message_sent") and not item.get("message_stopped"):
-                return " ".join([translate.get("sent at", "sent at"), "->", item.get("log_date")[:16]])
-        return False
+        if not self.status.sent_at:
+            return False
+        return " ".join([translate.get("sent at", "sent at"), "->", self.status.sent_at[:16]])
 
     def has_been_stopped(self, translate: dict) -> Union[bool, str]:
         """returns string with time is message has been stopped, otherwise False"""
-        for item in self.logentrys:
-            if item.get("message_sent") and item.get("message_stopped"):
-                return " ".join([translate.get("stopped at", "stopped at"), "->", item.get("log_date")[:16]])
-        return False
+        if not self.status.stopped_at:
+            return False
+        return " ".join([translate.get("stopped at", "stopped at"), "->", self.status.stopped_at[:16]])
+
+    def get_export(self) -> dict:
+        """returns the day as plain dict for exports, timestamps are None if it wasnt sent or stopped"""
+        return {
+            "date": self.item_date.isoformat(),
+            "message": self.message,
+            "length": self.message_length,
+            "sendable": self.message_sendable,
+            "sent_at": self.status.sent_at or None,
+            "stopped_at": self.status.stopped_at or None,
+            "specialday": self.specialday,
+        }
 
 
 @dataclass
 class Calendarweek:
     """Holds date information about this calendarweek, manages days and their messages"""
+    __slots__ = ["year", "week", "first_day_of_week", "last_day_of_week", "items", "week_icon"]
     year: str
     week: str
     first_day_of_week: date
@@ -157,8 +550,8 @@ class Calendarweek:
     week_icon: str
 
     def __init__(self, year: str, week: str) -> None:
-        self.year = year
-        self.week = week
+        self.year = intern(year)
+        self.week = intern(week)
         self.first_day_of_week, self.last_day_of_week = self.get_cw_from_to(year=self.year, week=self.week)
         self.items = {}
         self.week_icon = ""
@@ -186,14 +579,13 @@ class Calendarweek:
     @staticmethod
     def get_cw_from_to(year: str, week: str) -> List[date]:
         """Calculates the start and endday of a calendarweek only given a year and a weeknumber"""
-        first_day_of_week = datetime.strptime(f"{year}-W{week}-1", "%Y-W%W-%w").date()
-        last_day_of_week = first_day_of_week + timedelta(days=6.9)
-        return [first_day_of_week, last_day_of_week]
+        return [IsoWeekTable.get_date(year=year, week=week, weekday=0),
+                IsoWeekTable.get_date(year=year, week=week, weekday=6)]
 
     @staticmethod
     def get_real_date_by_year_cw_day(year: str, week: str, day: int) -> date:
-        """creates a date object from year, week number and day of the week"""
-        return datetime.strptime(f"{year}-W{week}-{day}", "%Y-W%W-%w").date()
+        """creates a date object from year, week number and day of the week, counted like %w with sunday as 0"""
+        return IsoWeekTable.get_date(year=year, week=week, weekday=(day - 1) % 7)
 
     def add_file(self, filepath: str, item_date: date) -> None:
         """Initializes a Calendaeitem from a filepath"""
@@ -202,6 +594,31 @@ class Calendarweek:
         ci.initialize()
         self.items[item_date.weekday()] = ci
 
+    def add_message(self, filepath: str, item_date: date, message: str) -> None:
+        """Initializes a Calendaritem from an already loaded message, used when restoring from the scan manifest"""
+        ci = Calendaritem(filepath=filepath, item_date=item_date)
+        ci.message = intern(message)
+        ci.initialize()
+        self.items[item_date.weekday()] = ci
+
+    def get_content_hash(self) -> str:
+        """returns a hash over messages and logentrys of all days, changes whenever the week content changes"""
+        content = {str(day): [data.message, data.logentrys] for day, data in self.items.items()}
+        return sha1(dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def is_week_in_window(first_day_of_week: date, last_day_of_week: date, since: date = None,
+                          until: date = None) -> bool:
+        """Returns if a calendarweek overlaps the date window, a missing since or until leaves that side open"""
+        if since and last_day_of_week < since:
+            return False
+        return not (until and first_day_of_week > until)
+
+    def is_in_window(self, since: date = None, until: date = None) -> bool:
+        """Returns if this calendarweek overlaps the date window"""
+        return self.is_week_in_window(first_day_of_week=self.first_day_of_week, last_day_of_week=self.last_day_of_week,
+                                      since=since, until=until)
+
     def init_log_for_day(self, log: list, day_num: int) -> None:
         """sets a days log back to given log list.
         intendet to be called by Calendarweek durining parsing."""
@@ -210,6 +627,1339 @@ class Calendarweek:
         self.items[day_num] = day_item
 
 
+class DirectoryWalker:
+    """os.scandir based directory walker, used by the parser and the template creator.
+
+    every listing is cached per folder, so type checks and stat calls for known entries are answered from the cached
+    DirEntry objects instead of separate isdir/isfile/stat syscalls. the walker counts the syscalls it makes and
+    the syscalls the former listdir/isdir/isfile path would have needed for the same questions.
+    """
+
+    def __init__(self) -> None:
+        self.folders = {}
+        self.syscalls = 0
+        self.legacy_syscalls = 0
+        self.lock = Lock()
+
+    def count(self, syscalls: int, legacy_syscalls: int) -> None:
+        """adds to the syscall counters, walkers are shared by the parse workers"""
+        with self.lock:
+            self.syscalls += syscalls
+            self.legacy_syscalls += legacy_syscalls
+
+    def clear(self) -> None:
+        """drops all cached listings, so the next questions are answered from disk again"""
+        self.folders = {}
+
+    def scan(self, path: str, legacy_syscalls: int = 1) -> List[DirEntry]:
+        """lists a folder with one scandir call and caches its entries.
+        legacy_syscalls is the cost of the former code for the same listing, 0 if it did not list the folder"""
+        with scandir(path) as iterator:
+            entries = list(iterator)
+        self.folders[normpath(path)] = {entry.name: entry for entry in entries}
+        self.count(syscalls=1, legacy_syscalls=legacy_syscalls)
+        return entries
+
+    def list_dirs(self, path: str) -> List[DirEntry]:
+        """returns the subfolders of a folder, formerly listdir followed by an isdir per entry"""
+        entries = self.scan(path=path)
+        self.count(syscalls=0, legacy_syscalls=len(entries))
+        return [entry for entry in entries if entry.is_dir()]
+
+    def list_files(self, path: str) -> List[DirEntry]:
+        """returns the files of a folder, formerly listdir followed by an isfile per entry"""
+        entries = self.scan(path=path)
+        self.count(syscalls=0, legacy_syscalls=len(entries))
+        return [entry for entry in entries if entry.is_file()]
+
+    def list_cached_files(self, path: str) -> List[DirEntry]:
+        """returns the files of a folder from its cached listing, the folder is only listed if it wasnt scanned yet"""
+        folder = self.folders.get(normpath(path))
+        if folder is None:
+            return self.list_files(path=path)
+        return [entry for entry in folder.values() if entry.is_file()]
+
+    def get_entry(self, path: str) -> Union[DirEntry, bool, None]:
+        """returns the cached entry of a path, False if its folder was scanned without it, None if unknown"""
+        path = normpath(path)
+        folder = self.folders.get(dirname(path))
+        if folder is None:
+            return None
+        return folder.get(basename(path), False)
+
+    def is_file(self, path: str) -> bool:
+        """replacement for isfile, answered from the cache if the parent folder has been scanned"""
+        entry = self.get_entry(path=path)
+        if entry is None:
+            self.count(syscalls=1, legacy_syscalls=1)
+            return isfile(path)
+        self.count(syscalls=0, legacy_syscalls=1)
+        return bool(entry) and entry.is_file()
+
+    def is_dir(self, path: str) -> bool:
+        """replacement for isdir, answered from the cache if the parent folder has been scanned"""
+        entry = self.get_entry(path=path)
+        if entry is None:
+            self.count(syscalls=1, legacy_syscalls=1)
+            return isdir(path)
+        self.count(syscalls=0, legacy_syscalls=1)
+        return bool(entry) and entry.is_dir()
+
+    def stat(self, path: str):
+        """replacement for os.stat, uses the stat result of the cached entry.
+        on windows that comes from the directory listing for free, elsewhere the entry stats once and keeps it"""
+        entry = self.get_entry(path=path)
+        if not entry:
+            self.count(syscalls=1, legacy_syscalls=1)
+            return stat(path)
+        self.count(syscalls=0 if os_name == "nt" else 1, legacy_syscalls=1)
+        return entry.stat()
+
+    def get_report(self) -> dict:
+        """returns the syscall counters and how many syscalls were saved compared with the former path"""
+        return {
+            "syscalls": self.syscalls,
+            "legacy_syscalls": self.legacy_syscalls,
+            "saved_syscalls": self.legacy_syscalls - self.syscalls,
+        }
+
+
+class ScanManifest:
+    """On-disk cache of parsed calendarweeks, stored as manifest.json inside the data directory.
+
+    each week is stored with a signature made of the week folder mtime and size and mtime of every file in it,
+    the time of the scan, a hash of the week content and the parsed Calendaritem fields.
+    as long as the signature of a week folder is unchanged, the week is restored from the manifest
+    instead of reading its day files and log.json again.
+    a file written within mtime_granularity of the scan could change again without a new size and mtime,
+    FAT and exFAT store mtimes in 2 second steps. such a week is racy, it is read again and compared with its hash
+    until a scan happens after the granularity has passed.
+    """
+    version = 3
+    mtime_granularity = 2 * 10 ** 9
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.weeks = {}
+        self.changed = False
+
+    @staticmethod
+    def get_key(year: str, week: str) -> str:
+        """returns the key a week is stored under"""
+        return "{}/{}".format(year, week)
+
+    def load(self):
+        """loads the manifest file, a missing, broken or outdated manifest results in an empty manifest"""
+        self.weeks = {}
+        self.changed = False
+        if not isfile(self.path):
+            return self
+        try:
+            content = read_file(path=self.path, json=True)
+        except (OSError, ValueError):
+            return self
+        if content.get("version") == self.version:
+            self.weeks = content.get("weeks", {})
+        return self
+
+    def save(self) -> None:
+        """writes the manifest file, if something has changed since loading"""
+        if not self.changed:
+            return
+        write_file(path=self.path, json=True, data={"version": self.version, "weeks": self.weeks})
+        self.changed = False
+
+    @staticmethod
+    def get_week_signature(path: str, walker: DirectoryWalker) -> dict:
+        """returns the stat based signature of a week folder, reading no file contents"""
+        files = {}
+        for entry in walker.scan(path=path):
+            file_stat = walker.stat(path=entry.path)
+            files[entry.name] = [file_stat.st_size, file_stat.st_mtime_ns]
+        return {"mtime": walker.stat(path=path).st_mtime_ns, "files": files}
+
+    def get_week(self, year: str, week: str, signature: dict) -> Union[dict, bool]:
+        """returns the manifest entry of a week if its signature still matches, otherwise False"""
+        entry = self.weeks.get(self.get_key(year=year, week=week))
+        if not entry or entry.get("signature") != signature:
+            return False
+        return entry
+
+    def is_racy(self, entry: dict) -> bool:
+        """returns if the folder or a file of a week was modified within mtime_granularity of its scan"""
+        mtimes = [entry["signature"]["mtime"]] + [mtime for _, mtime in entry["signature"]["files"].values()]
+        return max(mtimes) >= entry["scanned"] - self.mtime_granularity
+
+    def set_week(self, signature: dict, cw_obj: Calendarweek, scanned: int) -> None:
+        """stores a freshly parsed calendarweek together with its signature and the scan time in nanoseconds.
+        if the week was read again with an unchanged signature and hash, only the scan time is updated"""
+        key = self.get_key(year=cw_obj.year, week=cw_obj.week)
+        content_hash = cw_obj.get_content_hash()
+        entry = self.weeks.get(key)
+        if entry and entry["signature"] == signature and entry["hash"] == content_hash:
+            entry["scanned"] = scanned
+            self.changed = True
+            return
+        self.weeks[key] = {
+            "signature": signature,
+            "scanned": scanned,
+            "hash": content_hash,
+            "items": {
+                str(day): {
+                    "filepath": data.filepath,
+                    "item_date": data.item_date.isoformat(),
+                    "message": data.message,
+                    "logentrys": data.logentrys,
+                } for day, data in cw_obj.items.items()
+            },
+        }
+        self.changed = True
+
+    def prune(self, keys: set) -> None:
+        """removes all weeks whose folders were not seen during the last scan"""
+        for key in [key for key in self.weeks if key not in keys]:
+            del self.weeks[key]
+            self.changed = True
+
+
+class ReportCache:
+    """Rendered ReStructuredText of the reported calendarweeks, kept in a weeks folder next to the report.
+
+    every week is stored as $year_$calendarweek.part together with its render hash in hashes.json.
+    a week is only rendered again if its hash changed, the .part suffix keeps sphinx from reading the files.
+    settings is a hash over everything that changes the rendering of all weeks at once, like the translation.
+    """
+    version = 1
+    hashes_name = "hashes.json"
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.settings = ""
+        self.weeks = {}
+        self.changed = False
+
+    def get_filepath(self, key: str) -> str:
+        """returns the path of the rendered week stored under key"""
+        return str(join(self.path, key.replace("/", "_") + ".part"))
+
+    def load(self, settings: str):
+        """loads the hashes, a missing, broken or outdated file or other settings result in an empty cache"""
+        self.settings = settings
+        self.weeks = {}
+        self.changed = False
+        hashes_path = str(join(self.path, self.hashes_name))
+        if not isfile(hashes_path):
+            return self
+        try:
+            content = read_file(path=hashes_path, json=True)
+        except (OSError, ValueError):
+            return self
+        if content.get("version") == self.version and content.get("settings") == settings:
+            self.weeks = content.get("weeks", {})
+        return self
+
+    def save(self) -> None:
+        """writes the hashes, if something has changed since loading"""
+        if not self.changed:
+            return
+        create_folder(dir_path=self.path)
+        write_file(path=str(join(self.path, self.hashes_name)), json=True,
+                   data={"version": self.version, "settings": self.settings, "weeks": self.weeks})
+        self.changed = False
+
+    def get_week(self, key: str, week_hash: str) -> Union[str, bool]:
+        """returns the rendered week if its hash still matches, otherwise False"""
+        filepath = self.get_filepath(key=key)
+        if self.weeks.get(key) != week_hash or not isfile(filepath):
+            return False
+        return read_file(path=filepath, json=False)
+
+    def set_week(self, key: str, week_hash: str, rst: str) -> None:
+        """stores a freshly rendered week together with its hash"""
+        create_folder(dir_path=self.path)
+        write_file_if_changed(path=self.get_filepath(key=key), data=rst)
+        self.weeks[key] = week_hash
+        self.changed = True
+
+    def prune(self, keys: set) -> None:
+        """removes all weeks that were not part of the last report"""
+        for key in [key for key in self.weeks if key not in keys]:
+            del self.weeks[key]
+            if isfile(self.get_filepath(key=key)):
+                remove(self.get_filepath(key=key))
+            self.changed = True
+
+
+class MappedFile(mmap):
+    """read only memory map usable as file object for zipfile, which asks for seekable"""
+
+    def seekable(self) -> bool:
+        return True
+
+
+class YearArchive:
+    """Zip archive holding the calendarweek folders of a completed year, one $calendarweek.json member per week.
+
+    a member maps the filenames of the week folder to their content. the archive is memory mapped while open
+    and its central directory is the index, so a single calendarweek is read without decompressing the others.
+    """
+    member_suffix = ".json"
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.file = None
+        self.mapped = None
+        self.zip_file = None
+        self.weeks = {}
+
+    def __enter__(self) -> "YearArchive":
+        self.file = open(self.path, mode="rb")
+        self.mapped = MappedFile(self.file.fileno(), 0, access=ACCESS_READ)
+        self.zip_file = ZipFile(self.mapped)
+        self.weeks = {info.filename[:-len(self.member_suffix)]: info for info in self.zip_file.infolist()
+                      if info.filename.endswith(self.member_suffix)}
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.zip_file.close()
+        self.mapped.close()
+        self.file.close()
+
+    def list_weeks(self) -> List[str]:
+        """returns the calendarweeks in the archive"""
+        return list(self.weeks)
+
+    def read_week(self, week: str) -> dict:
+        """returns the files of a calendarweek as {filename: content}"""
+        if week not in self.weeks:
+            return {}
+        return loads(self.zip_file.read(self.weeks[week]).decode("utf-8"))
+
+    def extract_week(self, week: str, path: str) -> int:
+        """writes the files of a calendarweek into a folder, files already present are kept.
+        returns the amount of files of the calendarweek"""
+        create_folder(dir_path=path)
+        files = self.read_week(week=week)
+        for filename, content in files.items():
+            filepath = str(join(path, basename(filename)))
+            if not isfile(filepath):
+                write_file(path=filepath, json=False, data=content)
+        return len(files)
+
+    @staticmethod
+    def pack(path: str, weeks: dict) -> None:
+        """writes an archive from {calendarweek: {filename: content}}, an existing archive is replaced when complete"""
+        with ZipFile(path + ".tmp", mode="w", compression=ZIP_DEFLATED) as zip_file:
+            for week, files in weeks.items():
+                zip_file.writestr(week + YearArchive.member_suffix, dumps(files).encode("utf-8"))
+        replace(path + ".tmp", path)
+
+
+class Storage(ABC):
+    """Interface of the storages behind TagesgerichtManager.
+
+    a storage persists the messages and logentrys of calendarweeks.
+    special days are attached by the manager after loading, so they are the same for every storage.
+    """
+
+    @abstractmethod
+    def create_week(self, year: str, week: str, active_days: List[int]) -> None:
+        """creates empty day items for the active days of a calendarweek, existing days are kept"""
+
+    @abstractmethod
+    def set_message(self, year: str, week: str, day_num: int, message: str) -> None:
+        """stores the message of a day, the calendarweek is created if it doesnt exist"""
+
+    @abstractmethod
+    def list_weeks(self, since: date = None, until: date = None) -> List[List[str]]:
+        """returns year and week of all stored calendarweeks overlapping the date window"""
+
+    @abstractmethod
+    def load_week(self, year: str, week: str) -> Union[Calendarweek, bool]:
+        """returns a single calendarweek, False if it doesnt exist"""
+
+    def load_weeks(self, since: date = None, until: date = None) -> dict:
+        """returns all calendarweeks overlapping the date window as {year: {week: Calendarweek}}"""
+        result = {}
+        for year, week in self.list_weeks(since=since, until=until):
+            result.setdefault(year, {})[week] = self.load_week(year=year, week=week)
+        return result
+
+    def iter_weeks(self, since: date = None, until: date = None, reverse: bool = False) -> Iterator[Calendarweek]:
+        """yields the calendarweeks overlapping the date window one at a time in chronological order,
+        only the calendarweek being yielded is held in memory"""
+        for year, week in self.sort_weeks(weeks=self.list_weeks(since=since, until=until), reverse=reverse):
+            cw_obj = self.load_week(year=year, week=week)
+            if cw_obj:
+                yield cw_obj
+
+    @staticmethod
+    def sort_weeks(weeks: List[List[str]], reverse: bool = False) -> List[List[str]]:
+        """sorts year and week pairs chronologically, not by their names"""
+        return sorted(weeks, key=lambda key: (int(key[0]), int(key[1])), reverse=reverse)
+
+    def load_day(self, year: str, week: str, day_num: int) -> Union[Calendaritem, bool]:
+        """returns a single day item, False if it doesnt exist"""
+        cw_obj = self.load_week(year=year, week=week)
+        if not cw_obj:
+            return False
+        return cw_obj.items.get(day_num, False)
+
+    @abstractmethod
+    def append_log(self, cw_obj: Calendarweek, day_num: int) -> None:
+        """persists the newest logentry of a day"""
+
+    @abstractmethod
+    def save_week(self, cw_obj: Calendarweek) -> None:
+        """stores a complete calendarweek with messages and logentrys, used by migrate_storage"""
+
+    def compact(self) -> int:
+        """folds appended logentrys into a compact form, returns the amount of compacted calendarweeks"""
+        return 0
+
+    def archive_year(self, year: str) -> int:
+        """packs a completed year into a single archive, returns the amount of packed files"""
+        return 0
+
+    def unpack_year(self, year: str) -> int:
+        """restores an archived year, returns the amount of restored files"""
+        return 0
+
+    @abstractmethod
+    def get_lock(self) -> FileLock:
+        """returns the lock guarding the check, send and log sequence of all processes sharing this storage"""
+
+    @abstractmethod
+    def claim_action(self, year: str, week: str, day_num: int, action: str) -> bool:
+        """records the idempotency key of an action on a day, returns False if it was recorded before"""
+
+    @abstractmethod
+    def release_action(self, year: str, week: str, day_num: int, action: str) -> None:
+        """removes the idempotency key of an action that failed, so it can be tried again"""
+
+    @staticmethod
+    def is_year_in_window(year: str, since: date = None, until: date = None) -> bool:
+        """Returns if a year can hold calendarweeks within the date window"""
+        if since is None and until is None:
+            return True
+        if not year.isdigit():
+            return False
+        if since and int(year) < IsoWeekTable.get_iso_week(day=since)[0]:
+            return False
+        return not (until and int(year) > IsoWeekTable.get_iso_week(day=until)[0])
+
+
+class FolderStorage(Storage):
+    """Storage on the folder layout year/calendarweek/DAYNUM_DAYNAME.txt with a log.json per calendarweek.
+
+    DAYNUM represents the day of the week starting with Monday at 0 and
+    ending with sunday at 6, DAYNAME is defined via the weekday_map of the translation
+
+    sends and stops are appended as single records to journal.jsonl, log.json is the snapshot compact folds it into.
+    completed years can be packed into a YearArchive named $year.zip in the data dir, which is read instead of folders.
+    """
+    logfile_name = "log.json"
+    journal_name = "journal.jsonl"
+    compacting_suffix = ".compacting"
+    archive_suffix = ".zip"
+
+    def __init__(self, data_dir: str, weekday_map: dict, translate: dict, scan_manifest: bool = False,
+                 parse_workers: int = 0) -> None:
+        self.data_dir = data_dir
+        self.weekday_map = weekday_map
+        self.translate = translate
+        self.manifest = ScanManifest(path=str(join(data_dir, "manifest.json"))) if scan_manifest else None
+        self.parse_workers = parse_workers
+        self.walker = DirectoryWalker()
+
+    def create_week(self, year: str, week: str, active_days: List[int]) -> None:
+        """Creates the filestructure for tagesgericht, called by the managers init method"""
+        path_year = str(join(self.data_dir, year))
+        path_kw = str(join(self.data_dir, year, week))
+        if not exists(path_year):
+            create_folder(dir_path=path_year)
+        if not exists(path_kw):
+            create_folder(dir_path=path_kw)
+        self.create_templates(active_days=active_days, folderpath=path_kw)
+
+    def create_templates(self, active_days: list, folderpath: str) -> None:
+        """creates the empty daytemplates within the calendarweeksfolder"""
+        self.walker.scan(path=folderpath, legacy_syscalls=0)
+        for day_num in active_days:
+            day_name = self.weekday_map.get(str(day_num))
+            filename = "{}_{}.txt".format(day_num, day_name)
+            filepath = join(folderpath, filename)
+            filepath = str(filepath)
+            if self.walker.is_file(path=filepath):
+                continue
+            try:
+                write_file(path=filepath, data="", json=False)
+            except Exception as e:
+                print(self.translate.get("couldn't create file, check permissions",
+                                         "couldn't create file, check permissions"))
+                print(str(type(e)), str(e))
+
+    def set_message(self, year: str, week: str, day_num: int, message: str) -> None:
+        """writes the message into the day file, creating the calendarweek folder if needed"""
+        path_kw = str(join(self.data_dir, year, week))
+        create_folder(dir_path=path_kw)
+        filename = "{}_{}.txt".format(day_num, self.weekday_map.get(str(day_num)))
+        write_file(path=str(join(path_kw, filename)), json=False, data=message)
+
+    def list_weeks(self, since: date = None, until: date = None) -> List[List[str]]:
+        """returns year and week of all calendarweek folders and archived calendarweeks overlapping the date window"""
+        self.walker.clear()
+        result = []
+        year_dirs = [entry.name for entry in self.walker.list_dirs(path=self.data_dir)]
+        for year in self.list_archived_years():
+            if not self.is_year_in_window(year=year, since=since, until=until):
+                continue
+            with YearArchive(path=self.get_archive_path(year=year)) as archive:
+                weeks = archive.list_weeks()
+            if year in year_dirs:
+                weeks = [week for week in weeks if not self.walker.is_dir(path=str(join(self.data_dir, year, week)))]
+            result.extend([year, week] for week in self.filter_weeks(year=year, weeks=weeks, since=since, until=until))
+        for year in year_dirs:
+            if not self.is_year_in_window(year=year, since=since, until=until):
+                continue
+            weeks = [entry.name for entry in self.walker.list_dirs(path=str(join(self.data_dir, year)))]
+            result.extend([year, week] for week in self.filter_weeks(year=year, weeks=weeks, since=since, until=until))
+        return result
+
+    @staticmethod
+    def filter_weeks(year: str, weeks: List[str], since: date = None, until: date = None) -> List[str]:
+        """returns the calendarweeks of a year overlapping the date window"""
+        if since is None and until is None:
+            return weeks
+        return [week for week in weeks if Calendarweek.is_week_in_window(
+            *Calendarweek.get_cw_from_to(year=year, week=week), since=since, until=until)]
+
+    def load_week(self, year: str, week: str) -> Union[Calendarweek, bool]:
+        """parses a single calendarweek folder or archived calendarweek, the scan manifest is not used for single weeks"""
+        year_path = str(join(self.data_dir, year))
+        self.walker.clear()
+        if self.walker.is_dir(path=str(join(year_path, week))):
+            return self.load_calendarweek(path=year_path, year=year, week=week)
+        archive_path = self.get_archive_path(year=year)
+        if not isfile(archive_path):
+            return False
+        with YearArchive(path=archive_path) as archive:
+            if week not in archive.weeks:
+                return False
+            return self.load_archived_calendarweek(archive=archive, year=year, week=week)
+
+    def load_weeks(self, since: date = None, until: date = None) -> dict:
+        """parses all calendarweek folders overlapping the date window"""
+        return self.parse_year_dir(path=self.data_dir, since=since, until=until)
+
+    def iter_weeks(self, since: date = None, until: date = None, reverse: bool = False) -> Iterator[Calendarweek]:
+        """yields calendarweek folders and archived calendarweeks one at a time in chronological order.
+        the archive of a year is opened once for all its calendarweeks, the walker cache is dropped per year"""
+        weeks = self.sort_weeks(weeks=self.list_weeks(since=since, until=until), reverse=reverse)
+        for year, year_weeks in groupby(weeks, key=lambda key: key[0]):
+            self.walker.clear()
+            weeks_of_year = [week for _, week in year_weeks]
+            archive_path = self.get_archive_path(year=year)
+            if not isfile(archive_path):
+                yield from self.iter_year_weeks(year=year, weeks=weeks_of_year)
+                continue
+            with YearArchive(path=archive_path) as archive:
+                yield from self.iter_year_weeks(year=year, weeks=weeks_of_year, archive=archive)
+        self.walker.clear()
+
+    def iter_year_weeks(self, year: str, weeks: List[str], archive: YearArchive = None) -> Iterator[Calendarweek]:
+        """yields calendarweeks of a single year, from the archive unless there is a calendarweek folder"""
+        year_path = str(join(self.data_dir, year))
+        for week in weeks:
+            if archive and week in archive.weeks and not isdir(join(year_path, week)):
+                yield self.load_archived_calendarweek(archive=archive, year=year, week=week)
+            else:
+                yield self.load_calendarweek(path=year_path, year=year, week=week)
+
+    def append_log(self, cw_obj: Calendarweek, day_num: int) -> None:
+        """appends the newest logentry of a day to the journal of the calendarweek, log.json is not rewritten"""
+        journal_path = str(join(self.data_dir, cw_obj.year, cw_obj.week, self.journal_name))
+        append_line(path=journal_path, data={"day": str(day_num), "logentry": cw_obj.items[day_num].logentrys[-1]})
+
+    def get_lock(self) -> FileLock:
+        """returns the lock file in the data dir"""
+        create_folder(dir_path=self.data_dir)
+        return FileLock(path=str(join(self.data_dir, "tagesgericht.lock")))
+
+    def get_action_path(self, year: str, week: str, day_num: int, action: str) -> str:
+        """returns the path of the idempotency key file of an action, next to the day files"""
+        return str(join(self.data_dir, year, week, "{}_{}.key".format(day_num, action)))
+
+    def claim_action(self, year: str, week: str, day_num: int, action: str) -> bool:
+        """creates the key file exclusively, which only one process can succeed in"""
+        try:
+            close(os_open(self.get_action_path(year=year, week=week, day_num=day_num, action=action),
+                          O_WRONLY | O_CREAT | O_EXCL, 0o644))
+        except FileExistsError:
+            return False
+        return True
+
+    def release_action(self, year: str, week: str, day_num: int, action: str) -> None:
+        """removes the key file"""
+        remove(self.get_action_path(year=year, week=week, day_num=day_num, action=action))
+
+    def compact(self) -> int:
+        """folds the journals of all calendarweek folders into their log.json, archived calendarweeks have none"""
+        return sum(self.compact_week(year=year, week=week) for year, week in self.list_weeks()
+                   if isdir(join(self.data_dir, year, week)))
+
+    def compact_week(self, year: str, week: str) -> bool:
+        """folds the journal of a calendarweek into its log.json, returns if there was something to fold.
+        the journal is renamed first, so records appended meanwhile start a new journal.
+        a renamed journal left over by an interrupted compaction is folded on the next run"""
+        week_path = str(join(self.data_dir, year, week))
+        journal_path = str(join(week_path, self.journal_name))
+        compacting_path = journal_path + self.compacting_suffix
+        if not isfile(compacting_path):
+            if not isfile(journal_path):
+                return False
+            replace(journal_path, compacting_path)
+        day_logs = self.read_week_logs(path=week_path, filenames=[self.logfile_name, basename(compacting_path)])
+        logfile_path = str(join(week_path, self.logfile_name))
+        write_file(path=logfile_path + ".tmp", json=True, data=day_logs)
+        replace(logfile_path + ".tmp", logfile_path)
+        remove(compacting_path)
+        return True
+
+    def read_week_logs(self, path: str, filenames: List[str]) -> dict:
+        """reads the log.json snapshot of a calendarweek folder and replays its journals on top of it.
+        records already contained, like after a compaction that was interrupted before removing its journal,
+        are skipped"""
+        day_logs = {}
+        if self.logfile_name in filenames:
+            day_logs = read_file(path=str(join(path, self.logfile_name)), json=True)
+        seen = {day: {dumps(logentry, sort_keys=True) for logentry in day_log} for day, day_log in day_logs.items()}
+        for journal_name in [self.journal_name + self.compacting_suffix, self.journal_name]:
+            if journal_name not in filenames:
+                continue
+            for record in read_lines(path=str(join(path, journal_name))):
+                key = dumps(record["logentry"], sort_keys=True)
+                day_seen = seen.setdefault(record["day"], set())
+                if key not in day_seen:
+                    day_seen.add(key)
+                    day_logs.setdefault(record["day"], []).append(record["logentry"])
+        return day_logs
+
+    def save_week(self, cw_obj: Calendarweek) -> None:
+        """writes the day files and the log.json of a calendarweek"""
+        path_kw = str(join(self.data_dir, cw_obj.year, cw_obj.week))
+        create_folder(dir_path=path_kw)
+        for day_num, data in cw_obj.items.items():
+            filename = "{}_{}.txt".format(day_num, self.weekday_map.get(str(day_num)))
+            write_file(path=str(join(path_kw, filename)), json=False, data=data.message)
+        self.write_week_logfile(year=cw_obj.year, week=cw_obj.week, items=cw_obj.items)
+
+    def write_week_logfile(self, year: str, week: str, items: dict) -> None:
+        """Writes a logfile from each day into a big log.json
+        this will be used during initialization to restore days logitems"""
+        logfile_path = str(join(self.data_dir, year, week, self.logfile_name))
+        logfile_content = {}
+        for day, data in items.items():
+            if not logfile_content.get(str(day)) and not data.logentrys:
+                continue
+            logfile_content[str(day)] = data.logentrys
+        write_file(path=logfile_path + ".tmp", json=True, data=logfile_content)
+        replace(logfile_path + ".tmp", logfile_path)
+
+    def get_archive_path(self, year: str) -> str:
+        """returns the path of the archive of a year"""
+        return str(join(self.data_dir, year + self.archive_suffix))
+
+    def list_archived_years(self) -> List[str]:
+        """returns the years packed into an archive in the data dir, from the cached listing if it was scanned"""
+        names = [entry.name[:-len(self.archive_suffix)] for entry in self.walker.list_cached_files(path=self.data_dir)
+                 if entry.name.endswith(self.archive_suffix)]
+        return sorted(name for name in names if name.isdigit())
+
+    def archive_year(self, year: str) -> int:
+        """packs the calendarweek folders of a year into $year.zip and removes the year folder.
+        journals are folded into log.json first, only day files and log.json are packed, idempotency keys are dropped.
+        weeks of an existing archive are unpacked first, so they are packed again together with the folders"""
+        year_path = str(join(self.data_dir, year))
+        if not isdir(year_path):
+            return 0
+        archive_path = self.get_archive_path(year=year)
+        if isfile(archive_path):
+            self.unpack_year(year=year)
+        weeks = {}
+        self.walker.clear()
+        for week_entry in self.walker.list_dirs(path=year_path):
+            self.compact_week(year=year, week=week_entry.name)
+            week_path = str(join(year_path, week_entry.name))
+            weeks[week_entry.name] = {
+                entry.name: read_file(path=str(join(week_path, entry.name)), json=False)
+                for entry in self.walker.list_files(path=week_path)
+                if entry.name.endswith(".txt") or entry.name == self.logfile_name
+            }
+        YearArchive.pack(path=archive_path, weeks=weeks)
+        remove_folder(dir_path=year_path)
+        self.walker.clear()
+        return sum(len(files) for files in weeks.values())
+
+    def unpack_year(self, year: str) -> int:
+        """restores the calendarweek folders of an archived year and removes the archive, returns the amount of files.
+        files already present in the folders are kept"""
+        archive_path = self.get_archive_path(year=year)
+        if not isfile(archive_path):
+            return 0
+        with YearArchive(path=archive_path) as archive:
+            files = sum(archive.extract_week(week=week, path=str(join(self.data_dir, year, week)))
+                        for week in archive.list_weeks())
+        remove(archive_path)
+        self.walker.clear()
+        return files
+
+    def parse_year_dir(self, path: str, since: date = None, until: date = None) -> dict:
+        """Iterates over each year and trys to initialize calendarweeks within them.
+        archived years are read from their archive first, calendarweek folders of the same year take precedence.
+        year and calendarweek folders outside of the date window given by since and until are not opened"""
+        self.walker.clear()
+        if self.manifest:
+            self.manifest.load()
+        result = {}
+        year_entries = self.walker.list_dirs(path=path)
+        for year in self.list_archived_years():
+            if self.is_year_in_window(year=year, since=since, until=until):
+                result[year] = self.parse_archive(year=year, since=since, until=until)
+        for year_entry in year_entries:
+            year = year_entry.name
+            if not self.is_year_in_window(year=year, since=since, until=until):
+                continue
+            year_dict = result.get(year, {})
+            result[str(year)] = self.parse_week_dir(path=str(join(path, year)), year_dict=year_dict, year=year,
+                                                    since=since, until=until)
+        if self.manifest:
+            if since is None and until is None:
+                self.manifest.prune(keys={
+                    ScanManifest.get_key(year=year, week=week) for year, weeks in result.items() for week in weeks
+                })
+            self.manifest.save()
+        return result
+
+    @staticmethod
+    def get_new_calendarweek_obj(year: str, week: str) -> Calendarweek:
+        """initializes and returns a new calendarweek item"""
+        return Calendarweek(year=year, week=week)
+
+    def parse_week_dir(self, path: str, year_dict: dict, year: str, since: date = None, until: date = None) -> dict:
+        """parses a calendarweek dir and initializes days by found txt files.
+        enriches the calendaritems with old logentrys.
+        calendarweeks outside of the date window given by since and until are skipped.
+        with more than one parse worker configured, the weeks are loaded concurrently by a thread pool,
+        the result is merged in the same order as in serial mode"""
+        weeks = self.filter_weeks(year=year, weeks=[entry.name for entry in self.walker.list_dirs(path=path)],
+                                  since=since, until=until)
+        if self.parse_workers > 1 and len(weeks) > 1:
+            with ThreadPoolExecutor(max_workers=self.parse_workers) as executor:
+                cw_objs = list(executor.map(lambda week: self.parse_week(path=path, year=year, week=week), weeks))
+        else:
+            cw_objs = [self.parse_week(path=path, year=year, week=week) for week in weeks]
+        for week, cw_obj in zip(weeks, cw_objs):
+            year_dict[str(week)] = cw_obj
+        return year_dict
+
+    def parse_week(self, path: str, year: str, week: str) -> Calendarweek:
+        """parses a single calendarweek, if the scan manifest is enabled unchanged weeks are restored from it"""
+        if self.manifest:
+            return self.parse_week_with_manifest(path=path, year=year, week=week)
+        return self.load_calendarweek(path=path, year=year, week=week)
+
+    def parse_week_with_manifest(self, path: str, year: str, week: str) -> Calendarweek:
+        """restores a week from the scan manifest if its folder is unchanged and not racy,
+        otherwise parses and stores it"""
+        scanned = time_ns()
+        signature = self.manifest.get_week_signature(path=str(join(path, week)), walker=self.walker)
+        entry = self.manifest.get_week(year=year, week=week, signature=signature)
+        if entry and not self.manifest.is_racy(entry=entry):
+            return self.restore_calendarweek(year=year, week=week, entry=entry)
+        cw_obj = self.load_calendarweek(path=path, year=year, week=week)
+        self.manifest.set_week(signature=signature, cw_obj=cw_obj, scanned=scanned)
+        return cw_obj
+
+    def load_calendarweek(self, path: str, year: str, week: str) -> Calendarweek:
+        """reads the day files and the log.json of a single calendarweek folder"""
+        cw_files_dirpath = str(join(path, week))
+        filenames = [entry.name for entry in self.walker.list_files(path=cw_files_dirpath)]
+        day_logfiles = self.read_week_logs(path=cw_files_dirpath, filenames=filenames)
+        message_files = [filename for filename in filenames if filename.endswith(".txt")]
+
+        cw_obj = self.get_new_calendarweek_obj(year=year, week=week)
+        for message_file in message_files:
+            file_weekday = int(message_file.split("_")[0])
+            cw_obj.add_file(
+                filepath=str(join(cw_files_dirpath, message_file)),
+                item_date=IsoWeekTable.get_date(year=year, week=week, weekday=file_weekday)
+            )
+
+            day_logfile = day_logfiles.get(str(file_weekday))
+            if day_logfile:
+                cw_obj.init_log_for_day(log=day_logfile, day_num=file_weekday)
+
+        cw_obj.prepare_week_report()
+        return cw_obj
+
+    def parse_archive(self, year: str, since: date = None, until: date = None) -> dict:
+        """reads the calendarweeks of an archived year overlapping the date window, other weeks stay compressed"""
+        with YearArchive(path=self.get_archive_path(year=year)) as archive:
+            weeks = self.filter_weeks(year=year, weeks=archive.list_weeks(), since=since, until=until)
+            return {week: self.load_archived_calendarweek(archive=archive, year=year, week=week) for week in weeks}
+
+    def load_archived_calendarweek(self, archive: YearArchive, year: str, week: str) -> Calendarweek:
+        """reads the day files and the log.json of a calendarweek from an open archive"""
+        files = archive.read_week(week=week)
+        day_logfiles = loads(files[self.logfile_name]) if self.logfile_name in files else {}
+        cw_obj = self.get_new_calendarweek_obj(year=year, week=week)
+        for filename, content in files.items():
+            if not filename.endswith(".txt"):
+                continue
+            file_weekday = int(filename.split("_")[0])
+            cw_obj.add_message(
+                filepath=str(join(archive.path, week, filename)),
+                item_date=IsoWeekTable.get_date(year=year, week=week, weekday=file_weekday),
+                message=Calendaritem.normalize_to_nfc(data=content),
+            )
+            day_logfile = day_logfiles.get(str(file_weekday))
+            if day_logfile:
+                cw_obj.init_log_for_day(log=day_logfile, day_num=file_weekday)
+        cw_obj.prepare_week_report()
+        return cw_obj
+
+    def restore_calendarweek(self, year: str, week: str, entry: dict) -> Calendarweek:
+        """rebuilds a calendarweek from a scan manifest entry, without touching the week folder"""
+        cw_obj = self.get_new_calendarweek_obj(year=year, week=week)
+        for day_num, day in entry.get("items", {}).items():
+            item_date = date.fromisoformat(day["item_date"])
+            cw_obj.add_message(filepath=day["filepath"], item_date=item_date, message=day["message"])
+            if day["logentrys"]:
+                cw_obj.init_log_for_day(log=day["logentrys"], day_num=int(day_num))
+        cw_obj.prepare_week_report()
+        return cw_obj
+
+
+class SQLiteStorage(Storage):
+    """Storage in an indexed SQLite database, running in WAL mode.
+
+    weeks holds the first and last day of every calendarweek and is indexed for date window queries,
+    days holds the messages and logs the logentrys of each day in the order they were appended.
+    there are no day files to edit, messages are stored with set_message, their filepath stays empty.
+    every thread gets its own connection, so the transactions of the menu and the outbox worker cant interleave.
+    """
+    schema = [
+        "CREATE TABLE IF NOT EXISTS weeks (year TEXT NOT NULL, week TEXT NOT NULL, first_day TEXT NOT NULL, "
+        "last_day TEXT NOT NULL, PRIMARY KEY (year, week))",
+        "CREATE INDEX IF NOT EXISTS weeks_window ON weeks (last_day, first_day)",
+        "CREATE TABLE IF NOT EXISTS days (year TEXT NOT NULL, week TEXT NOT NULL, day_num INTEGER NOT NULL, "
+        "item_date TEXT NOT NULL, filepath TEXT NOT NULL, message TEXT NOT NULL, PRIMARY KEY (year, week, day_num))",
+        "CREATE TABLE IF NOT EXISTS logs (id INTEGER PRIMARY KEY AUTOINCREMENT, year TEXT NOT NULL, "
+        "week TEXT NOT NULL, day_num INTEGER NOT NULL, logentry TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS logs_day ON logs (year, week, day_num)",
+        "CREATE TABLE IF NOT EXISTS actions (year TEXT NOT NULL, week TEXT NOT NULL, day_num INTEGER NOT NULL, "
+        "action TEXT NOT NULL, PRIMARY KEY (year, week, day_num, action))",
+    ]
+    window_condition = "(? IS NULL OR w.last_day >= ?) AND (? IS NULL OR w.first_day <= ?)"
+
+    def __init__(self, path: str, weekday_map: dict) -> None:
+        self.path = path
+        self.weekday_map = weekday_map
+        if dirname(path):
+            create_folder(dir_path=dirname(path))
+        self.local = local()
+        self.connections = []
+        self.connections_lock = Lock()
+        with self.connection:
+            for statement in self.schema:
+                self.connection.execute(statement)
+
+    @property
+    def connection(self) -> Connection:
+        """returns the connection of the calling thread, it is opened on first use"""
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            # close runs in the thread that created the storage, so it has to be allowed to close every connection
+            connection = connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+            with self.connections_lock:
+                self.connections.append(connection)
+        return connection
+
+    def close(self) -> None:
+        """closes the database connections of all threads"""
+        with self.connections_lock:
+            for connection in self.connections:
+                connection.close()
+            self.connections = []
+        self.local = local()
+
+    @staticmethod
+    def get_window_parameters(since: date = None, until: date = None) -> list:
+        """returns the query parameters for window_condition"""
+        since = since.isoformat() if since else None
+        until = until.isoformat() if until else None
+        return [since, since, until, until]
+
+    def insert_week(self, year: str, week: str) -> Calendarweek:
+        """inserts a calendarweek row if it doesnt exist yet and returns an empty calendarweek object"""
+        cw_obj = Calendarweek(year=year, week=week)
+        self.connection.execute(
+            "INSERT OR IGNORE INTO weeks (year, week, first_day, last_day) VALUES (?, ?, ?, ?)",
+            [year, week, cw_obj.first_day_of_week.isoformat(), cw_obj.last_day_of_week.isoformat()]
+        )
+        return cw_obj
+
+    def create_week(self, year: str, week: str, active_days: List[int]) -> None:
+        """inserts the calendarweek and empty messages for the active days, existing days are kept"""
+        with self.connection:
+            cw_obj = self.insert_week(year=year, week=week)
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO days (year, week, day_num, item_date, filepath, message) "
+                "VALUES (?, ?, ?, ?, '', '')",
+                [[year, week, day_num, (cw_obj.first_day_of_week + timedelta(days=day_num)).isoformat()]
+                 for day_num in active_days]
+            )
+
+    def set_message(self, year: str, week: str, day_num: int, message: str) -> None:
+        """inserts the calendarweek if needed and replaces the message of the day, its logentrys are kept"""
+        with self.connection:
+            cw_obj = self.insert_week(year=year, week=week)
+            self.connection.execute(
+                "INSERT INTO days (year, week, day_num, item_date, filepath, message) VALUES (?, ?, ?, ?, '', ?) "
+                "ON CONFLICT (year, week, day_num) DO UPDATE SET message = excluded.message",
+                [year, week, day_num, (cw_obj.first_day_of_week + timedelta(days=day_num)).isoformat(), message]
+            )
+
+    def list_weeks(self, since: date = None, until: date = None) -> List[List[str]]:
+        """returns year and week of all calendarweeks overlapping the date window"""
+        return [[year, week] for year, week in self.connection.execute(
+            "SELECT w.year, w.week FROM weeks w WHERE " + self.window_condition,
+            self.get_window_parameters(since=since, until=until)
+        )]
+
+    def load_week(self, year: str, week: str) -> Union[Calendarweek, bool]:
+        """returns a single calendarweek, False if it doesnt exist"""
+        row = self.connection.execute("SELECT 1 FROM weeks WHERE year = ? AND week = ?", [year, week]).fetchone()
+        if not row:
+            return False
+        weeks = self.build_weeks(
+            days=self.connection.execute(
+                "SELECT year, week, day_num, item_date, filepath, message FROM days WHERE year = ? AND week = ?",
+                [year, week]
+            ),
+            logs=self.connection.execute(
+                "SELECT year, week, day_num, logentry FROM logs WHERE year = ? AND week = ? ORDER BY id",
+                [year, week]
+            ),
+            weeks=[[year, week]]
+        )
+        return weeks[year][week]
+
+    def load_weeks(self, since: date = None, until: date = None) -> dict:
+        """returns all calendarweeks overlapping the date window with three indexed queries"""
+        parameters = self.get_window_parameters(since=since, until=until)
+        return self.build_weeks(
+            days=self.connection.execute(
+                "SELECT d.year, d.week, d.day_num, d.item_date, d.filepath, d.message FROM days d "
+                "JOIN weeks w ON w.year = d.year AND w.week = d.week WHERE " + self.window_condition, parameters
+            ),
+            logs=self.connection.execute(
+                "SELECT l.year, l.week, l.day_num, l.logentry FROM logs l "
+                "JOIN weeks w ON w.year = l.year AND w.week = l.week WHERE " + self.window_condition +
+                " ORDER BY l.id", parameters
+            ),
+            weeks=self.list_weeks(since=since, until=until)
+        )
+
+    @staticmethod
+    def build_weeks(days, logs, weeks: List[List[str]]) -> dict:
+        """builds calendarweek objects from day and log rows"""
+        result = {}
+        for year, week in weeks:
+            result.setdefault(year, {})[week] = Calendarweek(year=year, week=week)
+        # databases migrated before set_message existed may hold made up paths, there is no file behind them
+        for year, week, day_num, item_date, filepath, message in days:
+            result[year][week].add_message(filepath="", item_date=date.fromisoformat(item_date), message=message)
+        for year, week, day_num, logentry in logs:
+            day_item = result[year][week].items.get(day_num)
+            if day_item:
+                day_item.append_log(logentry=loads(logentry))
+        for yearcollection in result.values():
+            for cw_obj in yearcollection.values():
+                cw_obj.prepare_week_report()
+        return result
+
+    def load_day(self, year: str, week: str, day_num: int) -> Union[Calendaritem, bool]:
+        """returns a single day item with one indexed lookup, False if it doesnt exist"""
+        weeks = self.build_weeks(
+            days=self.connection.execute(
+                "SELECT year, week, day_num, item_date, filepath, message FROM days "
+                "WHERE year = ? AND week = ? AND day_num = ?", [year, week, day_num]
+            ),
+            logs=self.connection.execute(
+                "SELECT year, week, day_num, logentry FROM logs WHERE year = ? AND week = ? AND day_num = ? "
+                "ORDER BY id", [year, week, day_num]
+            ),
+            weeks=[[year, week]]
+        )
+        return weeks[year][week].items.get(day_num, False)
+
+    def append_log(self, cw_obj: Calendarweek, day_num: int) -> None:
+        """inserts the newest logentry of a day"""
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO logs (year, week, day_num, logentry) VALUES (?, ?, ?, ?)",
+                [cw_obj.year, cw_obj.week, day_num, dumps(cw_obj.items[day_num].logentrys[-1])]
+            )
+
+    def save_week(self, cw_obj: Calendarweek) -> None:
+        """replaces a calendarweek with all its messages and logentrys"""
+        with self.connection:
+            self.insert_week(year=cw_obj.year, week=cw_obj.week)
+            self.connection.execute("DELETE FROM logs WHERE year = ? AND week = ?", [cw_obj.year, cw_obj.week])
+            for day_num, data in cw_obj.items.items():
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO days (year, week, day_num, item_date, filepath, message) "
+                    "VALUES (?, ?, ?, ?, '', ?)",
+                    [cw_obj.year, cw_obj.week, day_num, data.item_date.isoformat(), data.message]
+                )
+                self.connection.executemany(
+                    "INSERT INTO logs (year, week, day_num, logentry) VALUES (?, ?, ?, ?)",
+                    [[cw_obj.year, cw_obj.week, day_num, dumps(logentry)] for logentry in data.logentrys]
+                )
+
+    def get_lock(self) -> FileLock:
+        """returns a lock file next to the database"""
+        return FileLock(path=self.path + ".lock")
+
+    def claim_action(self, year: str, week: str, day_num: int, action: str) -> bool:
+        """inserts the idempotency key, the primary key lets only the first insert succeed"""
+        try:
+            with self.connection:
+                self.connection.execute("INSERT INTO actions (year, week, day_num, action) VALUES (?, ?, ?, ?)",
+                                        [year, week, day_num, action])
+        except IntegrityError:
+            return False
+        return True
+
+    def release_action(self, year: str, week: str, day_num: int, action: str) -> None:
+        """deletes the idempotency key"""
+        with self.connection:
+            self.connection.execute("DELETE FROM actions WHERE year = ? AND week = ? AND day_num = ? AND action = ?",
+                                    [year, week, day_num, action])
+
+    def compact(self) -> int:
+        """moves the write ahead log into the database file and truncates it"""
+        self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return 0
+
+
+def migrate_storage(source: Storage, target: Storage) -> int:
+    """copies all calendarweeks from one storage into another, returns the amount of copied calendarweeks"""
+    count = 0
+    for year, yearcollection in source.load_weeks().items():
+        for week, cw_obj in yearcollection.items():
+            target.save_week(cw_obj=cw_obj)
+            count += 1
+    return count
+
+
+class SpecialdayRules:
+    """Compiles the rules of specialdays.json into a date to notice table per year.
+
+    a rule is one of
+    "24.12" a fixed day and month,
+    "6#2.5" the 2nd weekday 6 (sunday, monday is 0 like DAYNUM) in may, -1 counts from the end of the month,
+    "easter+39" a day relative to easter sunday,
+    "24.12..26.12" a range between two of the above, it may reach into the next year.
+    rules are compiled once, each year table is expanded on first use and cached.
+    """
+
+    def __init__(self, rules: dict) -> None:
+        self.rules = []
+        for expression, notice in rules.items():
+            try:
+                self.rules.append([self.compile_rule(expression=expression), notice])
+            except ValueError:
+                print("invalid specialday rule", expression)
+        self.years = {}
+
+    def compile_rule(self, expression: str):
+        """returns a function expanding a rule into its dates, starting in a given year"""
+        if ".." not in expression:
+            get_day = self.compile_day(expression=expression)
+            return lambda year: [get_day(year)]
+        get_first, get_last = [self.compile_day(expression=part) for part in expression.split("..", 1)]
+
+        def expand(year: int) -> List[date]:
+            first, last = get_first(year), get_last(year)
+            if not first or not last:
+                return []
+            if last < first:
+                last = get_last(year + 1)
+            return [first + timedelta(days=day) for day in range((last - first).days + 1)]
+        return expand
+
+    def compile_day(self, expression: str):
+        """returns a function calculating the date of a single day rule in a given year, None if it has none"""
+        expression = expression.strip().lower().rstrip(".")
+        if expression.startswith("easter"):
+            offset = int(expression[len("easter"):] or 0)
+            return lambda year: self.get_easter(year=year) + timedelta(days=offset)
+        if "#" in expression:
+            weekday, rest = expression.split("#", 1)
+            nth, month = rest.split(".", 1)
+            weekday, nth, month = int(weekday), int(nth), int(month)
+            if not 0 <= weekday <= 6 or not 1 <= abs(nth) <= 5 or not 1 <= month <= 12:
+                raise ValueError(expression)
+            return lambda year: self.get_nth_weekday(year=year, month=month, weekday=weekday, nth=nth)
+        day, month = [int(part) for part in expression.split(".")]
+        date(2000, month, day)
+
+        def get_day(year: int) -> Union[date, None]:
+            try:
+                return date(year, month, day)
+            except ValueError:
+                return None
+        return get_day
+
+    @staticmethod
+    def get_easter(year: int) -> date:
+        """returns easter sunday of the gregorian calendar, anonymous gregorian algorithm"""
+        a, b, c = year % 19, year // 100, year % 100
+        d, e = b // 4, b % 4
+        g = (b - (b + 8) // 25 + 1) // 3
+        h = (19 * a + b - d - g + 15) % 30
+        i, k = c // 4, c % 4
+        j = (32 + 2 * e + 2 * i - h - k) % 7
+        m = (a + 11 * h + 22 * j) // 451
+        month, day = divmod(h + j - 7 * m + 114, 31)
+        return date(year, month, day + 1)
+
+    @staticmethod
+    def get_nth_weekday(year: int, month: int, weekday: int, nth: int) -> Union[date, None]:
+        """returns the nth weekday of a month, negative nth counts from the end, None if the month has no such day"""
+        if nth > 0:
+            first = date(year, month, 1)
+            result = first + timedelta(days=(weekday - first.weekday()) % 7 + (nth - 1) * 7)
+        else:
+            last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+            result = last - timedelta(days=(last.weekday() - weekday) % 7 + (-nth - 1) * 7)
+        return result if result.month == month else None
+
+    def get_year(self, year: int) -> dict:
+        """returns the date to notice table of a year, several notices on one day are joined"""
+        table = self.years.get(year)
+        if table is None:
+            notices = {}
+            for expand, notice in self.rules:
+                for rule_year in [year - 1, year]:
+                    for day in expand(rule_year):
+                        if day and day.year == year:
+                            notices.setdefault(day, []).append(notice)
+            table = self.years.setdefault(year, {day: ", ".join(notice) for day, notice in notices.items()})
+        return table
+
+    def get_notice(self, day: date) -> str:
+        """returns the notice of a day, an empty string if there is none"""
+        return self.get_year(year=day.year).get(day, "")
+
+    def get_upcoming(self, since: date, until: date) -> List[list]:
+        """returns date and notice of all days with a notice within since and until"""
+        result = []
+        for year in range(since.year, until.year + 1):
+            result += [[day, notice] for day, notice in self.get_year(year=year).items() if since <= day <= until]
+        return sorted(result)
+
+
+class RstWriter:
+    """Writes ReStructuredText pieces straight into a text output, like an open report file.
+
+    every piece is written once, so output is built in linear time instead of concatenating growing strings.
+    without an output the pieces are collected in a StringIO and returned by getvalue.
+    """
+
+    def __init__(self, output: TextIO = None) -> None:
+        self.output = StringIO() if output is None else output
+
+    def getvalue(self) -> str:
+        """returns the collected pieces, only if no output was given"""
+        return self.output.getvalue()
+
+    def write(self, text: str) -> None:
+        """writes an already formatted piece"""
+        self.output.write(text)
+
+    @staticmethod
+    def get_line(string: str, linetype: str) -> str:
+        """returns the underline of a heading"""
+        return linetype * (len(string) + 1)
+
+    def header(self, message: str, doubled: bool, linetype: str) -> None:
+        """writes a heading, doubled adds an overline"""
+        line = self.get_line(string=message, linetype=linetype)
+        if doubled:
+            self.output.write(line + "\n")
+        self.output.write("{}\n{}\n\n".format(message, line))
+
+    def quote(self, quote: str, message: str) -> None:
+        """writes a field with an indented message, or a literal block if quote is empty"""
+        self.output.write(":{}:\n\n".format(quote))
+        for line in message.split("\n"):
+            self.output.write("    {}\n".format(line.strip()))
+        self.output.write("\n")
+
+    def toctree(self, entries: List[str], maxdepth: int = 1) -> None:
+        """writes a toctree of documents"""
+        self.output.write(".. toctree::\n   :maxdepth: {}\n\n".format(maxdepth))
+        for entry in entries:
+            self.output.write("   {}\n".format(entry))
+        self.output.write("\n")
+
+
+class HtmlWriter:
+    """Writes the report as a single HTML page straight into a text output, without sphinx.
+
+    the templates are compiled once when the class is created, every piece is escaped and written once.
+    without an output the pieces are collected in a StringIO and returned by getvalue.
+    """
+    page_start = Template('<!DOCTYPE html>\n<html lang="$lang">\n<head>\n<meta charset="utf-8">\n'
+                          '<title>$title</title>\n<link rel="stylesheet" href="$stylesheet">\n</head>\n<body>\n'
+                          '<h1>$title</h1>\n')
+    page_end = "</body>\n</html>\n"
+    section_start = Template('<section id="$anchor">\n<h2>$title</h2>\n')
+    section_end = "</section>\n"
+    legend_item = Template('<dt>$icon</dt><dd>$text</dd>\n')
+    week_header = Template('<h3 class="week">$message</h3>\n')
+    day_header = Template('<h4 class="day">$message</h4>\n')
+    note = Template('<dl class="note"><dt>$quote</dt><dd>$message</dd></dl>\n')
+    message = Template('<pre class="message">$message</pre>\n')
+
+    def __init__(self, output: TextIO = None) -> None:
+        self.output = StringIO() if output is None else output
+
+    def getvalue(self) -> str:
+        """returns the collected pieces, only if no output was given"""
+        return self.output.getvalue()
+
+    @staticmethod
+    def escape_lines(text: str) -> str:
+        """escapes a text and keeps its line breaks"""
+        return "<br>\n".join(escape(line.strip()) for line in text.split("\n"))
+
+    def start_page(self, title: str, stylesheet: str, lang: str = "de") -> None:
+        """writes the head of the page with a link to the stylesheet"""
+        self.output.write(self.page_start.substitute(lang=escape(lang), title=escape(title),
+                                                     stylesheet=escape(stylesheet)))
+
+    def end_page(self) -> None:
+        """closes the page"""
+        self.output.write(self.page_end)
+
+    def start_section(self, anchor: str, title: str) -> None:
+        """opens a section with a heading"""
+        self.output.write(self.section_start.substitute(anchor=escape(anchor), title=escape(title)))
+
+    def end_section(self) -> None:
+        """closes a section"""
+        self.output.write(self.section_end)
+
+    def legend(self, entries: List[List[str]]) -> None:
+        """writes a legend of [icon, text] entries"""
+        self.output.write('<dl class="legend">\n')
+        for icon, text in entries:
+            self.output.write(self.legend_item.substitute(icon=escape(icon), text=escape(text)))
+        self.output.write("</dl>\n")
+
+    def header(self, message: str, week: bool) -> None:
+        """writes the heading of a week or of a day"""
+        template = self.week_header if week else self.day_header
+        self.output.write(template.substitute(message=escape(message)))
+
+    def quote(self, quote: str, message: str) -> None:
+        """writes a note with a caption, or the message itself if quote is empty"""
+        if not quote:
+            self.output.write(self.message.substitute(message=escape(message)))
+            return
+        self.output.write(self.note.substitute(quote=escape(quote), message=self.escape_lines(text=message)))
+
+
+class WeekRenderer:
+    """Renders calendarweeks for the reports in ReStructuredText and HTML.
+
+    it needs nothing but the translations and the weekday names, so it is cheap to create
+    and can be handed to the processes of a parallel report.
+    """
+
+    def __init__(self, translate: dict, weekday_map: dict) -> None:
+        self.translate = translate
+        self.weekday_map = weekday_map
+
+    def get_week_rst(self, week: Calendarweek) -> str:
+        """Formats a week report in ReStructuredText"""
+        writer = RstWriter()
+        self.write_week_rst(week=week, writer=writer)
+        return writer.getvalue()
+
+    def write_week_rst(self, week: Calendarweek, writer: RstWriter) -> None:
+        """Writes a week report in ReStructuredText"""
+        writer.header(message=self.get_week_header(week=week), doubled=True, linetype="=")
+        for day_num, day_data in sorted(week.items.items()):
+            writer.header(message=self.get_day_header(day_num=day_num, day_data=day_data), doubled=False, linetype="^")
+            for quote, message in self.get_day_notes(day_data=day_data):
+                writer.quote(quote=quote, message=message)
+
+    def write_week_html(self, week: Calendarweek, writer: HtmlWriter) -> None:
+        """Writes a week report in HTML, with the same headings and notes as the ReStructuredText report"""
+        writer.header(message=self.get_week_header(week=week), week=True)
+        for day_num, day_data in sorted(week.items.items()):
+            writer.header(message=self.get_day_header(day_num=day_num, day_data=day_data), week=False)
+            for quote, message in self.get_day_notes(day_data=day_data):
+                writer.quote(quote=quote, message=message)
+
+    def get_week_header(self, week: Calendarweek) -> str:
+        """returns the heading of a week in the reports"""
+        return "{} {} {}".format(self.translate.get("calendarweek", "calendarweek"), week.week, week.week_icon)
+
+    def get_day_header(self, day_num: int, day_data: Calendaritem) -> str:
+        """returns the heading of a day in the reports"""
+        return "{}, {} {}".format(self.weekday_map.get(str(day_num)), day_data.item_date.strftime("%d.%m.%Y"),
+                                  day_data.message_icon)
+
+    def get_day_notes(self, day_data: Calendaritem) -> List[List[str]]:
+        """returns the notes of a day in the reports as [quote, message], the message itself has an empty quote"""
+        info = self.translate.get("Info", "Info")
+        notes = []
+        if day_data.specialday:
+            notes.append([info, day_data.specialday])
+        if not day_data.message_length:
+            notes.append([info, self.translate.get("message empty", "message empty")])
+            return notes
+        if day_data.message_length_exceeded:
+            notes.append([self.translate.get("Error", "Error"),
+                          self.translate.get("message too long", "message too long")])
+        has_been_sent = day_data.has_been_sent(translate=self.translate)
+        if has_been_sent:
+            notes.append([info, has_been_sent])
+
+        has_been_stopped = day_data.has_been_stopped(translate=self.translate)
+        if has_been_stopped:
+            notes.append([info, has_been_stopped])
+        notes.append(["", day_data.message])
+        return notes
+
+
+@dataclass
+class TagesgerichtSnapshot:
+    """State of the current day, shared by all status queries of one terminal menu pass.
+    created on first use by TagesgerichtManager.get_snapshot and dropped by invalidate_snapshot"""
+    today_item: Union[Calendaritem, bool]
+
+
 @dataclass
 class TagesgerichtManager:
     """Initialisiert datetime mit now und basiert auf dem heutigen tag
@@ -235,26 +1985,49 @@ class TagesgerichtManager:
     data: dict
     specialdays: dict
     today: date
+    outbox_base_delay = 2
+    outbox_max_delay = 600
+    render_crossover = 128
+    process_crossover = 2048
 
     def __init__(self,
                  active_days: List[int],
                  data_dir: str,
                  translation: dict,
                  specialdays: dict,
-                 credentials: dict
+                 credentials: dict,
+                 scan_manifest: bool = False,
+                 parse_workers: int = 0,
+                 storage: Storage = None,
+                 render_workers: int = 0,
+                 connect_timeout: float = 5,
+                 read_timeout: float = 30
                  ):
         self.weekday_map = translation.get('weekday_map', {})
         self.active_days = active_days
         self.specialdays = specialdays
+        self.specialday_rules = SpecialdayRules(rules=specialdays)
         self.credentials = credentials
         self.data_dir = data_dir
         self.year, self.month, self.day = self.get_now_datetime()
         self.today = date(self.year, self.month, self.day)
         self.day_num = self.today.weekday()
-        self.current_week = str(self.today.isocalendar()[1])
+        iso_year, iso_week, _ = IsoWeekTable.get_iso_week(day=self.today)
+        self.current_year = str(iso_year)
+        self.current_week = str(iso_week)
         self.report_build_folder = "Sphinx-docs/report"
+        self.html_build_folder = "html-report"
         self.data = {}
         self.translate = translation
+        self.snapshot = None
+        if storage is None:
+            storage = FolderStorage(data_dir=data_dir, weekday_map=self.weekday_map, translate=translation,
+                                    scan_manifest=scan_manifest, parse_workers=parse_workers)
+        self.storage = storage
+        self.render_workers = render_workers
+        self.timeouts = {"connect_timeout": connect_timeout, "read_timeout": read_timeout}
+        self.publishers = {}
+        self.publish_result = None
 
     def get_today_from_calendarweek(self) -> Union[Calendaritem, bool]:
         """Returns current Calendaritem day from the Calendarweek"""
@@ -262,73 +2035,244 @@ class TagesgerichtManager:
         current_week_obj = self.get_current_week_obj()
         return current_week_obj.items.get(self.day_num, False)
 
+    def get_today_from_current_week(self) -> Union[Calendaritem, bool]:
+        """Returns current Calendaritem day, loading only the current calendarweek folder.
+        used by the send paths, so their runtime does not depend on the amount of history in the data dir"""
+        current_week_obj = self.load_current_week()
+        if not current_week_obj:
+            return False
+        return current_week_obj.items.get(self.day_num, False)
+
+    def load_current_week(self) -> Union[Calendarweek, bool]:
+        """Loads the current calendarweek only and stores it into the data property.
+        its day templates are created first if they dont exist yet, like init_manager does"""
+        year, week = str(self.current_year), str(self.current_week)
+        self.storage.create_week(year=year, week=week, active_days=self.active_days)
+        cw_obj = self.storage.load_week(year=year, week=week)
+        if not cw_obj:
+            return False
+        self.apply_specialdays(cw_obj=cw_obj)
+        self.data.setdefault(str(self.current_year), {})[str(self.current_week)] = cw_obj
+        return cw_obj
+
     def get_current_week_obj(self) -> Union[Calendarweek, bool]:
         """Returns the current week object from Calendarweek"""
-        return self.data.get(str(self.year), {}).get(str(self.current_week), False)
+        return self.data.get(str(self.current_year), {}).get(str(self.current_week), False)
+
+    def get_snapshot(self) -> TagesgerichtSnapshot:
+        """Returns the snapshot of the current day, loading the current calendarweek only if there is none yet.
+        the day templates of the current and next calendarweek are created before, so they can be edited"""
+        if self.snapshot is None:
+            self.create_weeks()
+            self.snapshot = TagesgerichtSnapshot(today_item=self.get_today_from_current_week())
+        return self.snapshot
+
+    def invalidate_snapshot(self) -> None:
+        """Drops the snapshot, must be called after actions that change the data dir like sending or reporting"""
+        self.snapshot = None
 
     def show_send_message(self) -> bool:
         """Returns in boolean if a send message should be shown"""
-        current_day_obj = self.get_today_from_calendarweek()
-        return current_day_obj and not current_day_obj.has_been_sent(
-            translate=self.translate) and not current_day_obj.has_been_stopped(
-            translate=self.translate) and current_day_obj.message_sendable
+        current_day_obj = self.get_snapshot().today_item
+        return current_day_obj and not current_day_obj.is_sent() and not current_day_obj.is_stopped() and \
+            current_day_obj.message_sendable
 
     def show_sold_out_message(self) -> bool:
         """Returns in boolean if a sold out message should be shown"""
-        current_day_obj = self.get_today_from_calendarweek()
-        return current_day_obj and current_day_obj.has_been_sent(
-            translate=self.translate) and not current_day_obj.has_been_stopped(translate=self.translate)
+        current_day_obj = self.get_snapshot().today_item
+        return current_day_obj and current_day_obj.is_sent() and not current_day_obj.is_stopped()
 
     def send_sold_out_message(self) -> bool:
         """Sending the sold out message if a message for today has been sent before returns boolean if successful"""
-        self.init_manager()
-        current_day_obj = self.get_today_from_calendarweek()
-        was_sent = current_day_obj.has_been_sent(translate=self.translate)
-        was_stopped = current_day_obj.has_been_stopped(translate=self.translate)
-        if was_sent and not was_stopped:
-            twitter_call(message=self.translate.get("Meal of the day is sold-out!", "Meal of the day is sold-out!"), credentials=self.credentials)
+        return self.run_exclusive(action=self.send_sold_out_message_locked)
+
+    def send_sold_out_message_locked(self) -> bool:
+        """sends the sold out message, must be called while holding the storage lock"""
+        current_day_obj = self.get_today_from_current_week()
+        if not current_day_obj:
+            return False
+        if current_day_obj.is_sent() and not current_day_obj.is_stopped():
+            self.publish_result = self.post_once(action="stop", message=self.translate.get(
+                "Meal of the day is sold-out!", "Meal of the day is sold-out!"))
+            if not self.publish_result or not self.publish_result.success:
+                return False
             current_week_obj = self.get_current_week_obj()
             current_week_obj.items[self.day_num].add_log(message_sent=True, message_stopped=True,
                                                          translate=self.translate)
-            self.write_week_logfile(week=self.current_week, items=current_week_obj.items)
+            self.storage.append_log(cw_obj=current_week_obj, day_num=self.day_num)
             return True
 
     def send_message_for_today(self) -> bool:
         """Sends a message for today if there is one that is sendable returns boolean if successful"""
-        self.init_manager()
-        current_day_obj = self.get_today_from_calendarweek()
+        return self.run_exclusive(action=self.send_message_for_today_locked)
+
+    def send_message_for_today_locked(self) -> bool:
+        """sends the message for today, must be called while holding the storage lock"""
+        current_day_obj = self.get_today_from_current_week()
         if not current_day_obj:
             return False
 
-        if current_day_obj.has_been_sent(translate=self.translate):
+        if current_day_obj.is_sent():
             return False
 
         current_week_obj = self.get_current_week_obj()
         if current_day_obj.message_sendable:
-            twitter_call(message=current_day_obj.message, credentials=self.credentials)
+            self.publish_result = self.post_once(action="send", message=current_day_obj.message)
+            if not self.publish_result or not self.publish_result.success:
+                return False
             current_week_obj.items[self.day_num].add_log(
                 message_sent=True,
                 message_stopped=False,
                 translate=self.translate
             )
-            self.write_week_logfile(week=current_week_obj.week, items=current_week_obj.items)
+            self.storage.append_log(cw_obj=current_week_obj, day_num=self.day_num)
             return True
 
         current_week_obj.items[self.day_num].add_log(message_sent=False, message_stopped=False,
                                                      translate=self.translate)
-        self.write_week_logfile(week=current_week_obj.week, items=current_week_obj.items)
+        self.storage.append_log(cw_obj=current_week_obj, day_num=self.day_num)
         return False
 
-    def write_week_logfile(self, week: str, items: dict) -> None:
-        """Writes a logfile from each day into a big log.json
-        this will be used during initialization to restore days logitems"""
-        logfile_path = str(join(self.data_dir, str(self.year), week, "log.json"))
-        logfile_content = {}
-        for day, data in items.items():
-            if not logfile_content.get(str(day)) and not data.logentrys:
-                continue
-            logfile_content[str(day)] = data.logentrys
-        write_file(path=logfile_path, json=True, data=logfile_content)
+    def run_exclusive(self, action) -> bool:
+        """runs a check, send and log sequence while holding the storage lock.
+        if another process holds the lock, False is returned right away instead of waiting for its network call.
+        publish_result holds the outcome of the post afterwards, None if nothing was posted"""
+        self.publish_result = None
+        lock = self.storage.get_lock()
+        if not lock.acquire():
+            print(self.translate.get("another send is in progress", "another send is in progress"))
+            return False
+        try:
+            return action()
+        finally:
+            lock.release()
+
+    def post_once(self, action: str, message: str, year: str = None, week: str = None,
+                  day_num: int = None) -> Union[PublishResult, None]:
+        """posts a message unless the action has already been recorded for the day, today if no day is given.
+        the idempotency key is recorded before the network call and removed again if the call fails.
+        returns the PublishResult of the post, None if the action was recorded before"""
+        key = {"year": str(self.current_year) if year is None else year,
+               "week": str(self.current_week) if week is None else week,
+               "day_num": self.day_num if day_num is None else day_num,
+               "action": action}
+        if not self.storage.claim_action(**key):
+            return None
+        try:
+            result = self.get_publisher().publish(message=message)
+        except BaseException:
+            self.storage.release_action(**key)
+            raise
+        if not result.success:
+            self.storage.release_action(**key)
+        return result
+
+    def get_outbox(self) -> Outbox:
+        """returns the outbox in the data dir"""
+        create_folder(dir_path=self.data_dir)
+        return Outbox(path=str(join(self.data_dir, "outbox.jsonl")))
+
+    def queue_message_for_today(self) -> bool:
+        """queues the message for today in the outbox instead of posting it, returns if it was queued.
+        a message that cant be sent is logged right away, like send_message_for_today does"""
+        current_day_obj = self.get_today_from_current_week()
+        if not current_day_obj or current_day_obj.is_sent():
+            return False
+        if not current_day_obj.message_sendable:
+            return self.send_message_for_today()
+        return self.get_outbox().put(year=str(self.current_year), week=str(self.current_week), day_num=self.day_num,
+                                     action="send", message=current_day_obj.message)
+
+    def queue_sold_out_message(self) -> bool:
+        """queues the sold out message in the outbox, if the message for today has been sent or waits in the outbox"""
+        current_day_obj = self.get_today_from_current_week()
+        if not current_day_obj or current_day_obj.is_stopped():
+            return False
+        outbox = self.get_outbox()
+        day = {"year": str(self.current_year), "week": str(self.current_week), "day_num": self.day_num}
+        if not current_day_obj.is_sent() and not outbox.is_pending(action="send", **day):
+            return False
+        return outbox.put(action="stop", message=self.translate.get("Meal of the day is sold-out!",
+                                                                    "Meal of the day is sold-out!"), **day)
+
+    def deliver_outbox(self, now: float = None, results: list = None) -> int:
+        """delivers the due posts of the outbox in the order they were queued, returns the amount delivered.
+        the PublishResult of every post tried is appended to results, if a list is given.
+        a failed post is tried again after outbox_base_delay seconds, doubled with every attempt up to
+        outbox_max_delay, and the pass stops there, as the following posts would most likely fail as well.
+        if another process holds the storage lock, nothing is delivered in this pass"""
+        now = time() if now is None else now
+        outbox = self.get_outbox()
+        lock = self.storage.get_lock()
+        if not lock.acquire():
+            return 0
+        delivered = 0
+        finished = False
+        try:
+            for post in outbox.list_pending():
+                if post["next_attempt"] > now:
+                    continue
+                state, result = self.deliver_post(post=post)
+                if result and results is not None:
+                    results.append(result)
+                if state == "waiting":
+                    continue
+                if state == "failed":
+                    post["attempts"] += 1
+                    post["next_attempt"] = now + min(self.outbox_base_delay * 2 ** (post["attempts"] - 1),
+                                                     self.outbox_max_delay)
+                    post["error"] = result.error
+                    outbox.update(post=post)
+                    break
+                post["state"] = state
+                outbox.update(post=post)
+                delivered += state == "delivered"
+                finished = True
+        finally:
+            lock.release()
+        if finished:
+            outbox.compact()
+            self.invalidate_snapshot()
+        return delivered
+
+    def deliver_post(self, post: dict) -> List[Union[str, PublishResult, None]]:
+        """posts a queued post and logs it on its day, must be called while holding the storage lock.
+        returns the state and the PublishResult of the post, None if nothing was posted.
+        the state is "delivered", "failed", "waiting" for a sold out message whose message isnt sent yet
+        and "dropped" if the day doesnt exist anymore or the action has been recorded before.
+        the result is returned instead of kept on the manager, as the outbox worker runs in its own thread"""
+        cw_obj = self.storage.load_week(year=post["year"], week=post["week"])
+        day_obj = cw_obj.items.get(post["day_num"]) if cw_obj else None
+        if not day_obj:
+            return ["dropped", None]
+        stop = post["action"] == "stop"
+        if stop and not day_obj.is_sent():
+            return ["waiting", None]
+        if day_obj.is_stopped() if stop else day_obj.is_sent():
+            return ["dropped", None]
+        result = self.post_once(action=post["action"], message=post["message"], year=post["year"],
+                                week=post["week"], day_num=post["day_num"])
+        if not result:
+            return ["dropped", None]
+        if not result.success:
+            return ["failed", result]
+        day_obj.add_log(message_sent=True, message_stopped=stop, translate=self.translate)
+        self.storage.append_log(cw_obj=cw_obj, day_num=post["day_num"])
+        return ["delivered", result]
+
+    def start_outbox_worker(self, interval: float = 1) -> "OutboxWorker":
+        """starts a background thread delivering the outbox every interval seconds"""
+        worker = OutboxWorker(manager=self, interval=interval)
+        worker.start()
+        return worker
+
+    def get_publisher(self) -> TwitterPublisher:
+        """returns the publisher of the current credentials, it is created once per set of credentials
+        and kept with its open connection for the lifetime of the manager"""
+        key = dumps(self.credentials, sort_keys=True)
+        if key not in self.publishers:
+            self.publishers[key] = TwitterPublisher(credentials=self.credentials, **self.timeouts)
+        return self.publishers[key]
 
     @staticmethod
     def get_now_datetime():
@@ -336,24 +2280,146 @@ class TagesgerichtManager:
         now = datetime.now()
         return now.year, now.month, now.day
 
-    def init_manager(self) -> None:
+    def init_manager(self, since: date = None, until: date = None, load_data: bool = True) -> None:
         """Initing the manager will create required directorys for the current and next calendarweek if they dont exists
         and will then parse the data dir completely.
-        all gathered information is then stored into the classes data propterty"""
+        if since and/or until are given, only calendarweeks overlapping that date window are parsed.
+        all gathered information is then stored into the classes data propterty.
+        load_data False only creates the directorys, for reports streaming their calendarweeks"""
+        self.create_weeks()
+        if load_data:
+            self.data = self.load_weeks(since=since, until=until)
+
+    def create_weeks(self) -> None:
+        """creates the day templates of the current and the next calendarweek if they dont exist.
+        once the current calendarweek has no active days left, the next two calendarweeks are created instead"""
         cw = date(self.year, self.month, self.day)
-        cws = []
         for week_count in range(2):
             if week_count == 0 and not self.has_active_days_left_this_cw(active_days=self.active_days,
                                                                          day_num=self.day_num):
                 cw = self.add_week(today=cw)
-            self.create_file_structure(
-                data_dir=self.data_dir,
-                year=str(cw.isocalendar()[0]),
-                week=str(cw.isocalendar()[1])
+            iso_year, iso_week, _ = IsoWeekTable.get_iso_week(day=cw)
+            self.storage.create_week(
+                year=str(iso_year),
+                week=str(iso_week),
+                active_days=self.active_days
             )
-            cws.append(cw.isocalendar())
             cw = self.add_week(today=cw)
-        self.data = self.parse_year_dir(path=self.data_dir)
+
+    def load_weeks(self, since: date = None, until: date = None) -> dict:
+        """Loads all calendarweeks overlapping the date window from the storage and attaches special days"""
+        result = self.storage.load_weeks(since=since, until=until)
+        for year, yearcollection in result.items():
+            for week, cw_obj in yearcollection.items():
+                self.apply_specialdays(cw_obj=cw_obj)
+        return result
+
+    def iter_weeks(self, since: date = None, until: date = None, reverse: bool = False) -> Iterator[Calendarweek]:
+        """streams the calendarweeks overlapping the date window from the storage in chronological order,
+        with special days attached. unlike load_weeks the data property is not touched"""
+        for cw_obj in self.storage.iter_weeks(since=since, until=until, reverse=reverse):
+            self.apply_specialdays(cw_obj=cw_obj)
+            yield cw_obj
+
+    def iter_items(self, order: str = "asc", item_filter: Callable[[Calendaritem], bool] = None, since: date = None,
+                   until: date = None) -> Iterator[Calendaritem]:
+        """streams the day items overlapping the date window in chronological order, "desc" reverses it.
+        item_filter is called with each Calendaritem, items it returns False for are skipped.
+        memory stays at a single calendarweek, independent of the amount of history in the storage"""
+        if order not in ["asc", "desc"]:
+            raise ValueError("order must be asc or desc, not {}".format(order))
+        reverse = order == "desc"
+        for cw_obj in self.iter_weeks(since=since, until=until, reverse=reverse):
+            for day_num in sorted(cw_obj.items, reverse=reverse):
+                day_obj = cw_obj.items[day_num]
+                if item_filter is None or item_filter(day_obj):
+                    yield day_obj
+
+    def export_items(self, output: TextIO, export_format: str = "ndjson", since: date = None,
+                     until: date = None) -> int:
+        """writes every day item from since until until into output, as a line of json per item with "ndjson"
+        or as a single json list with "json". items are streamed and encoded one at a time,
+        so memory stays flat with the amount of history. returns the amount of exported items"""
+        if export_format not in ["ndjson", "json"]:
+            raise ValueError("export format must be ndjson or json, not {}".format(export_format))
+        encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+        items = self.iter_items(since=since, until=until, item_filter=lambda item: (
+            (since is None or item.item_date >= since) and (until is None or item.item_date <= until)
+        ))
+        count = 0
+        if export_format == "json":
+            output.write("[")
+        for item in items:
+            if export_format == "json":
+                output.write(",\n" if count else "\n")
+            output.write(encoder.encode(item.get_export()))
+            if export_format == "ndjson":
+                output.write("\n")
+            count += 1
+        if export_format == "json":
+            output.write("\n]\n")
+        return count
+
+    def get_data_weeks(self, since: date = None, until: date = None) -> Iterator[Calendarweek]:
+        """yields the calendarweeks of the data property overlapping the date window in chronological order"""
+        for year, yearcollection in sorted(self.data.items(), key=lambda year_item: int(year_item[0])):
+            for week, cw_obj in sorted(yearcollection.items(), key=lambda week_item: int(week_item[0])):
+                if cw_obj.is_in_window(since=since, until=until):
+                    yield cw_obj
+
+    def get_report_weeks(self, since: date = None, until: date = None, stream: bool = False) -> Iterator[Calendarweek]:
+        """yields the calendarweeks of a report, streamed from the storage or taken from the data property"""
+        if stream:
+            return self.iter_weeks(since=since, until=until)
+        return self.get_data_weeks(since=since, until=until)
+
+    def set_message(self, day: date, message: str) -> None:
+        """stores the message of a day in the storage, the only way to edit messages of the sqlite storage.
+        drops the snapshot, so the menu shows the new message"""
+        iso_year, iso_week, day_num = IsoWeekTable.get_iso_week(day=day)
+        self.storage.set_message(year=str(iso_year), week=str(iso_week), day_num=day_num, message=message)
+        self.invalidate_snapshot()
+
+    def compact_logs(self) -> int:
+        """folds the appended send and stop records of the storage into its compact form, like the log.json files.
+        runs under the storage lock, so no send appends to a journal while it is folded, skipped if a send is running"""
+        lock = self.storage.get_lock()
+        if not lock.acquire():
+            return 0
+        try:
+            return self.storage.compact()
+        finally:
+            lock.release()
+
+    def archive_past_years(self) -> List[str]:
+        """packs every year before the current ISO year into an archive of the storage, returns the archived years.
+        runs under the storage lock like compact_logs, skipped if a send is running"""
+        lock = self.storage.get_lock()
+        if not lock.acquire():
+            return []
+        try:
+            years = sorted({year for year, week in self.storage.list_weeks()
+                            if year.isdigit() and int(year) < int(self.current_year)})
+            return [year for year in years if self.storage.archive_year(year=year)]
+        finally:
+            lock.release()
+
+    def unpack_archives(self) -> List[str]:
+        """restores all archived years of the storage, returns the unpacked years"""
+        lock = self.storage.get_lock()
+        if not lock.acquire():
+            return []
+        try:
+            years = sorted({year for year, week in self.storage.list_weeks()})
+            return [year for year in years if self.storage.unpack_year(year=year)]
+        finally:
+            lock.release()
+
+    def get_window(self, weeks_back: int, weeks_ahead: int = 2) -> List[date]:
+        """Returns the first and last day of a date window, starting weeks_back calendarweeks before the current one
+        and ending with the last day weeks_ahead calendarweeks after the current one"""
+        monday = self.today - timedelta(days=self.day_num)
+        return [monday - timedelta(weeks=weeks_back), monday + timedelta(weeks=weeks_ahead, days=6)]
 
     @staticmethod
     def next_weekday(d: date, weekday: int) -> date:
@@ -382,186 +2448,106 @@ class TagesgerichtManager:
                 return True
         return False
 
-    def create_file_structure(self, data_dir: str, year: str, week: str) -> None:
-        """Creates the filestructure for tagesgericht, called by init method"""
-        path_year = str(join(data_dir, year))
-        path_kw = str(join(data_dir, year, week))
-        if not exists(path_year):
-            create_folder(dir_path=path_year)
-        if not exists(path_kw):
-            create_folder(dir_path=path_kw)
-        self.create_templates(active_days=self.active_days, folderpath=path_kw)
-
-    def create_templates(self, active_days: list, folderpath: str) -> None:
-        """creates the empty daytemplates within the calendarweeksfolder"""
-        for day_num in active_days:
-            day_name = self.weekday_map.get(str(day_num))
-            filename = "{}_{}.txt".format(day_num, day_name)
-            filepath = join(folderpath, filename)
-            filepath = str(filepath)
-            if isfile(filepath):
-                continue
-            try:
-                write_file(path=filepath, data="", json=False)
-            except Exception as e:
-                print(self.translate.get("couldn't create file, check permissions",
-                                         "couldn't create file, check permissions"))
-                print(str(type(e)), str(e))
-
-    def parse_year_dir(self, path: str) -> dict:
-        """Iterates over each year and trys to initialize calendarweeks within them"""
-        result = {}
-        for year in listdir(path):
-            year_dict = result.get(year, {})
-            if year.endswith(".json"):
-                continue
-            cw_dir = str(join(path, year))
-            if isdir(cw_dir):
-                result[str(year)] = self.parse_week_dir(path=cw_dir, year_dict=year_dict, year=year)
-        return result
-
-    @staticmethod
-    def get_new_calendarweek_obj(year: str, week: str) -> Calendarweek:
-        """initializes and returns a new calendarweek item"""
-        return Calendarweek(year=year, week=week)
-
-    def parse_week_dir(self, path: str, year_dict: dict, year: str) -> dict:
-        """parses a calendarweek dir and initializes days by found txt files.
-        enriches the calendaritems with old logentrys"""
-        for week in listdir(path):
-            cw_files_dirpath = str(join(path, week))
-            cw_logfile_dirpath = str(join(path, week, "log")) + ".json"
-            day_logfiles = {}
-
-            if isfile(path=cw_logfile_dirpath):
-                day_logfiles = read_file(path=cw_logfile_dirpath, json=True)
-
-            cw_obj = self.get_new_calendarweek_obj(year=year, week=week)
-            for message_file in listdir(cw_files_dirpath):
-                if message_file.endswith("log.json"):
-                    continue
-                if message_file.endswith(".txt"):
-                    file_weekday = int(message_file.split("_")[0])
-                    fday = date(
-                        cw_obj.first_day_of_week.year,
-                        cw_obj.first_day_of_week.month,
-                        cw_obj.first_day_of_week.day
-                    )
-                    while fday.weekday() != file_weekday:
-                        fday = fday + timedelta(days=1)
+    def apply_specialdays(self, cw_obj: Calendarweek) -> None:
+        """attaches the notices of specialdays to all days of a calendarweek in one pass"""
+        for day_num, data in cw_obj.items.items():
+            specialday = self.specialday_rules.get_notice(day=data.item_date)
+            if specialday:
+                data.specialday = specialday
+
+    def get_upcoming_specialdays(self) -> List[str]:
+        """returns the specialdays from today until the end of the week after next as date and notice"""
+        upcoming = self.specialday_rules.get_upcoming(since=self.today, until=self.get_window(weeks_back=0)[1])
+        return ["{} {}".format(day.strftime("%d.%m.%Y"), notice) for day, notice in upcoming]
+
+    def get_upcoming_specialdays_rst(self) -> str:
+        """Formats the specialdays from today until the end of the week after next in ReStructuredText"""
+        upcoming = self.get_upcoming_specialdays()
+        if not upcoming:
+            return ""
+        return self.get_formatted_rst_quote(
+            quote=self.translate.get("Upcoming special days", "Upcoming special days"),
+            message="\n".join(upcoming)
+        )
 
-                    cw_obj.add_file(
-                        filepath=str(join(cw_files_dirpath, message_file)),
-                        item_date=fday
+    def print_data(self, since: date = None, until: date = None, stream: bool = False) -> None:
+        """Prints a short report, intended for usage on the terminal.
+        since and until restrict the report to calendarweeks within that date window.
+        with stream the calendarweeks are read one at a time from the storage instead of the data property.
+        the report is collected first and printed with a single write"""
+        output = StringIO()
+        calendarweek = self.translate.get("calendarweek", "calendarweek")
+        unsent = self.translate.get("unsent", "unsent")
+        for cw_obj in self.get_report_weeks(since=since, until=until, stream=stream):
+            output.write("============================================\n{} {} {} - {} {}\n".format(
+                calendarweek,
+                cw_obj.week,
+                cw_obj.first_day_of_week.strftime("%d.%m.%Y"),
+                cw_obj.last_day_of_week.strftime("%d.%m.%Y"),
+                cw_obj.week_icon
+            ))
+
+            for day_num, day_obj in sorted(cw_obj.items.items()):
+                msgtext = ""
+                if day_obj.specialday:
+                    msgtext += self.get_formatted_rst_quote(
+                        quote=self.translate.get("Info", "Info"),
+                        message=day_obj.specialday
                     )
-                    specialday = self.specialdays.get(fday.strftime("%d.%m"), False)
-                    if specialday:
-                        item = cw_obj.items[file_weekday]
-                        item.specialday = specialday
-                        cw_obj.items[file_weekday] = item
-
-                    day_logfile = day_logfiles.get(str(file_weekday))
-                    if day_logfile:
-                        cw_obj.init_log_for_day(log=day_logfile, day_num=file_weekday)
-
-            cw_obj.prepare_week_report()
-            year_dict[str(week)] = cw_obj
-        return year_dict
-
-    def print_data(self) -> None:
-        """Prints a short report, intended for usage on the terminal"""
-        for year, yearcollection in OrderedDict(sorted(self.data.items())).items():
-            for week, cw_obj in OrderedDict(sorted(yearcollection.items())).items():
-                print("============================================\n{} {} {} - {} {}".format(
-                    self.translate.get("calendarweek", "calendarweek"),
-                    cw_obj.week,
-                    cw_obj.first_day_of_week.strftime("%d.%m.%Y"),
-                    cw_obj.last_day_of_week.strftime("%d.%m.%Y"),
-                    cw_obj.week_icon
+                been_sent = day_obj.has_been_sent(translate=self.translate)
+                msgtext += been_sent or unsent
+                output.write("{} {}  {}\n".format(
+                    day_obj.filepath or day_obj.item_date.isoformat(),
+                    day_obj.message_icon,
+                    day_obj.get_error_text(translate=self.translate, msg=msgtext) or been_sent
                 ))
-
-                ordered_week_items = OrderedDict(sorted(cw_obj.items.items())).items()
-                for day_num, day_obj in ordered_week_items:
-                    msgtext = ""
-                    if day_obj.specialday:
-                        msgtext += self.get_formatted_rst_quote(
-                            quote=self.translate.get("Info", "Info"),
-                            message=day_obj.specialday
-                        )
-                    been_sent = day_obj.has_been_sent(translate=self.translate)
-                    if not been_sent:
-                        msgtext += self.translate.get("unsent", "unsent")
-                    else:
-                        msgtext += been_sent
-                    print(
-                        day_obj.filepath,
-                        day_obj.message_icon,
-                        "",
-                        day_obj.get_error_text(translate=self.translate, msg=msgtext) or day_obj.has_been_sent(
-                            translate=self.translate)
-                    )
+        print(output.getvalue(), end="")
+
+    def get_print_window(self, option: str) -> List[date]:
+        """returns since and until for a print_report option. "upcoming" is the current and the next two
+        calendarweeks, a number N the last N calendarweeks up to the current one and "YYYY-MM-DD:YYYY-MM-DD"
+        a date range, where either side may be left out. raises ValueError for any other option"""
+        if option == "upcoming":
+            return self.get_window(weeks_back=0)
+        if option.isdigit():
+            return self.get_window(weeks_back=int(option), weeks_ahead=0)
+        if ":" not in option:
+            raise ValueError("unknown report window {}".format(option))
+        since, until = option.split(":", 1)
+        return [date.fromisoformat(since) if since else None, date.fromisoformat(until) if until else None]
 
     @staticmethod
     def get_rst_line_for_str(string: str, linetype: str) -> str:
         """Formats a underline for a heading in ReStructuredText"""
-        line = ""
-        for i in range(len(string) + 1):
-            line += linetype
-        return line
+        return RstWriter.get_line(string=string, linetype=linetype)
 
     def get_formatted_rst_header(self, message: str, doubled: bool, linetype: str) -> str:
         """Formats a a heading in ReStructuredText"""
-        rst_line = self.get_rst_line_for_str(string=message, linetype=linetype)
-        result = ""
-        if doubled:
-            result += rst_line + "\n"
-        result += message + "\n"
-        result += rst_line + "\n\n"
-        return result
+        writer = RstWriter()
+        writer.header(message=message, doubled=doubled, linetype=linetype)
+        return writer.getvalue()
 
     @staticmethod
     def get_formatted_rst_quote(quote: str, message: str) -> str:
         """Formats a quote in ReStructuredText"""
-        result = ""
-        result += ":{}:\n\n".format(quote)
-        for line in message.split("\n"):
-            result += "    {}\n".format(line.strip())
-        result += "\n"
-        return result
+        writer = RstWriter()
+        writer.quote(quote=quote, message=message)
+        return writer.getvalue()
+
+    def get_renderer(self) -> "WeekRenderer":
+        """returns the renderer of calendarweeks with the current translations"""
+        return WeekRenderer(translate=self.translate, weekday_map=self.weekday_map)
 
     def return_week_as_rst_string(self, week: Calendarweek) -> str:
         """Formats a week report in ReStructuredText"""
-        week_header = "{} {} {}".format(self.translate.get("calendarweek", "calendarweek"), week.week, week.week_icon)
-        ret = self.get_formatted_rst_header(message=week_header, doubled=True, linetype="=")
-        for day_num, day_data in OrderedDict(sorted(week.items.items())).items():
-            day_header = "{}, {} {}".format(self.weekday_map.get(str(day_num)), day_data.item_date.strftime("%d.%m.%Y"),
-                                            day_data.message_icon)
-            ret += self.get_formatted_rst_header(message=day_header, doubled=False, linetype="^")
-            if day_data.specialday:
-                ret += self.get_formatted_rst_quote(quote=self.translate.get("Info", "Info"),
-                                                    message=day_data.specialday)
-            if not day_data.message_length:
-                ret += self.get_formatted_rst_quote(quote=self.translate.get("Info", "Info"),
-                                                    message=self.translate.get("message empty", "message empty"))
-                continue
-            if day_data.message_length_exceeded:
-                ret += self.get_formatted_rst_quote(quote=self.translate.get("Error", "Error"),
-                                                    message=self.translate.get("message too long", "message too long"))
-            has_been_sent = day_data.has_been_sent(translate=self.translate)
-            if has_been_sent:
-                ret += self.get_formatted_rst_quote(quote=self.translate.get("Info", "Info"),
-                                                    message=has_been_sent)
-
-            has_been_stopped = day_data.has_been_stopped(translate=self.translate)
-            if has_been_stopped:
-                ret += self.get_formatted_rst_quote(quote=self.translate.get("Info", "Info"),
-                                                    message=has_been_stopped)
-            ret += self.get_formatted_rst_quote(quote="", message=day_data.message)
+        return self.get_renderer().get_week_rst(week=week)
 
-        return ret
+    def write_week_rst(self, week: Calendarweek, writer: RstWriter) -> None:
+        """Writes a week report in ReStructuredText"""
+        self.get_renderer().write_week_rst(week=week, writer=writer)
 
-    def get_report_legend(self, header: str, history: bool) -> str:
-        """Formats a Legend in ReStructuredText"""
+    def get_legend(self, history: bool) -> List[List[str]]:
+        """returns the status icons of the reports with their translated meaning"""
         if history:
             ok = "Message was sent"
             warn = "Message was not sent"
@@ -570,34 +2556,283 @@ class TagesgerichtManager:
             ok = "Planned message can be sent"
             warn = "Planned message is empty"
             error = "Planned message cant be sent"
-        legend = ":✅: {}\n:❎: {}\n:❌: {}".format(
-            self.translate.get(ok, ok),
-            self.translate.get(warn, warn),
-            self.translate.get(error, error),
-        )
+        return [["✅", self.translate.get(ok, ok)], ["❎", self.translate.get(warn, warn)],
+                ["❌", self.translate.get(error, error)]]
+
+    def get_report_legend(self, header: str, history: bool) -> str:
+        """Formats a Legend in ReStructuredText"""
+        legend = "\n".join(":{}: {}".format(icon, text) for icon, text in self.get_legend(history=history))
         ret = ""
         ret += self.get_formatted_rst_header(message=header, doubled=False, linetype="=")
         ret += self.get_formatted_rst_quote(quote=self.translate.get("Legend", "Legend"), message=legend)
         return ret
 
-    def create_rst_data(self) -> None:
-        """creates rst data and files for sphinx autogen"""
-        remove_folder(dir_path=self.report_build_folder)
+    def create_rst_data(self, since: date = None, until: date = None, stream: bool = False,
+                        pages: bool = False) -> None:
+        """creates rst data and files for sphinx autogen.
+        since and until restrict the report to calendarweeks within that date window.
+        the report files are written week by week, with stream the calendarweeks are also read one at a time
+        from the storage, so memory does not grow with the amount of history.
+        with pages every past calendarweek gets its own page, history.rst only links the year pages"""
         create_folder(dir_path=self.report_build_folder)
-        planned_status = self.get_report_legend(
-            header=self.translate.get("Future & Active calendar weeks", "Future & Active calendar weeks"),
-            history=False
-        )
-        history = self.get_report_legend(
-            header=self.translate.get("Past calendar weeks", "Past calendar weeks"),
-            history=True
-        )
-        for year, yearcollection in OrderedDict(sorted(self.data.items())).items():
-            for week, cw_obj in OrderedDict(sorted(yearcollection.items())).items():
-                adltcw = not self.has_active_days_left_this_cw(active_days=self.active_days, day_num=self.day_num)
-                if cw_obj.week < str(self.current_week) or (cw_obj.week == self.current_week and adltcw):
-                    history += self.return_week_as_rst_string(week=cw_obj)
+        cache = self.get_report_cache()
+        rendered = set()
+        history_pages = {}
+        planned_path = "/".join([self.report_build_folder, "planned_status.rst"])
+        history_path = "/".join([self.report_build_folder, "history.rst"])
+        weeks = self.iter_weeks(since=since, until=until) if stream else self.get_data_weeks(since=since, until=until)
+        with open(planned_path + ".tmp", mode="w", encoding="utf-8") as planned_file, \
+                open(history_path + ".tmp", mode="w", encoding="utf-8") as history_file:
+            planned, history = RstWriter(output=planned_file), RstWriter(output=history_file)
+            planned.write(self.get_report_legend(
+                header=self.translate.get("Future & Active calendar weeks", "Future & Active calendar weeks"),
+                history=False
+            ))
+            planned.write(self.get_upcoming_specialdays_rst())
+            history.write(self.get_report_legend(
+                header=self.translate.get("Past calendar weeks", "Past calendar weeks"),
+                history=True
+            ))
+            for cw_obj, week_rst in self.iter_week_rst(weeks=weeks, cache=cache, rendered=rendered):
+                if not self.is_history_week(cw_obj=cw_obj):
+                    planned.write(week_rst)
+                elif pages:
+                    self.write_week_page(cw_obj=cw_obj, rst=week_rst, history_pages=history_pages)
+                else:
+                    history.write(week_rst)
+            if pages:
+                history.write(self.write_history_pages(history_pages=history_pages))
+        replace_if_changed(tmp_path=planned_path + ".tmp", path=planned_path)
+        replace_if_changed(tmp_path=history_path + ".tmp", path=history_path)
+        cache.prune(keys=rendered)
+        cache.save()
+        if not pages:
+            self.prune_history_pages(history_pages={})
+
+    def create_html_data(self, since: date = None, until: date = None, stream: bool = False) -> str:
+        """creates the planned and history dashboard as html-report/index.html without sphinx.
+        since, until and stream work like in create_rst_data, the stylesheet next to this module is copied along.
+        past weeks are collected in a second temporary file and appended after the planned weeks.
+        an unchanged page is not rewritten. returns the path of the page"""
+        create_folder(dir_path=self.html_build_folder)
+        stylesheet = join(dirname(abspath(__file__)), "report.css")
+        write_file_if_changed(path="/".join([self.html_build_folder, "report.css"]),
+                              data=read_file(path=stylesheet, json=False))
+        index_path = "/".join([self.html_build_folder, "index.html"])
+        weeks = self.iter_weeks(since=since, until=until) if stream else self.get_data_weeks(since=since, until=until)
+        with open(index_path + ".tmp", mode="w", encoding="utf-8") as index_file, \
+                open(index_path + ".history.tmp", mode="w+", encoding="utf-8") as history_file:
+            writer = HtmlWriter(output=index_file)
+            writer.start_page(title="Tagesgericht", stylesheet="report.css")
+            writer.start_section(
+                anchor="planned",
+                title=self.translate.get("Future & Active calendar weeks", "Future & Active calendar weeks")
+            )
+            writer.legend(entries=self.get_legend(history=False))
+            upcoming = self.get_upcoming_specialdays()
+            if upcoming:
+                writer.quote(quote=self.translate.get("Upcoming special days", "Upcoming special days"),
+                             message="\n".join(upcoming))
+            history = HtmlWriter(output=history_file)
+            history.start_section(anchor="history",
+                                  title=self.translate.get("Past calendar weeks", "Past calendar weeks"))
+            history.legend(entries=self.get_legend(history=True))
+            renderer = self.get_renderer()
+            for cw_obj in weeks:
+                if self.is_history_week(cw_obj=cw_obj):
+                    renderer.write_week_html(week=cw_obj, writer=history)
+                else:
+                    renderer.write_week_html(week=cw_obj, writer=writer)
+            writer.end_section()
+            history.end_section()
+            history_file.seek(0)
+            copyfileobj(history_file, index_file)
+            writer.end_page()
+        remove(index_path + ".history.tmp")
+        replace_if_changed(tmp_path=index_path + ".tmp", path=index_path)
+        return index_path
+
+    def get_history_folder(self) -> str:
+        """returns the folder holding the year and calendarweek pages of the history"""
+        return "/".join([self.report_build_folder, "history"])
+
+    @staticmethod
+    def get_rst_toctree(entries: List[str], maxdepth: int = 1) -> str:
+        """Formats a toctree in ReStructuredText"""
+        writer = RstWriter()
+        writer.toctree(entries=entries, maxdepth=maxdepth)
+        return writer.getvalue()
+
+    def write_week_page(self, cw_obj: Calendarweek, rst: str, history_pages: dict) -> None:
+        """writes a past calendarweek as its own page history/$year/$calendarweek.rst, unchanged pages are kept"""
+        year_folder = "/".join([self.get_history_folder(), cw_obj.year])
+        create_folder(dir_path=year_folder)
+        write_file_if_changed(path="/".join([year_folder, cw_obj.week + ".rst"]), data=rst)
+        history_pages.setdefault(cw_obj.year, []).append(cw_obj.week)
+
+    def write_history_pages(self, history_pages: dict) -> str:
+        """writes a page per year with a toctree of its calendarweek pages and removes pages no longer reported.
+        returns the toctree of the year pages for history.rst"""
+        for year, weeks in history_pages.items():
+            year_page = self.get_formatted_rst_header(message=year, doubled=False, linetype="=")
+            year_page += self.get_rst_toctree(entries=["{}/{}".format(year, week) for week in weeks])
+            write_file_if_changed(path="/".join([self.get_history_folder(), year + ".rst"]), data=year_page)
+        self.prune_history_pages(history_pages=history_pages)
+        if not history_pages:
+            return ""
+        return self.get_rst_toctree(entries=["history/{}".format(year) for year in history_pages])
+
+    def prune_history_pages(self, history_pages: dict) -> None:
+        """removes year and calendarweek pages that are not part of the history anymore"""
+        history_folder = self.get_history_folder()
+        if not isdir(history_folder):
+            return
+        if not history_pages:
+            remove_folder(dir_path=history_folder)
+            return
+        with scandir(history_folder) as iterator:
+            entries = list(iterator)
+        for entry in entries:
+            if entry.is_dir():
+                if entry.name not in history_pages:
+                    remove_folder(dir_path=entry.path)
                     continue
-                planned_status += self.return_week_as_rst_string(week=cw_obj)
-        write_file(path="/".join([self.report_build_folder, "planned_status.rst"]), data=planned_status, json=False)
-        write_file(path="/".join([self.report_build_folder, "history.rst"]), data=history, json=False)
+                with scandir(entry.path) as iterator:
+                    week_pages = [week_entry for week_entry in iterator
+                                  if week_entry.name[:-len(".rst")] not in history_pages[entry.name]]
+                for week_entry in week_pages:
+                    remove(week_entry.path)
+            elif entry.name[:-len(".rst")] not in history_pages:
+                remove(entry.path)
+
+    def get_report_cache(self) -> ReportCache:
+        """loads the cache of rendered weeks of the report folder, bound to the translation used for rendering"""
+        settings = sha1(dumps([self.translate, self.weekday_map], sort_keys=True).encode("utf-8")).hexdigest()
+        return ReportCache(path="/".join([self.report_build_folder, "weeks"])).load(settings=settings)
+
+    @staticmethod
+    def get_week_render_hash(cw_obj: Calendarweek) -> str:
+        """returns a hash over everything the rst of a week is rendered from"""
+        content = [cw_obj.week, cw_obj.week_icon, [
+            [day_num, data.item_date.isoformat(), data.message, data.logentrys, data.specialday, data.message_icon]
+            for day_num, data in sorted(cw_obj.items.items())
+        ]]
+        return sha1(dumps(content).encode("utf-8")).hexdigest()
+
+    def get_week_rst(self, cw_obj: Calendarweek, cache: ReportCache, rendered: set) -> str:
+        """returns the rst of a week from the report cache, it is only rendered if its render hash changed"""
+        key = ScanManifest.get_key(year=cw_obj.year, week=cw_obj.week)
+        week_hash = self.get_week_render_hash(cw_obj=cw_obj)
+        rendered.add(key)
+        rst = cache.get_week(key=key, week_hash=week_hash)
+        if rst is False:
+            rst = self.return_week_as_rst_string(week=cw_obj)
+            cache.set_week(key=key, week_hash=week_hash, rst=rst)
+        return rst
+
+    def iter_week_rst(self, weeks: Iterator[Calendarweek], cache: ReportCache,
+                      rendered: set) -> Iterator[Tuple[Calendarweek, str]]:
+        """yields every calendarweek with its rst in the given order.
+        with render_workers > 1 the weeks are taken in batches of process_crossover weeks, so that the misses of a
+        batch can reach the process pool of render_weeks. the pools it starts are reused for all batches and shut
+        down at the end"""
+        if self.render_workers < 2:
+            for cw_obj in weeks:
+                yield cw_obj, self.get_week_rst(cw_obj=cw_obj, cache=cache, rendered=rendered)
+            return
+        pools = {}
+        try:
+            batch = []
+            for cw_obj in weeks:
+                batch.append(cw_obj)
+                if len(batch) == self.process_crossover:
+                    yield from self.get_batch_rst(weeks=batch, cache=cache, rendered=rendered, pools=pools)
+                    batch = []
+            yield from self.get_batch_rst(weeks=batch, cache=cache, rendered=rendered, pools=pools)
+        finally:
+            for pool in pools.values():
+                pool.shutdown()
+
+    def get_batch_rst(self, weeks: List[Calendarweek], cache: ReportCache, rendered: set,
+                      pools: dict) -> List[Tuple[Calendarweek, str]]:
+        """returns the calendarweeks of a batch with their rst, like get_week_rst but rendering the misses together"""
+        keys = [ScanManifest.get_key(year=cw_obj.year, week=cw_obj.week) for cw_obj in weeks]
+        hashes = [self.get_week_render_hash(cw_obj=cw_obj) for cw_obj in weeks]
+        rendered.update(keys)
+        rst = [cache.get_week(key=key, week_hash=week_hash) for key, week_hash in zip(keys, hashes)]
+        misses = [index for index, week_rst in enumerate(rst) if week_rst is False]
+        for index, week_rst in zip(misses, self.render_weeks(weeks=[weeks[index] for index in misses], pools=pools)):
+            cache.set_week(key=keys[index], week_hash=hashes[index], rst=week_rst)
+            rst[index] = week_rst
+        return list(zip(weeks, rst))
+
+    def render_weeks(self, weeks: List[Calendarweek], pools: dict) -> List[str]:
+        """renders calendarweeks to rst, the result keeps the order of weeks.
+        below render_crossover weeks they are rendered one after another, as starting a pool costs more than it saves.
+        from process_crossover weeks on they are split into a chunk per worker for a process pool.
+        in between a thread pool is only used if the interpreter runs without GIL, as rendering is pure python and
+        threads would only add their overhead otherwise. a started pool is kept in pools by its kind"""
+        renderer = self.get_renderer()
+        threads = not getattr(sys, "_is_gil_enabled", lambda: True)()
+        if self.render_workers < 2 or len(weeks) < self.render_crossover or (
+                len(weeks) < self.process_crossover and not threads):
+            return [renderer.get_week_rst(week=week) for week in weeks]
+        size = -(-len(weeks) // self.render_workers)
+        chunks = [weeks[start:start + size] for start in range(0, len(weeks), size)]
+        if len(weeks) < self.process_crossover:
+            if "thread" not in pools:
+                pools["thread"] = ThreadPoolExecutor(max_workers=self.render_workers)
+            results = pools["thread"].map(lambda chunk: [renderer.get_week_rst(week=week) for week in chunk], chunks)
+        else:
+            if "process" not in pools:
+                pools["process"] = ProcessPoolExecutor(max_workers=self.render_workers,
+                                                       initializer=init_render_worker,
+                                                       initargs=(self.translate, self.weekday_map))
+            results = pools["process"].map(render_weeks_rst, chunks)
+        return [week_rst for chunk in results for week_rst in chunk]
+
+    def is_history_week(self, cw_obj: Calendarweek) -> bool:
+        """Returns if a calendarweek belongs to the past calendarweeks of the report.
+        the current calendarweek does once it has no active days left"""
+        monday = self.today - timedelta(days=self.day_num)
+        if cw_obj.first_day_of_week != monday:
+            return cw_obj.first_day_of_week < monday
+        return not self.has_active_days_left_this_cw(active_days=self.active_days, day_num=self.day_num)
+
+
+render_renderer = None
+
+
+def init_render_worker(translate: dict, weekday_map: dict) -> None:
+    """creates the renderer of the calendarweeks in a render process, see TagesgerichtManager.render_weeks"""
+    global render_renderer
+    render_renderer = WeekRenderer(translate=translate, weekday_map=weekday_map)
+
+
+def render_weeks_rst(weeks: List[Calendarweek]) -> List[str]:
+    """renders a chunk of calendarweeks to rst in a render process"""
+    return [render_renderer.get_week_rst(week=week) for week in weeks]
+
+
+class OutboxWorker(Thread):
+    """Background thread delivering the outbox of a manager every interval seconds, until stop is called.
+    errors of a pass are printed and the next pass is tried anyway"""
+
+    def __init__(self, manager: TagesgerichtManager, interval: float = 1) -> None:
+        super().__init__(daemon=True)
+        self.manager = manager
+        self.interval = interval
+        self.stopped = Event()
+
+    def run(self) -> None:
+        while not self.stopped.is_set():
+            try:
+                self.manager.deliver_outbox()
+            except Exception as error:
+                print("outbox:", error)
+            self.stopped.wait(self.interval)
+
+    def stop(self) -> None:
+        """stops the worker after the current pass and waits for it"""
+        self.stopped.set()
+        self.join()
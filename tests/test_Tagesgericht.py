@@ -1,9 +1,56 @@
-from datetime import date, datetime
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from json import dumps, loads
+from os import listdir, makedirs, stat, utime
+from os.path import join, isdir, isfile
+from shutil import rmtree
+import sys
+from multiprocessing import Pool
+from time import sleep, time_ns
+from tempfile import TemporaryDirectory
+from threading import Thread
 from unittest import TestCase
 from unittest.mock import patch, call, mock_open, Mock
+from urllib.parse import parse_qs
+
+from requests import Session
+from twitter import TwitterError
 
 from src.Tagesgericht import Calendaritem, Calendarweek, TagesgerichtManager
+from src.Tagesgericht import DirectoryWalker, ScanManifest, TagesgerichtSnapshot
+from src.Tagesgericht import Storage, FolderStorage, SQLiteStorage, migrate_storage, append_line, read_lines, FileLock
+from src.Tagesgericht import IsoWeekTable, SpecialdayRules, DayStatus, YearArchive
 from src.Tagesgericht import create_folder, remove_folder, write_file, read_file, twitter_call
+from src.Tagesgericht import PublishResult, TimeoutAdapter, TwitterPublisher
+from main import build_html, send_tweet
+
+WEEKDAY_MAP = {"0": "Montag", "1": "Dienstag", "2": "Mittwoch", "3": "Donnerstag", "4": "Freitag", "5": "Samstag",
+               "6": "Sonntag"}
+
+class FakeTwitterHandler(BaseHTTPRequestHandler):
+    """answers status updates like the twitter api, the first server.failures requests with an error.
+    every answer waits server.delay seconds"""
+
+    def do_POST(self):
+        body = parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8"))
+        self.server.posts.append(body["status"][0])
+        sleep(self.server.delay)
+        if len(self.server.posts) <= self.server.failures:
+            status, answer = 503, {"errors": [{"code": 130, "message": "Over capacity"}]}
+        else:
+            status, answer = 200, {"id": len(self.server.posts), "text": body["status"][0], "user": {"name": "fake"}}
+        data = dumps(answer).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
 
 class TestPostTwitter(TestCase):
     @patch("src.Tagesgericht.Api")
@@ -11,32 +58,73 @@ class TestPostTwitter(TestCase):
     def test_twitter_call(self, lprint, Api):
         PostUpdate = Mock()
         item = Mock()
+        item.id = 42
         item.user.name = "unittestuser"
         item.text = "unittesttext"
         PostUpdate.PostUpdate.return_value = item
+        PostUpdate._session = Session()
         Api.return_value = PostUpdate
-        twitter_call(message='unittest', credentials={})
-        Api.assert_called_once_with(consumer_key='', consumer_secret='', access_token_key='', access_token_secret='', input_encoding='utf-8', request_headers=None)
+        result = twitter_call(message='unittest', credentials={})
+        Api.assert_called_once_with(consumer_key='', consumer_secret='', access_token_key='', access_token_secret='',
+                                    input_encoding='utf-8', request_headers=None, base_url=None)
         PostUpdate.assert_has_calls([
             call.PostUpdate('unittest')
         ])
-        lprint.assert_called_once_with('unittestuser just posted: unittesttext')
+        self.assertEqual(PublishResult(success=True, status_id=42, user="unittestuser", text="unittesttext"), result)
+        lprint.assert_not_called()
 
     @patch("src.Tagesgericht.Api")
     @patch("src.Tagesgericht.print")
-    @patch("src.Tagesgericht.exit")
-    def test_twitter_call_exception(self, lexit, lprint, Api):
+    def test_twitter_call_exception(self, lprint, Api):
         PostUpdate = Mock()
-        PostUpdate.PostUpdate.side_effect = UnicodeDecodeError('',b'',0,1,'')
+        PostUpdate.PostUpdate.side_effect = UnicodeDecodeError('', b'', 0, 1, '')
+        PostUpdate._session = Session()
         Api.return_value = PostUpdate
-        twitter_call(message='unittest', credentials={})
-        Api.assert_called_once_with(consumer_key='', consumer_secret='', access_token_key='', access_token_secret='', input_encoding='utf-8', request_headers=None)
+        result = twitter_call(message='unittest', credentials={})
         PostUpdate.assert_has_calls([
             call.PostUpdate('unittest')
         ])
-        lprint.assert_called_once_with("whoopsie")
-        lexit.assert_called_once_with(2)
-        self.assertRaises(UnicodeDecodeError)
+        self.assertFalse(result.success)
+        self.assertIn("UnicodeDecodeError", result.error)
+        lprint.assert_not_called()
+
+    @patch("src.Tagesgericht.Api")
+    def test_publisher_reuses_api(self, Api):
+        Api.return_value._session = Session()
+        publisher = TwitterPublisher(credentials={"LATITUDE": 52.5, "LONGITUDE": 13.4}, connect_timeout=1,
+                                     read_timeout=2)
+        publisher.publish(message="first")
+        Api.return_value.PostUpdate.side_effect = TwitterError("Status is a duplicate.")
+        result = publisher.publish(message="second")
+        Api.assert_called_once()
+        adapter = Api.return_value._session.get_adapter("https://api.twitter.com/1.1")
+        self.assertIsInstance(adapter, TimeoutAdapter)
+        self.assertEqual((1, 2), adapter.timeout)
+        Api.return_value.PostUpdate.assert_called_with("second", latitude=52.5, longitude=13.4,
+                                                       display_coordinates=True)
+        self.assertEqual(PublishResult(success=False, error="TwitterError: Status is a duplicate."), result)
+
+    def test_publisher_with_real_api(self):
+        """posts through an unpatched twitter.Api against a local endpoint, a slow answer runs into the read timeout"""
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FakeTwitterHandler)
+        server.posts, server.failures, server.delay = [], 0, 0
+        Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            publisher = TwitterPublisher(credentials={
+                "API_KEY": "key", "API_KEY_SECRET": "secret", "ACCESS_TOKEN": "token", "ACCESS_TOKEN_SECRET": "secret",
+                "BASE_URL": "http://127.0.0.1:{}".format(server.server_port)
+            }, connect_timeout=1, read_timeout=0.2)
+            result = publisher.publish(message="unittest")
+            self.assertEqual(PublishResult(success=True, status_id=1, user="fake", text="unittest"), result)
+            server.delay = 1
+            result = publisher.publish(message="slow")
+            self.assertFalse(result.success)
+            self.assertIn("ReadTimeout", result.error)
+            self.assertEqual(["unittest", "slow"], server.posts)
+        finally:
+            server.shutdown()
+            server.server_close()
+
 
 class TestReadWriteDeleteFiles(TestCase):
 
@@ -219,39 +307,74 @@ class TestCalendaritem(TestCase):
     def test_has_been_sent_false(self):
         """Assert that when no sent logentry exists has_been_sent returns False"""
         ci = Calendaritem(item_date=datetime.now(), filepath="unittest")
-        ci.logentrys = [
+        ci.set_logs(log_list=[
             {"message_sent": False, "message_stopped": False}
-        ]
+        ])
         result = ci.has_been_sent(translate={})
         self.assertEqual(False, result)
 
     def test_has_been_sent_true(self):
         """Assert that when a sent logentry exists has_been_sent returns a string containing the sent date"""
         ci = Calendaritem(item_date=datetime.now(), filepath="unittest")
-        ci.logentrys = [
+        ci.set_logs(log_list=[
             {"message_sent": True, "message_stopped": False, "log_date": "2021-06-13 12:30:00:534634363iZ+"}
-        ]
+        ])
         result = ci.has_been_sent(translate={})
         self.assertEqual("sent at -> 2021-06-13 12:30", result)
 
     def test_has_been_stopped_false(self):
         """Assert that when no stopped logentry exists has_been_sent returns False"""
         ci = Calendaritem(item_date=datetime.now(), filepath="unittest")
-        ci.logentrys = [
+        ci.set_logs(log_list=[
             {"message_sent": True, "message_stopped": False}
-        ]
+        ])
         result = ci.has_been_stopped(translate={})
         self.assertEqual(False, result)
 
     def test_has_been_stopped_true(self):
         """Assert that when a stopped logentry exists has_been_sent returns a string containing the sent date"""
         ci = Calendaritem(item_date=datetime.now(), filepath="unittest")
-        ci.logentrys = [
+        ci.set_logs(log_list=[
             {"message_sent": True, "message_stopped": True, "log_date": "2021-06-13 12:30:00:534634363iZ+"}
-        ]
+        ])
         result = ci.has_been_stopped(translate={})
         self.assertEqual("stopped at -> 2021-06-13 12:30", result)
 
+    def test_status_is_folded_from_logs(self):
+        """the status keeps the first sent and stopped date and counts failed attempts"""
+        ci = Calendaritem(item_date=datetime.now(), filepath="unittest")
+        ci.set_logs(log_list=[
+            {"message_sent": False, "message_stopped": False, "log_date": "2021-06-13 11:00:00"},
+            {"message_sent": False, "message_stopped": False, "log_date": "2021-06-13 11:05:00"},
+            {"message_sent": True, "message_stopped": False, "log_date": "2021-06-13 11:10:00"},
+            {"message_sent": True, "message_stopped": False, "log_date": "2021-06-13 11:15:00"},
+        ])
+        self.assertEqual(DayStatus(sent_at="2021-06-13 11:10:00", failed_attempts=2), ci.status)
+        self.assertTrue(ci.is_sent())
+        self.assertFalse(ci.is_stopped())
+        ci.message = "unittest"
+        ci.message_length, ci.message_length_exceeded = 8, False
+        ci.add_log(message_sent=True, message_stopped=True, translate={})
+        self.assertTrue(ci.is_stopped())
+        self.assertEqual(ci.logentrys[-1]["log_date"], ci.status.stopped_at)
+        ci.set_logs(log_list=[])
+        self.assertEqual(DayStatus(), ci.status)
+
+    def test_compact_model(self):
+        """items are slotted, keep default logentrys as tuples with shared strings and return them as dicts"""
+        logentry = {"message_sent": True, "log_date": "2021-06-14 11:00:00", "error": "",
+                    "message": "".join(["unit", "test"]), "message_stopped": False}
+        ci = Calendaritem(item_date=date(2021, 6, 14), filepath="unittest")
+        ci.message = "unittest"
+        ci.set_logs(log_list=[logentry, {"unittest": "unittest"}])
+        self.assertFalse(hasattr(ci, "__dict__"))
+        self.assertFalse(hasattr(ci.status, "__dict__"))
+        self.assertFalse(hasattr(Calendarweek(year="2021", week="24"), "__dict__"))
+        self.assertIsInstance(ci.logs[0], tuple)
+        self.assertIs(ci.logs[0].message, ci.message)
+        self.assertEqual([logentry, {"unittest": "unittest"}], ci.logentrys)
+        self.assertIs(ci.item_date, Calendaritem(item_date=date(2021, 6, 14), filepath="unittest").item_date)
+
 
 class TestCalendarweek(TestCase):
 
@@ -390,6 +513,109 @@ class TestCalendarweek(TestCase):
         day_item.set_logs.assert_called_once_with(log_list=[{"unittest": "unittest"}])
 
 
+class TestIsoWeekTable(TestCase):
+
+    def test_matches_isocalendar(self):
+        """both lookup directions agree with isocalendar for every day of several decades"""
+        day = date(1995, 1, 1)
+        while day < date(2035, 1, 1):
+            iso_year, iso_week, iso_weekday = day.isocalendar()
+            self.assertEqual([iso_year, iso_week, iso_weekday - 1], IsoWeekTable.get_iso_week(day=day))
+            self.assertEqual(day, IsoWeekTable.get_date(year=iso_year, week=iso_week, weekday=iso_weekday - 1))
+            day += timedelta(days=1)
+
+    def test_week_53(self):
+        self.assertEqual(53, IsoWeekTable.get(year=2020).weeks)
+        self.assertEqual(52, IsoWeekTable.get(year=2021).weeks)
+        self.assertEqual(date(2021, 1, 1), IsoWeekTable.get_date(year="2020", week="53", weekday=4))
+        self.assertEqual([date(2020, 12, 28), date(2021, 1, 3)], Calendarweek.get_cw_from_to(year="2020", week="53"))
+        self.assertRaises(ValueError, IsoWeekTable.get_date, year="2021", week="53", weekday=0)
+        self.assertRaises(ValueError, IsoWeekTable.get_date, year="2021", week="0", weekday=0)
+
+    def test_year_boundaries(self):
+        """days around new year may belong to the week of the neighbouring year"""
+        self.assertEqual([2019, 1, 0], IsoWeekTable.get_iso_week(day=date(2018, 12, 31)))
+        self.assertEqual([2020, 53, 6], IsoWeekTable.get_iso_week(day=date(2021, 1, 3)))
+        self.assertEqual([2021, 1, 0], IsoWeekTable.get_iso_week(day=date(2021, 1, 4)))
+        self.assertEqual([date(2018, 12, 31), date(2019, 1, 6)], Calendarweek.get_cw_from_to(year="2019", week="1"))
+        self.assertEqual(date(2019, 1, 6), Calendarweek.get_real_date_by_year_cw_day(year="2019", week="1", day=0))
+
+    def test_table_is_cached(self):
+        self.assertIs(IsoWeekTable.get(year=2021), IsoWeekTable.get(year=2021))
+
+    @patch("src.Tagesgericht.TagesgerichtManager.get_now_datetime", return_value=[2021, 1, 1])
+    def test_manager_current_week_at_new_year(self, get_now_datetime):
+        """on new years day 2021 the current calendarweek is week 53 of 2020, like the folder init_manager creates"""
+        cwm = TagesgerichtManager(active_days=[0, 1, 2, 3, 4], data_dir="unittest", translation={}, specialdays={},
+                                  credentials={})
+        self.assertEqual(["2020", "53"], [cwm.current_year, cwm.current_week])
+
+
+class TestSpecialdayRules(TestCase):
+
+    def test_fixed_days(self):
+        """days and months may be written with or without leading zeros"""
+        rules = SpecialdayRules(rules={"24.12": "Weihnachten", "1.5": "Maifeiertag", "29.2": "Schalttag"})
+        self.assertEqual("Weihnachten", rules.get_notice(day=date(2021, 12, 24)))
+        self.assertEqual("Maifeiertag", rules.get_notice(day=date(2021, 5, 1)))
+        self.assertEqual("Schalttag", rules.get_notice(day=date(2024, 2, 29)))
+        self.assertEqual({date(2021, 12, 24), date(2021, 5, 1)}, set(rules.get_year(year=2021)))
+
+    def test_nth_weekday(self):
+        rules = SpecialdayRules(rules={"6#2.5": "Muttertag", "0#-1.5": "Memorial Day", "4#5.2": "fifth friday"})
+        self.assertEqual(date(2021, 5, 9), rules.get_upcoming(since=date(2021, 5, 1), until=date(2021, 5, 31))[0][0])
+        self.assertEqual("Muttertag", rules.get_notice(day=date(2022, 5, 8)))
+        self.assertEqual("Muttertag", rules.get_notice(day=date(2023, 5, 14)))
+        self.assertEqual("Memorial Day", rules.get_notice(day=date(2021, 5, 31)))
+        self.assertEqual("fifth friday", rules.get_notice(day=date(2008, 2, 29)))
+        self.assertEqual([], [day for day in rules.get_year(year=2021) if day.month == 2])
+
+    def test_easter(self):
+        self.assertEqual(date(2021, 4, 4), SpecialdayRules.get_easter(year=2021))
+        self.assertEqual(date(2024, 3, 31), SpecialdayRules.get_easter(year=2024))
+        self.assertEqual(date(2038, 4, 25), SpecialdayRules.get_easter(year=2038))
+        rules = SpecialdayRules(rules={"easter+39": "Vatertag", "easter-2": "Karfreitag"})
+        self.assertEqual("Vatertag", rules.get_notice(day=date(2021, 5, 13)))
+        self.assertEqual("Karfreitag", rules.get_notice(day=date(2021, 4, 2)))
+
+    def test_ranges(self):
+        """ranges may reach into the next year and overlap other rules"""
+        rules = SpecialdayRules(rules={
+            "30.12..2.1": "Betriebsferien",
+            "1.1": "Neujahr",
+            "easter-2..easter+1": "Ostern",
+        })
+        self.assertEqual("Betriebsferien", rules.get_notice(day=date(2021, 12, 31)))
+        self.assertEqual("Betriebsferien, Neujahr", rules.get_notice(day=date(2022, 1, 1)))
+        self.assertEqual("Betriebsferien", rules.get_notice(day=date(2022, 1, 2)))
+        self.assertEqual("", rules.get_notice(day=date(2022, 1, 3)))
+        self.assertEqual(4, len([day for day, notice in rules.get_year(year=2021).items() if notice == "Ostern"]))
+
+    @patch("src.Tagesgericht.print")
+    def test_invalid_rules_are_skipped(self, lprint):
+        rules = SpecialdayRules(rules={"32.1": "a", "7#1.5": "b", "sometimes": "c", "24.12": "d"})
+        self.assertEqual(1, len(rules.rules))
+        self.assertEqual(3, lprint.call_count)
+
+    def test_rules_are_expanded_once_per_year(self):
+        rules = SpecialdayRules(rules={"6#2.5": "Muttertag"})
+        with patch.object(SpecialdayRules, "get_nth_weekday", wraps=SpecialdayRules.get_nth_weekday) as nth:
+            for day in range(1, 32):
+                rules.get_notice(day=date(2021, 5, day))
+            self.assertEqual(2, nth.call_count)
+
+    def test_upcoming_specialdays_rst(self):
+        cwm = TagesgerichtManager(active_days=[0, 1, 2, 3, 4], data_dir="unittest", translation={},
+                                  specialdays={"6#2.5": "Muttertag", "easter+39": "Vatertag"}, credentials={})
+        cwm.today = date(2021, 4, 28)
+        cwm.day_num = cwm.today.weekday()
+        self.assertEqual(":Upcoming special days:\n\n    09.05.2021 Muttertag\n    13.05.2021 Vatertag\n\n",
+                         cwm.get_upcoming_specialdays_rst())
+        cwm.today = date(2021, 3, 1)
+        cwm.day_num = cwm.today.weekday()
+        self.assertEqual("", cwm.get_upcoming_specialdays_rst())
+
+
 class TestTagesgerichtManager(TestCase):
 
     def setUp(self) -> None:
@@ -435,12 +661,12 @@ class TestTagesgerichtManager(TestCase):
         self.assertEqual((now.year, now.month, now.day), result)
 
     @patch("src.Tagesgericht.TagesgerichtManager.add_week")
-    @patch("src.Tagesgericht.TagesgerichtManager.parse_year_dir", return_value={})
-    @patch("src.Tagesgericht.TagesgerichtManager.create_file_structure", return_value=None)
-    def test_init_manager_no_active_days_left(self, create_file_structure, parse_year_dir, add_week):
+    @patch("src.Tagesgericht.TagesgerichtManager.load_weeks", return_value={})
+    @patch("src.Tagesgericht.FolderStorage.create_week", return_value=None)
+    def test_init_manager_no_active_days_left(self, create_week, load_weeks, add_week):
         add_week.side_effect = [date(2021, 6, 19), date(2021, 6, 25), date(2021, 7, 4)]
         self.active_days = []
-        parse_year_dir.return_value = "parsed_data"
+        load_weeks.return_value = "parsed_data"
         cwm = TagesgerichtManager(
             active_days=self.active_days,
             data_dir=self.data_dir,
@@ -450,24 +676,24 @@ class TestTagesgerichtManager(TestCase):
         )
         cwm.year, cwm.month, cwm.day = 2021, 6, 13
         cwm.init_manager()
-        create_file_structure.assert_has_calls([
-            call(data_dir="unittest", year="2021", week="24"),
-            call(data_dir="unittest", year="2021", week="25")
+        create_week.assert_has_calls([
+            call(year="2021", week="24", active_days=self.active_days),
+            call(year="2021", week="25", active_days=self.active_days)
         ])
         add_week.assert_has_calls([
             call(today=date(2021, 6, 13)),
             call(today=date(2021, 6, 19))
         ])
-        parse_year_dir.assert_called_once_with(path="unittest")
+        load_weeks.assert_called_once_with(since=None, until=None)
         self.assertEqual(cwm.data, "parsed_data")
 
     @patch("src.Tagesgericht.TagesgerichtManager.add_week")
-    @patch("src.Tagesgericht.TagesgerichtManager.parse_year_dir", return_value={})
-    @patch("src.Tagesgericht.TagesgerichtManager.create_file_structure", return_value=None)
-    def test_init_manager_active_days_left(self, create_file_structure, parse_year_dir, add_week):
+    @patch("src.Tagesgericht.TagesgerichtManager.load_weeks", return_value={})
+    @patch("src.Tagesgericht.FolderStorage.create_week", return_value=None)
+    def test_init_manager_active_days_left(self, create_week, load_weeks, add_week):
         add_week.side_effect = [date(2021, 6, 19), date(2021, 6, 25)]
         self.active_days = [0, 1, 2, 3, 4, 5, 6]
-        parse_year_dir.return_value = "parsed_data"
+        load_weeks.return_value = "parsed_data"
 
         cwm = TagesgerichtManager(
             active_days=self.active_days,
@@ -478,17 +704,37 @@ class TestTagesgerichtManager(TestCase):
         )
         cwm.year, cwm.month, cwm.day = 2021, 6, 13
         cwm.init_manager()
-        create_file_structure.assert_has_calls([
-            call(data_dir="unittest", year="2021", week="23"),
-            call(data_dir="unittest", year="2021", week="24")
+        create_week.assert_has_calls([
+            call(year="2021", week="23", active_days=self.active_days),
+            call(year="2021", week="24", active_days=self.active_days)
         ])
         add_week.assert_has_calls([
             call(today=date(2021, 6, 13)),
             call(today=date(2021, 6, 19))
         ])
-        parse_year_dir.assert_called_once_with(path="unittest")
+        load_weeks.assert_called_once_with(since=None, until=None)
         self.assertEqual(cwm.data, "parsed_data")
 
+    @patch("src.Tagesgericht.FolderStorage.load_weeks")
+    def test_load_weeks_applies_specialdays(self, load_weeks):
+        cw_obj = Mock()
+        day_mock = Mock()
+        day_mock.item_date = date(2021, 12, 13)
+        day_mock.specialday = ""
+        cw_obj.items = {0: day_mock}
+        load_weeks.return_value = {"2021": {"50": cw_obj}}
+        cwm = TagesgerichtManager(
+            active_days=self.active_days,
+            data_dir=self.data_dir,
+            translation={},
+            specialdays={"13.12": "unittestday"},
+            credentials={}
+        )
+        result = cwm.load_weeks(since=date(2021, 12, 13))
+        load_weeks.assert_called_once_with(since=date(2021, 12, 13), until=None)
+        self.assertEqual("unittestday", day_mock.specialday)
+        self.assertEqual({"2021": {"50": cw_obj}}, result)
+
     def test_next_weekday(self):
         today = date(2021, 12, 13)  # monday
         next_monday = date(2021, 12, 20)
@@ -540,259 +786,6 @@ class TestTagesgerichtManager(TestCase):
         active_days = []
         self.assertFalse(cwm.has_active_days_left_this_cw(active_days=active_days, day_num=current_day_num))
 
-    @patch("src.Tagesgericht.exists", return_value=False)
-    @patch("src.Tagesgericht.makedirs")
-    @patch("src.Tagesgericht.TagesgerichtManager.create_templates")
-    @patch("src.Tagesgericht.join", side_effect=["unittest/2121", "unittest/2121/42"])
-    def test_create_file_structure(self, join, create_templates, makedirs, exists):
-        exists.side_effect = [False, False]
-        cwm = TagesgerichtManager(
-            active_days=self.active_days,
-            data_dir=self.data_dir,
-            translation={},
-            specialdays={},
-            credentials={}
-        )
-        cwm.create_file_structure(data_dir=self.data_dir, year=self.year, week=self.week)
-        join.assert_has_calls([
-            call("unittest", "2021"),
-            call("unittest", "2021", "42")
-        ])
-        create_templates.assert_called_once_with(active_days=[0, 1, 2, 3, 4], folderpath="unittest/2121/42")
-        makedirs.assert_has_calls([
-            call(name="unittest/2121")
-        ])
-        exists.assert_has_calls([
-            call("unittest/2121")
-        ])
-
-    @patch("src.Tagesgericht.exists", return_value=False)
-    @patch("src.Tagesgericht.makedirs")
-    @patch("src.Tagesgericht.TagesgerichtManager.create_templates")
-    @patch("src.Tagesgericht.join", side_effect=["unittest/2121", "unittest/2121/42"])
-    def test_create_file_structure_exists(self, join, create_templates, makedirs, exists):
-        exists.side_effect = [True, True]
-        cwm = TagesgerichtManager(
-            active_days=self.active_days,
-            data_dir=self.data_dir,
-            translation={},
-            specialdays={},
-            credentials={}
-        )
-        cwm.create_file_structure(data_dir=self.data_dir, year=self.year, week=self.week)
-        join.assert_has_calls([
-            call("unittest", "2021"),
-            call("unittest", "2021", "42")
-        ])
-        create_templates.assert_called_once_with(active_days=[0, 1, 2, 3, 4], folderpath="unittest/2121/42")
-        makedirs.assert_not_called()
-        exists.assert_has_calls([
-            call("unittest/2121")
-        ])
-
-    @patch("src.Tagesgericht.write_file")
-    @patch("src.Tagesgericht.join")
-    @patch("src.Tagesgericht.isfile")
-    def test_create_templates(self, isfile, join, lwrite_file):
-        join.side_effect = [
-            "unittest/0_Montag.txt",
-            "unittest/1_Dienstag.txt",
-            "unittest/2_Mittwoch.txt",
-            "unittest/3_Donnerstag.txt",
-            "unittest/4_Freitag.txt",
-        ]
-        isfile.side_effect = [
-            True,
-            False,
-            True,
-            False,
-            True
-        ]
-        cwm = TagesgerichtManager(
-            active_days=self.active_days,
-            data_dir=self.data_dir,
-            translation={'weekday_map': {
-                "0": "Montag",
-                "1": "Dienstag",
-                "2": "Mittwoch",
-                "3": "Donnerstag",
-                "4": "Freitag",
-                "5": "Samstag",
-                "6": "Sonntag",
-            }},
-            specialdays={},
-            credentials={}
-        )
-        cwm.create_templates(active_days=self.active_days, folderpath=self.data_dir)
-        join.assert_has_calls([
-            call("unittest", "0_Montag.txt"),
-            call("unittest", "1_Dienstag.txt"),
-            call("unittest", "2_Mittwoch.txt"),
-            call("unittest", "3_Donnerstag.txt"),
-            call("unittest", "4_Freitag.txt")
-        ])
-        isfile.assert_has_calls([
-            call("unittest/0_Montag.txt"),
-            call("unittest/1_Dienstag.txt"),
-            call("unittest/2_Mittwoch.txt"),
-            call("unittest/3_Donnerstag.txt"),
-            call("unittest/4_Freitag.txt")
-        ])
-        lwrite_file.assert_has_calls([
-            call(path="unittest/1_Dienstag.txt", data="", json=False),
-            call(path="unittest/3_Donnerstag.txt", data="", json=False)
-        ])
-
-    @patch("src.Tagesgericht.write_file")
-    @patch("src.Tagesgericht.join")
-    @patch("src.Tagesgericht.isfile")
-    @patch("src.Tagesgericht.print")
-    def test_create_templates_handles_exception(self, lprint, isfile, join, lwrite_file):
-        join.side_effect = [
-            "unittest/0_Montag.txt",
-            "unittest/1_Dienstag.txt",
-            "unittest/2_Mittwoch.txt",
-            "unittest/3_Donnerstag.txt",
-            "unittest/4_Freitag.txt",
-        ]
-        isfile.side_effect = [
-            True,
-            False,
-            True,
-            False,
-            True
-        ]
-        lwrite_file.side_effect = Exception("unittest_exception")
-        cwm = TagesgerichtManager(
-            active_days=self.active_days,
-            data_dir=self.data_dir,
-            translation={'weekday_map': {
-                "0": "Montag",
-                "1": "Dienstag",
-                "2": "Mittwoch",
-                "3": "Donnerstag",
-                "4": "Freitag",
-                "5": "Samstag",
-                "6": "Sonntag",
-            }},
-            specialdays={},
-            credentials={}
-        )
-        cwm.create_templates(active_days=self.active_days, folderpath=self.data_dir)
-        lprint.assert_has_calls([
-            call("couldn't create file, check permissions"),
-            call("<class 'Exception'>", "unittest_exception"),
-            call("couldn't create file, check permissions"),
-            call("<class 'Exception'>", "unittest_exception")
-        ])
-        join.assert_has_calls([
-            call("unittest", "0_Montag.txt"),
-            call("unittest", "1_Dienstag.txt"),
-            call("unittest", "2_Mittwoch.txt"),
-            call("unittest", "3_Donnerstag.txt"),
-            call("unittest", "4_Freitag.txt")
-        ])
-        isfile.assert_has_calls([
-            call("unittest/0_Montag.txt"),
-            call("unittest/1_Dienstag.txt"),
-            call("unittest/2_Mittwoch.txt"),
-            call("unittest/3_Donnerstag.txt"),
-            call("unittest/4_Freitag.txt")
-        ])
-        lwrite_file.assert_has_calls([
-            call(path="unittest/1_Dienstag.txt", data="", json=False),
-            call(path="unittest/3_Donnerstag.txt", data="", json=False)
-        ])
-        self.assertRaises(Exception)
-
-    @patch("src.Tagesgericht.TagesgerichtManager.parse_week_dir")
-    @patch("src.Tagesgericht.join")
-    @patch("src.Tagesgericht.listdir")
-    @patch("src.Tagesgericht.isdir")
-    def test_parse_year_dir(self, isdir, listdir, join, parse_week_dir):
-        year = Mock()
-        year.endswith.side_effect = [True, False]
-        listdir.return_value = ["something.json", "2021"]
-        parse_week_dir.return_value = {42: {0: "someday, monday, on calendarweek 42"}}
-        join.return_value = "/".join([self.data_dir, "2021"])
-        isdir.return_value = True
-        cwm = TagesgerichtManager(
-            active_days=self.active_days,
-            data_dir=self.data_dir,
-            translation={},
-            specialdays={},
-            credentials={}
-        )
-        result = cwm.parse_year_dir(path=self.data_dir)
-        parse_week_dir.assert_called_once_with(path="unittest/2021", year_dict={}, year="2021")
-        join.called_once_with("unittest", "2021")
-        listdir.called_once_with("unittest")
-        isdir.called_once_with("unittest/2021")
-        self.assertEqual({"2021": {42: {0: "someday, monday, on calendarweek 42"}}}, result)
-
-    def test_get_new_calendarweek_obj(self):
-        cwm = TagesgerichtManager(
-            active_days=self.active_days,
-            data_dir=self.data_dir,
-            translation={},
-            specialdays={},
-            credentials={}
-        )
-        result = cwm.get_new_calendarweek_obj(year="2021", week="42")
-        self.assertEqual(Calendarweek(year="2021", week="42"), result)
-
-    @patch("src.Tagesgericht.TagesgerichtManager.get_new_calendarweek_obj")
-    @patch("src.Tagesgericht.join", side_effect=[
-        "unittest/2021/42",
-        "unittest/2021/42/log",
-        "unittest/2021/42/0_Montag.txt",
-        "unittest/2021/42/4_Freitag.txt"
-    ])
-    @patch("src.Tagesgericht.listdir")
-    @patch("src.Tagesgericht.read_file", return_value={"4": ["logentry1", "logentry2"]})
-    @patch("src.Tagesgericht.isfile", return_value=True)
-    def test_parse_week_dir(self, isfile, lread_file, listdir, join, get_new_calendarweek_obj):
-        listdir.side_effect = [
-            ["42"],
-            ["log.json", "0_Montag.txt", "4_Freitag.txt"],
-        ]
-        join.return_value = "/".join([self.data_dir, "2021", "42"])
-        cw_obj0 = Mock()
-        cw_obj0.first_day_of_week = date(2021, 12, 13)
-        day_mock = Mock()
-        day_mock.specialday = ""
-        cw_obj0.items = {
-            0: day_mock
-        }
-        get_new_calendarweek_obj.side_effect = [cw_obj0, ]
-
-        cwm = TagesgerichtManager(
-            active_days=self.active_days,
-            data_dir=self.data_dir,
-            translation={},
-            specialdays={"13.12": "unittestday"},
-            credentials={}
-        )
-        result = cwm.parse_week_dir(year="2021", year_dict={}, path="/".join([self.data_dir, "2021"]))
-
-        cw_obj0.init_log_for_day.assert_called_once_with(log=["logentry1", "logentry2"], day_num=4)
-        get_new_calendarweek_obj.assert_called_once_with(year="2021", week="42")
-        listdir.assert_has_calls([
-            call("unittest/2021"),
-            call("unittest/2021/42")
-        ])
-        lread_file.assert_has_calls([
-            call(path="unittest/2021/42/log.json", json=True)
-        ])
-        isfile.assert_called_once_with(path="unittest/2021/42/log.json")
-        join.assert_has_calls([
-            call('unittest/2021', '42'),
-            call('unittest/2021', '42', 'log'),
-            call('unittest/2021/42', '0_Montag.txt'),
-            call('unittest/2021/42', '4_Freitag.txt')
-        ])
-        self.assertEqual({"42": cw_obj0}, result)
-
     @patch("src.Tagesgericht.print")
     def test_print_data(self, lprint):
         cwm = TagesgerichtManager(
@@ -843,12 +836,14 @@ class TestTagesgerichtManager(TestCase):
         }
         cwm.print_data()
 
-        lprint.assert_has_calls([
-            call("============================================\ncalendarweek 42 13.12.2021 - 19.12.2021 ❎️"),
-            call("unittest/unit.txt", "✅", "", "Message has ben sent at 2021-06-13 12:30"),
-            call("unittest/unit.txt", "❎", "", "message empty"),
-            call("unittest/unit.txt", "❌️", "", "message too long")
-        ])
+        lprint.assert_called_once_with(
+            "============================================\ncalendarweek 42 13.12.2021 - 19.12.2021 ❎️\n"
+            "unittest/unit.txt ✅  Message has ben sent at 2021-06-13 12:30\n"
+            "unittest/unit.txt ❎  message empty\n"
+            "unittest/unit.txt ❌️  message too long\n",
+            end=""
+        )
+        ci0.has_been_sent.assert_called_once_with(translate={})
 
     def test_get_rst_line_for_str(self):
         cwm = TagesgerichtManager(
@@ -1003,6 +998,8 @@ class TestTagesgerichtManager(TestCase):
         )
         self.assertEqual("unittest_header\nunittest_quote", line)
 
+    @patch("src.Tagesgericht.TagesgerichtManager.get_week_render_hash", return_value="unittest_hash")
+    @patch("src.Tagesgericht.TagesgerichtManager.get_report_cache")
     @patch("src.Tagesgericht.remove_folder")
     @patch("src.Tagesgericht.create_folder")
     @patch("src.Tagesgericht.TagesgerichtManager.get_report_legend")
@@ -1013,8 +1010,11 @@ class TestTagesgerichtManager(TestCase):
                              lwrite_file,
                              get_report_legend,
                              lcreate_folder,
-                             lremove_folder
+                             lremove_folder,
+                             get_report_cache,
+                             get_week_render_hash
                              ):
+        get_report_cache.return_value.get_week.return_value = False
         return_week_as_rst_string.return_value = "unittest_week_rst_string"
         get_report_legend.side_effect = ["unittest_planned", "unittest_history"]
         ci0 = Mock()
@@ -1039,6 +1039,7 @@ class TestTagesgerichtManager(TestCase):
         ci2.message_icon = "❌️"
         ci2.item_date = date(2021, 12, 8)
         cw_obj = Mock()
+        cw_obj.year = "2021"
         cw_obj.week = "49"
         cw_obj.first_day_of_week = date(2021, 12, 6)
         cw_obj.last_day_of_week = date(2021, 12, 12)
@@ -1071,6 +1072,7 @@ class TestTagesgerichtManager(TestCase):
         ci2_1.message_icon = "❌️"
         ci2_1.item_date = date(2021, 12, 15)
         cw_obj1 = Mock()
+        cw_obj1.year = "2021"
         cw_obj1.week = "50"
         cw_obj1.first_day_of_week = date(2021, 12, 13)
         cw_obj1.last_day_of_week = date(2021, 12, 19)
@@ -1088,7 +1090,9 @@ class TestTagesgerichtManager(TestCase):
             specialdays={},
             credentials={}
         )
-        cwm.report_build_folder = "unittest"
+        report_dir = TemporaryDirectory()
+        self.addCleanup(report_dir.cleanup)
+        cwm.report_build_folder = report_dir.name
         cwm.data = {"2021": {"49": cw_obj, "50": cw_obj1}}
         cwm.year, cwm.month, cwm.day = 2021, 12, 13
         cwm.today = date(cwm.year, cwm.month, cwm.day)
@@ -1096,18 +1100,11 @@ class TestTagesgerichtManager(TestCase):
         cwm.current_week = cwm.today.isocalendar()[1]
 
         cwm.create_rst_data()
-        lwrite_file.assert_has_calls([
-            call(
-                path="unittest/planned_status.rst",
-                data="unittest_plannedunittest_week_rst_string",
-                json=False
-            ),
-            call(
-                path="unittest/history.rst",
-                data="unittest_historyunittest_week_rst_string",
-                json=False
-            )
-        ])
+        lwrite_file.assert_not_called()
+        self.assertEqual("unittest_plannedunittest_week_rst_string",
+                         read_file(path=join(report_dir.name, "planned_status.rst"), json=False))
+        self.assertEqual("unittest_historyunittest_week_rst_string",
+                         read_file(path=join(report_dir.name, "history.rst"), json=False))
         return_week_as_rst_string.assert_has_calls([
             call(week=cw_obj),
             call(week=cw_obj1)
@@ -1116,52 +1113,34 @@ class TestTagesgerichtManager(TestCase):
             call(header="Future & Active calendar weeks", history=False),
             call(header="Past calendar weeks", history=True)
         ])
-        lcreate_folder.assert_called_once_with(dir_path="unittest")
-        lremove_folder.assert_called_once_with(dir_path="unittest")
-
-    @patch("src.Tagesgericht.join", return_value="unittest/log.json")
-    @patch("src.Tagesgericht.write_file")
-    def test_write_week_logfile(self, lwrite_file, ljoin):
-        day_0 = Mock()
-        day_0.logentrys = ["unittest logentry"]
-        day_1 = Mock()
-        day_1.logentrys = []
-
-        items = {
-            "0": day_0,
-            "1": day_1,
-        }
-        cwm = TagesgerichtManager(
-            active_days=self.active_days,
-            data_dir=self.data_dir,
-            translation={},
-            specialdays={},
-            credentials={}
-        )
-
-        cwm.year, cwm.month, cwm.day = 2021, 12, 13
-
-        cwm.write_week_logfile(week="42", items=items)
-        lwrite_file.assert_called_once_with(path="unittest/log.json", json=True, data={"0": ["unittest logentry"]})
-        ljoin.assert_called_once_with("unittest", "2021", "42", "log.json")
+        lcreate_folder.assert_called_once_with(dir_path=report_dir.name)
+        lremove_folder.assert_not_called()
+        get_report_cache.return_value.set_week.assert_has_calls([
+            call(key="2021/49", week_hash="unittest_hash", rst="unittest_week_rst_string"),
+            call(key="2021/50", week_hash="unittest_hash", rst="unittest_week_rst_string")
+        ])
+        get_report_cache.return_value.prune.assert_called_once_with(keys={"2021/49", "2021/50"})
 
-    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_calendarweek")
+    @patch("src.Tagesgericht.FolderStorage.get_lock")
+    @patch("src.Tagesgericht.FolderStorage.claim_action", return_value=True)
+    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_current_week")
     @patch("src.Tagesgericht.TagesgerichtManager.init_manager")
     @patch("src.Tagesgericht.TagesgerichtManager.get_current_week_obj")
-    @patch("src.Tagesgericht.write_file")
-    @patch("src.Tagesgericht.join", return_value="unittest/2021/6/log.json")
-    @patch("src.Tagesgericht.twitter_call")
-    def test_send_message_for_today(self, twitter_call, ljoin, lwrite_file, get_current_week_obj, init_manager,
-                                    get_today_from_calendarweek):
-        today_obj = get_today_from_calendarweek.return_value
-        today_obj.has_been_sent.return_value = False
+    @patch("src.Tagesgericht.append_line")
+    @patch("src.Tagesgericht.join", return_value="unittest/2021/42/journal.jsonl")
+    @patch("src.Tagesgericht.TwitterPublisher.publish")
+    def test_send_message_for_today(self, publish, ljoin, lappend_line, get_current_week_obj, init_manager,
+                                    get_today_from_current_week, claim_action, get_lock):
+        today_obj = get_today_from_current_week.return_value
+        today_obj.is_sent.return_value = False
         today_obj.message_sendable.return_value = True
+        today_obj.year = "2021"
         today_obj.week = "42"
         today_obj.message = "The nswer is 42"
-        get_today_from_calendarweek.return_value = today_obj
+        get_today_from_current_week.return_value = today_obj
         week_obj = get_current_week_obj.return_value
 
-        week_obj.has_been_sent.return_value = False
+        week_obj.is_sent.return_value = False
         get_current_week_obj.return_value = today_obj
 
         cwm = TagesgerichtManager(
@@ -1171,28 +1150,34 @@ class TestTagesgerichtManager(TestCase):
             specialdays={},
             credentials={}
         )
+        cwm.current_year, cwm.day_num = "2021", 0
         cwm.send_message_for_today()
-        ljoin.assert_called_once_with("unittest", "2021", "42", "log.json")
-        lwrite_file.assert_called_once_with(path="unittest/2021/6/log.json", json=True, data={})
-        init_manager.assert_called_once_with()
-        get_today_from_calendarweek.assert_called_once_with()
-        twitter_call.assert_called_once_with(message='The nswer is 42', credentials={})
-
-    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_calendarweek")
+        ljoin.assert_called_once_with("unittest", "2021", "42", "journal.jsonl")
+        lappend_line.assert_called_once_with(path="unittest/2021/42/journal.jsonl", data={
+            "day": "0", "logentry": today_obj.items[0].logentrys[-1]
+        })
+        init_manager.assert_not_called()
+        get_today_from_current_week.assert_called_once_with()
+        publish.assert_called_once_with(message='The nswer is 42')
+
+    @patch("src.Tagesgericht.FolderStorage.get_lock")
+    @patch("src.Tagesgericht.FolderStorage.claim_action", return_value=True)
+    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_current_week")
     @patch("src.Tagesgericht.TagesgerichtManager.init_manager")
     @patch("src.Tagesgericht.TagesgerichtManager.get_current_week_obj")
-    @patch("src.Tagesgericht.write_file")
-    @patch("src.Tagesgericht.join", return_value="unittest/2021/6/log.json")
-    def test_send_message_for_today_not_sendable(self, ljoin, lwrite_file, get_current_week_obj,
-                                                 init_manager, get_today_from_calendarweek):
-        today_obj = get_today_from_calendarweek.return_value
-        today_obj.has_been_sent.return_value = False
+    @patch("src.Tagesgericht.append_line")
+    @patch("src.Tagesgericht.join", return_value="unittest/2021/42/journal.jsonl")
+    def test_send_message_for_today_not_sendable(self, ljoin, lappend_line, get_current_week_obj,
+                                                 init_manager, get_today_from_current_week, claim_action, get_lock):
+        today_obj = get_today_from_current_week.return_value
+        today_obj.is_sent.return_value = False
         today_obj.message_sendable = False
+        today_obj.year = "2021"
         today_obj.week = "42"
-        get_today_from_calendarweek.return_value = today_obj
+        get_today_from_current_week.return_value = today_obj
         week_obj = get_current_week_obj.return_value
 
-        week_obj.has_been_sent.return_value = False
+        week_obj.is_sent.return_value = False
         get_current_week_obj.return_value = today_obj
 
         cwm = TagesgerichtManager(
@@ -1202,28 +1187,33 @@ class TestTagesgerichtManager(TestCase):
             specialdays={},
             credentials={}
         )
+        cwm.current_year, cwm.day_num = "2021", 0
         result = cwm.send_message_for_today()
         self.assertEqual(False, result)
-        ljoin.assert_called_once_with("unittest", "2021", "42", "log.json")
-        lwrite_file.assert_called_once_with(path="unittest/2021/6/log.json", json=True, data={})
-        init_manager.assert_called_once_with()
-        get_today_from_calendarweek.assert_called_once_with()
-
-    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_calendarweek")
+        ljoin.assert_called_once_with("unittest", "2021", "42", "journal.jsonl")
+        lappend_line.assert_called_once_with(path="unittest/2021/42/journal.jsonl", data={
+            "day": "0", "logentry": today_obj.items[0].logentrys[-1]
+        })
+        init_manager.assert_not_called()
+        get_today_from_current_week.assert_called_once_with()
+
+    @patch("src.Tagesgericht.FolderStorage.get_lock")
+    @patch("src.Tagesgericht.FolderStorage.claim_action", return_value=True)
+    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_current_week")
     @patch("src.Tagesgericht.TagesgerichtManager.init_manager")
     @patch("src.Tagesgericht.TagesgerichtManager.get_current_week_obj")
     @patch("src.Tagesgericht.write_file")
     @patch("src.Tagesgericht.join", return_value="unittest/2021/6/log.json")
     def test_send_message_for_today_has_been_sent(self, ljoin, lwrite_file, get_current_week_obj,
-                                                  init_manager, get_today_from_calendarweek):
-        today_obj = get_today_from_calendarweek.return_value
-        today_obj.has_been_sent.return_value = True
+                                                  init_manager, get_today_from_current_week, claim_action, get_lock):
+        today_obj = get_today_from_current_week.return_value
+        today_obj.is_sent.return_value = True
         today_obj.message_sendable = False
         today_obj.week = "42"
-        get_today_from_calendarweek.return_value = today_obj
+        get_today_from_current_week.return_value = today_obj
         week_obj = get_current_week_obj.return_value
 
-        week_obj.has_been_sent.return_value = False
+        week_obj.is_sent.return_value = False
         get_current_week_obj.return_value = today_obj
 
         cwm = TagesgerichtManager(
@@ -1237,16 +1227,18 @@ class TestTagesgerichtManager(TestCase):
         self.assertEqual(False, result)
         ljoin.assert_not_called()
         lwrite_file.assert_not_called()
-        init_manager.assert_called_once_with()
-        get_today_from_calendarweek.assert_called_once_with()
+        init_manager.assert_not_called()
+        get_today_from_current_week.assert_called_once_with()
 
-    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_calendarweek")
+    @patch("src.Tagesgericht.FolderStorage.get_lock")
+    @patch("src.Tagesgericht.FolderStorage.claim_action", return_value=True)
+    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_current_week")
     @patch("src.Tagesgericht.TagesgerichtManager.init_manager")
     @patch("src.Tagesgericht.write_file")
     @patch("src.Tagesgericht.join", return_value="unittest/2021/6/log.json")
     def test_send_message_for_today_no_obj(self, ljoin, lwrite_file, init_manager,
-                                           get_today_from_calendarweek):
-        get_today_from_calendarweek.return_value = None
+                                           get_today_from_current_week, claim_action, get_lock):
+        get_today_from_current_week.return_value = None
 
         cwm = TagesgerichtManager(
             active_days=self.active_days,
@@ -1259,8 +1251,8 @@ class TestTagesgerichtManager(TestCase):
         self.assertEqual(False, result)
         ljoin.assert_not_called()
         lwrite_file.assert_not_called()
-        init_manager.assert_called_once_with()
-        get_today_from_calendarweek.assert_called_once_with()
+        init_manager.assert_not_called()
+        get_today_from_current_week.assert_called_once_with()
 
     @patch("src.Tagesgericht.TagesgerichtManager.init_manager", return_value={})
     @patch("src.Tagesgericht.TagesgerichtManager.get_current_week_obj")
@@ -1272,7 +1264,7 @@ class TestTagesgerichtManager(TestCase):
             specialdays={},
             credentials={}
         )
-        cwm.year = 2021
+        cwm.current_year = "2021"
         cwm.current_week = 42
         cwm.day_num = 0
         cw_obj = Mock()
@@ -1298,7 +1290,7 @@ class TestTagesgerichtManager(TestCase):
             specialdays={},
             credentials={}
         )
-        cwm.year = 2021
+        cwm.current_year = "2021"
         cwm.current_week = 42
         cwm.day_num = 0
         cw_obj = Mock()
@@ -1310,13 +1302,14 @@ class TestTagesgerichtManager(TestCase):
         result = cwm.get_current_week_obj()
         self.assertEqual(cw_obj, result)
 
-    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_calendarweek")
-    def test_show_send_message_all_false(self, get_today_from_calendarweek):
+    @patch("src.Tagesgericht.TagesgerichtManager.create_weeks")
+    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_current_week")
+    def test_show_send_message_all_false(self, get_today_from_current_week, create_weeks):
         current_day_obj_mock = Mock()
-        current_day_obj_mock.has_been_sent.return_value = False
-        current_day_obj_mock.has_been_stopped.return_value = False
+        current_day_obj_mock.is_sent.return_value = False
+        current_day_obj_mock.is_stopped.return_value = False
         current_day_obj_mock.message_sendable = False
-        get_today_from_calendarweek.return_value = current_day_obj_mock
+        get_today_from_current_week.return_value = current_day_obj_mock
 
         cwm = TagesgerichtManager(
             active_days=self.active_days,
@@ -1326,17 +1319,18 @@ class TestTagesgerichtManager(TestCase):
             credentials={}
         )
         result = cwm.show_send_message()
-        current_day_obj_mock.has_been_sent.assert_called_once_with(translate={})
-        get_today_from_calendarweek.assert_called_once_with()
+        current_day_obj_mock.is_sent.assert_called_once_with()
+        get_today_from_current_week.assert_called_once_with()
         self.assertFalse(result)
 
-    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_calendarweek")
-    def test_show_send_message_sendable(self, get_today_from_calendarweek):
+    @patch("src.Tagesgericht.TagesgerichtManager.create_weeks")
+    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_current_week")
+    def test_show_send_message_sendable(self, get_today_from_current_week, create_weeks):
         current_day_obj_mock = Mock()
-        current_day_obj_mock.has_been_sent.return_value = False
-        current_day_obj_mock.has_been_stopped.return_value = False
+        current_day_obj_mock.is_sent.return_value = False
+        current_day_obj_mock.is_stopped.return_value = False
         current_day_obj_mock.message_sendable = True
-        get_today_from_calendarweek.return_value = current_day_obj_mock
+        get_today_from_current_week.return_value = current_day_obj_mock
 
         cwm = TagesgerichtManager(
             active_days=self.active_days,
@@ -1346,17 +1340,18 @@ class TestTagesgerichtManager(TestCase):
             credentials={}
         )
         result = cwm.show_send_message()
-        current_day_obj_mock.has_been_sent.assert_called_once_with(translate={})
-        get_today_from_calendarweek.assert_called_once_with()
+        current_day_obj_mock.is_sent.assert_called_once_with()
+        get_today_from_current_week.assert_called_once_with()
         self.assertTrue(result)
 
-    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_calendarweek")
-    def test_show_send_message_already_sent(self, get_today_from_calendarweek):
+    @patch("src.Tagesgericht.TagesgerichtManager.create_weeks")
+    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_current_week")
+    def test_show_send_message_already_sent(self, get_today_from_current_week, create_weeks):
         current_day_obj_mock = Mock()
-        current_day_obj_mock.has_been_sent.return_value = True
-        current_day_obj_mock.has_been_stopped.return_value = False
+        current_day_obj_mock.is_sent.return_value = True
+        current_day_obj_mock.is_stopped.return_value = False
         current_day_obj_mock.message_sendable = True
-        get_today_from_calendarweek.return_value = current_day_obj_mock
+        get_today_from_current_week.return_value = current_day_obj_mock
 
         cwm = TagesgerichtManager(
             active_days=self.active_days,
@@ -1366,17 +1361,18 @@ class TestTagesgerichtManager(TestCase):
             credentials={}
         )
         result = cwm.show_send_message()
-        current_day_obj_mock.has_been_sent.assert_called_once_with(translate={})
-        get_today_from_calendarweek.assert_called_once_with()
+        current_day_obj_mock.is_sent.assert_called_once_with()
+        get_today_from_current_week.assert_called_once_with()
         self.assertFalse(result)
 
-    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_calendarweek")
-    def test_show_send_message_already_has_bee_stopped(self, get_today_from_calendarweek):
+    @patch("src.Tagesgericht.TagesgerichtManager.create_weeks")
+    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_current_week")
+    def test_show_send_message_already_has_bee_stopped(self, get_today_from_current_week, create_weeks):
         current_day_obj_mock = Mock()
-        current_day_obj_mock.has_been_sent.return_value = True
-        current_day_obj_mock.has_been_stopped.return_value = True
+        current_day_obj_mock.is_sent.return_value = True
+        current_day_obj_mock.is_stopped.return_value = True
         current_day_obj_mock.message_sendable = True
-        get_today_from_calendarweek.return_value = current_day_obj_mock
+        get_today_from_current_week.return_value = current_day_obj_mock
 
         cwm = TagesgerichtManager(
             active_days=self.active_days,
@@ -1386,16 +1382,17 @@ class TestTagesgerichtManager(TestCase):
             credentials={}
         )
         result = cwm.show_send_message()
-        current_day_obj_mock.has_been_sent.assert_called_once_with(translate={})
-        get_today_from_calendarweek.assert_called_once_with()
+        current_day_obj_mock.is_sent.assert_called_once_with()
+        get_today_from_current_week.assert_called_once_with()
         self.assertFalse(result)
 
-    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_calendarweek")
-    def test_show_sold_out_message_all_false(self, get_today_from_calendarweek):
+    @patch("src.Tagesgericht.TagesgerichtManager.create_weeks")
+    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_current_week")
+    def test_show_sold_out_message_all_false(self, get_today_from_current_week, create_weeks):
         current_day_obj_mock = Mock()
-        current_day_obj_mock.has_been_sent.return_value = False
-        current_day_obj_mock.has_been_stopped.return_value = False
-        get_today_from_calendarweek.return_value = current_day_obj_mock
+        current_day_obj_mock.is_sent.return_value = False
+        current_day_obj_mock.is_stopped.return_value = False
+        get_today_from_current_week.return_value = current_day_obj_mock
 
         cwm = TagesgerichtManager(
             active_days=self.active_days,
@@ -1405,16 +1402,17 @@ class TestTagesgerichtManager(TestCase):
             credentials={}
         )
         result = cwm.show_sold_out_message()
-        current_day_obj_mock.has_been_sent.assert_called_once_with(translate={})
-        get_today_from_calendarweek.assert_called_once_with()
+        current_day_obj_mock.is_sent.assert_called_once_with()
+        get_today_from_current_week.assert_called_once_with()
         self.assertFalse(result)
 
-    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_calendarweek")
-    def test_show_sold_out_message_show(self, get_today_from_calendarweek):
+    @patch("src.Tagesgericht.TagesgerichtManager.create_weeks")
+    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_current_week")
+    def test_show_sold_out_message_show(self, get_today_from_current_week, create_weeks):
         current_day_obj_mock = Mock()
-        current_day_obj_mock.has_been_sent.return_value = True
-        current_day_obj_mock.has_been_stopped.return_value = False
-        get_today_from_calendarweek.return_value = current_day_obj_mock
+        current_day_obj_mock.is_sent.return_value = True
+        current_day_obj_mock.is_stopped.return_value = False
+        get_today_from_current_week.return_value = current_day_obj_mock
 
         cwm = TagesgerichtManager(
             active_days=self.active_days,
@@ -1424,16 +1422,17 @@ class TestTagesgerichtManager(TestCase):
             credentials={}
         )
         result = cwm.show_sold_out_message()
-        current_day_obj_mock.has_been_sent.assert_called_once_with(translate={})
-        get_today_from_calendarweek.assert_called_once_with()
+        current_day_obj_mock.is_sent.assert_called_once_with()
+        get_today_from_current_week.assert_called_once_with()
         self.assertTrue(result)
 
-    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_calendarweek")
-    def test_show_sold_out_message_already_stopped(self, get_today_from_calendarweek):
+    @patch("src.Tagesgericht.TagesgerichtManager.create_weeks")
+    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_current_week")
+    def test_show_sold_out_message_already_stopped(self, get_today_from_current_week, create_weeks):
         current_day_obj_mock = Mock()
-        current_day_obj_mock.has_been_sent.return_value = True
-        current_day_obj_mock.has_been_stopped.return_value = True
-        get_today_from_calendarweek.return_value = current_day_obj_mock
+        current_day_obj_mock.is_sent.return_value = True
+        current_day_obj_mock.is_stopped.return_value = True
+        get_today_from_current_week.return_value = current_day_obj_mock
 
         cwm = TagesgerichtManager(
             active_days=self.active_days,
@@ -1443,26 +1442,28 @@ class TestTagesgerichtManager(TestCase):
             credentials={}
         )
         result = cwm.show_sold_out_message()
-        current_day_obj_mock.has_been_sent.assert_called_once_with(translate={})
-        get_today_from_calendarweek.assert_called_once_with()
+        current_day_obj_mock.is_sent.assert_called_once_with()
+        get_today_from_current_week.assert_called_once_with()
         self.assertFalse(result)
 
+    @patch("src.Tagesgericht.FolderStorage.get_lock")
+    @patch("src.Tagesgericht.FolderStorage.claim_action", return_value=True)
     @patch("src.Tagesgericht.TagesgerichtManager.init_manager")
     @patch("src.Tagesgericht.TagesgerichtManager.get_current_week_obj")
-    @patch("src.Tagesgericht.TagesgerichtManager.write_week_logfile")
-    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_calendarweek")
-    @patch("src.Tagesgericht.twitter_call")
-    def test_send_sold_out_message(self, twitter_call, get_today_from_calendarweek, write_week_logfile, get_current_week_obj,
-                                   init_manager):
+    @patch("src.Tagesgericht.FolderStorage.append_log")
+    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_current_week")
+    @patch("src.Tagesgericht.TwitterPublisher.publish")
+    def test_send_sold_out_message(self, publish, get_today_from_current_week, append_log, get_current_week_obj,
+                                   init_manager, claim_action, get_lock):
         current_week_obj_mock = Mock()
         mock_day = Mock()
-        mock_day.has_been_sent.return_value = True
-        mock_day.has_been_stopped.return_value = False
+        mock_day.is_sent.return_value = True
+        mock_day.is_stopped.return_value = False
         current_week_obj_mock.items = {
             0: mock_day
         }
-        get_today_from_calendarweek.return_value = mock_day
-        current_week_obj_mock.has_been_stopped.return_value = True
+        get_today_from_current_week.return_value = mock_day
+        current_week_obj_mock.is_stopped.return_value = True
         current_week_obj_mock.week = "42"
         get_current_week_obj.return_value = current_week_obj_mock
 
@@ -1476,32 +1477,31 @@ class TestTagesgerichtManager(TestCase):
         cwm.day_num = 0
         cwm.current_week = "42"
         result = cwm.send_sold_out_message()
-        write_week_logfile.assert_called_once_with(
-            week=current_week_obj_mock.week,
-            items=current_week_obj_mock.items
-        )
+        append_log.assert_called_once_with(cw_obj=current_week_obj_mock, day_num=0)
         mock_day.add_log.assert_called_once_with(message_sent=True, message_stopped=True, translate={})
         get_current_week_obj.assert_called_once_with()
-        get_today_from_calendarweek.assert_called_once_with()
-        init_manager.assert_called_once_with()
-        twitter_call.assert_called_once_with(message='Meal of the day is sold-out!', credentials={})
+        get_today_from_current_week.assert_called_once_with()
+        init_manager.assert_not_called()
+        publish.assert_called_once_with(message='Meal of the day is sold-out!')
         self.assertTrue(result)
 
+    @patch("src.Tagesgericht.FolderStorage.get_lock")
+    @patch("src.Tagesgericht.FolderStorage.claim_action", return_value=True)
     @patch("src.Tagesgericht.TagesgerichtManager.init_manager")
     @patch("src.Tagesgericht.TagesgerichtManager.get_current_week_obj")
-    @patch("src.Tagesgericht.TagesgerichtManager.write_week_logfile")
-    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_calendarweek")
-    def test_send_sold_out_message_not_sent_yet(self, get_today_from_calendarweek, write_week_logfile,
-                                                get_current_week_obj, init_manager):
+    @patch("src.Tagesgericht.FolderStorage.append_log")
+    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_current_week")
+    def test_send_sold_out_message_not_sent_yet(self, get_today_from_current_week, append_log,
+                                                get_current_week_obj, init_manager, claim_action, get_lock):
         current_week_obj_mock = Mock()
         mock_day = Mock()
-        mock_day.has_been_sent.return_value = False
-        mock_day.has_been_stopped.return_value = False
+        mock_day.is_sent.return_value = False
+        mock_day.is_stopped.return_value = False
         current_week_obj_mock.items = {
             0: mock_day
         }
-        get_today_from_calendarweek.return_value = mock_day
-        current_week_obj_mock.has_been_stopped.return_value = True
+        get_today_from_current_week.return_value = mock_day
+        current_week_obj_mock.is_stopped.return_value = True
         current_week_obj_mock.week = "42"
         get_current_week_obj.return_value = current_week_obj_mock
 
@@ -1515,28 +1515,30 @@ class TestTagesgerichtManager(TestCase):
         cwm.day_num = 0
         cwm.current_week = "42"
         result = cwm.send_sold_out_message()
-        write_week_logfile.assert_not_called()
+        append_log.assert_not_called()
         mock_day.add_log.assert_not_called()
         get_current_week_obj.assert_not_called()
-        get_today_from_calendarweek.assert_called_once_with()
-        init_manager.assert_called_once_with()
+        get_today_from_current_week.assert_called_once_with()
+        init_manager.assert_not_called()
         self.assertFalse(result)
 
+    @patch("src.Tagesgericht.FolderStorage.get_lock")
+    @patch("src.Tagesgericht.FolderStorage.claim_action", return_value=True)
     @patch("src.Tagesgericht.TagesgerichtManager.init_manager")
     @patch("src.Tagesgericht.TagesgerichtManager.get_current_week_obj")
-    @patch("src.Tagesgericht.TagesgerichtManager.write_week_logfile")
-    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_calendarweek")
-    def test_send_sold_out_message_already_sent(self, get_today_from_calendarweek, write_week_logfile,
-                                                get_current_week_obj, init_manager):
+    @patch("src.Tagesgericht.FolderStorage.append_log")
+    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_current_week")
+    def test_send_sold_out_message_already_sent(self, get_today_from_current_week, append_log,
+                                                get_current_week_obj, init_manager, claim_action, get_lock):
         current_week_obj_mock = Mock()
         mock_day = Mock()
-        mock_day.has_been_sent.return_value = True
-        mock_day.has_been_stopped.return_value = True
+        mock_day.is_sent.return_value = True
+        mock_day.is_stopped.return_value = True
         current_week_obj_mock.items = {
             0: mock_day
         }
-        get_today_from_calendarweek.return_value = mock_day
-        current_week_obj_mock.has_been_stopped.return_value = True
+        get_today_from_current_week.return_value = mock_day
+        current_week_obj_mock.is_stopped.return_value = True
         current_week_obj_mock.week = "42"
         get_current_week_obj.return_value = current_week_obj_mock
 
@@ -1550,9 +1552,1240 @@ class TestTagesgerichtManager(TestCase):
         cwm.day_num = 0
         cwm.current_week = "42"
         result = cwm.send_sold_out_message()
-        write_week_logfile.assert_not_called()
+        append_log.assert_not_called()
         mock_day.add_log.assert_not_called()
         get_current_week_obj.assert_not_called()
-        get_today_from_calendarweek.assert_called_once_with()
-        init_manager.assert_called_once_with()
+        get_today_from_current_week.assert_called_once_with()
+        init_manager.assert_not_called()
         self.assertFalse(result)
+
+
+class TestFolderStorage(TestCase):
+
+    def setUp(self) -> None:
+        self.weekday_map = {
+            "0": "Montag",
+            "1": "Dienstag",
+            "2": "Mittwoch",
+            "3": "Donnerstag",
+            "4": "Freitag",
+            "5": "Samstag",
+            "6": "Sonntag",
+        }
+        self.active_days = [0, 1, 2, 3, 4]
+        self.data_dir = "unittest"
+        self.year = "2021"
+        self.week = "42"
+
+    def test_storage_is_abstract(self):
+        """a storage has to implement the abstract methods, the helpers on top of them are shared"""
+        self.assertRaises(TypeError, Storage)
+        self.assertEqual({"create_week", "set_message", "list_weeks", "load_week", "append_log", "save_week",
+                          "get_lock", "claim_action", "release_action"}, Storage.__abstractmethods__)
+        self.assertEqual(frozenset(), FolderStorage.__abstractmethods__)
+        self.assertEqual(frozenset(), SQLiteStorage.__abstractmethods__)
+
+    @patch("src.Tagesgericht.exists", return_value=False)
+    @patch("src.Tagesgericht.makedirs")
+    @patch("src.Tagesgericht.FolderStorage.create_templates")
+    @patch("src.Tagesgericht.join", side_effect=["unittest/2121", "unittest/2121/42"])
+    def test_create_file_structure(self, join, create_templates, makedirs, exists):
+        exists.side_effect = [False, False]
+        storage = FolderStorage(data_dir=self.data_dir, weekday_map={}, translate={})
+        storage.create_week(year=self.year, week=self.week, active_days=self.active_days)
+        join.assert_has_calls([
+            call("unittest", "2021"),
+            call("unittest", "2021", "42")
+        ])
+        create_templates.assert_called_once_with(active_days=[0, 1, 2, 3, 4], folderpath="unittest/2121/42")
+        makedirs.assert_has_calls([
+            call(name="unittest/2121")
+        ])
+        exists.assert_has_calls([
+            call("unittest/2121")
+        ])
+
+    @patch("src.Tagesgericht.exists", return_value=False)
+    @patch("src.Tagesgericht.makedirs")
+    @patch("src.Tagesgericht.FolderStorage.create_templates")
+    @patch("src.Tagesgericht.join", side_effect=["unittest/2121", "unittest/2121/42"])
+    def test_create_file_structure_exists(self, join, create_templates, makedirs, exists):
+        exists.side_effect = [True, True]
+        storage = FolderStorage(data_dir=self.data_dir, weekday_map={}, translate={})
+        storage.create_week(year=self.year, week=self.week, active_days=self.active_days)
+        join.assert_has_calls([
+            call("unittest", "2021"),
+            call("unittest", "2021", "42")
+        ])
+        create_templates.assert_called_once_with(active_days=[0, 1, 2, 3, 4], folderpath="unittest/2121/42")
+        makedirs.assert_not_called()
+        exists.assert_has_calls([
+            call("unittest/2121")
+        ])
+
+    @patch("src.Tagesgericht.write_file")
+    @patch("src.Tagesgericht.join")
+    @patch("src.Tagesgericht.DirectoryWalker.is_file")
+    @patch("src.Tagesgericht.DirectoryWalker.scan")
+    def test_create_templates(self, scan, isfile, join, lwrite_file):
+        join.side_effect = [
+            "unittest/0_Montag.txt",
+            "unittest/1_Dienstag.txt",
+            "unittest/2_Mittwoch.txt",
+            "unittest/3_Donnerstag.txt",
+            "unittest/4_Freitag.txt",
+        ]
+        isfile.side_effect = [
+            True,
+            False,
+            True,
+            False,
+            True
+        ]
+        storage = FolderStorage(data_dir=self.data_dir, weekday_map=self.weekday_map, translate={})
+        storage.create_templates(active_days=self.active_days, folderpath=self.data_dir)
+        join.assert_has_calls([
+            call("unittest", "0_Montag.txt"),
+            call("unittest", "1_Dienstag.txt"),
+            call("unittest", "2_Mittwoch.txt"),
+            call("unittest", "3_Donnerstag.txt"),
+            call("unittest", "4_Freitag.txt")
+        ])
+        scan.assert_called_once_with(path="unittest", legacy_syscalls=0)
+        isfile.assert_has_calls([
+            call(path="unittest/0_Montag.txt"),
+            call(path="unittest/1_Dienstag.txt"),
+            call(path="unittest/2_Mittwoch.txt"),
+            call(path="unittest/3_Donnerstag.txt"),
+            call(path="unittest/4_Freitag.txt")
+        ])
+        lwrite_file.assert_has_calls([
+            call(path="unittest/1_Dienstag.txt", data="", json=False),
+            call(path="unittest/3_Donnerstag.txt", data="", json=False)
+        ])
+
+    @patch("src.Tagesgericht.write_file")
+    @patch("src.Tagesgericht.join")
+    @patch("src.Tagesgericht.DirectoryWalker.is_file")
+    @patch("src.Tagesgericht.DirectoryWalker.scan")
+    @patch("src.Tagesgericht.print")
+    def test_create_templates_handles_exception(self, lprint, scan, isfile, join, lwrite_file):
+        join.side_effect = [
+            "unittest/0_Montag.txt",
+            "unittest/1_Dienstag.txt",
+            "unittest/2_Mittwoch.txt",
+            "unittest/3_Donnerstag.txt",
+            "unittest/4_Freitag.txt",
+        ]
+        isfile.side_effect = [
+            True,
+            False,
+            True,
+            False,
+            True
+        ]
+        lwrite_file.side_effect = Exception("unittest_exception")
+        storage = FolderStorage(data_dir=self.data_dir, weekday_map=self.weekday_map, translate={})
+        storage.create_templates(active_days=self.active_days, folderpath=self.data_dir)
+        lprint.assert_has_calls([
+            call("couldn't create file, check permissions"),
+            call("<class 'Exception'>", "unittest_exception"),
+            call("couldn't create file, check permissions"),
+            call("<class 'Exception'>", "unittest_exception")
+        ])
+        join.assert_has_calls([
+            call("unittest", "0_Montag.txt"),
+            call("unittest", "1_Dienstag.txt"),
+            call("unittest", "2_Mittwoch.txt"),
+            call("unittest", "3_Donnerstag.txt"),
+            call("unittest", "4_Freitag.txt")
+        ])
+        scan.assert_called_once_with(path="unittest", legacy_syscalls=0)
+        isfile.assert_has_calls([
+            call(path="unittest/0_Montag.txt"),
+            call(path="unittest/1_Dienstag.txt"),
+            call(path="unittest/2_Mittwoch.txt"),
+            call(path="unittest/3_Donnerstag.txt"),
+            call(path="unittest/4_Freitag.txt")
+        ])
+        lwrite_file.assert_has_calls([
+            call(path="unittest/1_Dienstag.txt", data="", json=False),
+            call(path="unittest/3_Donnerstag.txt", data="", json=False)
+        ])
+        self.assertRaises(Exception)
+
+    @patch("src.Tagesgericht.FolderStorage.list_archived_years", return_value=[])
+    @patch("src.Tagesgericht.FolderStorage.parse_week_dir")
+    @patch("src.Tagesgericht.join")
+    @patch("src.Tagesgericht.DirectoryWalker.list_dirs")
+    def test_parse_year_dir(self, list_dirs, join, parse_week_dir, list_archived_years):
+        year_entry = Mock()
+        year_entry.name = "2021"
+        list_dirs.return_value = [year_entry]
+        parse_week_dir.return_value = {42: {0: "someday, monday, on calendarweek 42"}}
+        join.return_value = "/".join([self.data_dir, "2021"])
+        storage = FolderStorage(data_dir=self.data_dir, weekday_map={}, translate={})
+        result = storage.parse_year_dir(path=self.data_dir)
+        parse_week_dir.assert_called_once_with(path="unittest/2021", year_dict={}, year="2021", since=None,
+                                               until=None)
+        join.assert_called_once_with("unittest", "2021")
+        list_dirs.assert_called_once_with(path="unittest")
+        self.assertEqual({"2021": {42: {0: "someday, monday, on calendarweek 42"}}}, result)
+
+    def test_get_new_calendarweek_obj(self):
+        storage = FolderStorage(data_dir=self.data_dir, weekday_map={}, translate={})
+        result = storage.get_new_calendarweek_obj(year="2021", week="42")
+        self.assertEqual(Calendarweek(year="2021", week="42"), result)
+
+    @patch("src.Tagesgericht.FolderStorage.get_new_calendarweek_obj")
+    @patch("src.Tagesgericht.join", side_effect=[
+        "unittest/2021/42",
+        "unittest/2021/42/log.json",
+        "unittest/2021/42/0_Montag.txt",
+        "unittest/2021/42/4_Freitag.txt"
+    ])
+    @patch("src.Tagesgericht.DirectoryWalker.list_files")
+    @patch("src.Tagesgericht.DirectoryWalker.list_dirs")
+    @patch("src.Tagesgericht.read_file", return_value={"4": ["logentry1", "logentry2"]})
+    def test_parse_week_dir(self, lread_file, list_dirs, list_files, join, get_new_calendarweek_obj):
+        week_entry = Mock()
+        week_entry.name = "42"
+        list_dirs.return_value = [week_entry]
+        file_entrys = []
+        for filename in ["log.json", "0_Montag.txt", "4_Freitag.txt"]:
+            file_entry = Mock()
+            file_entry.name = filename
+            file_entrys.append(file_entry)
+        list_files.return_value = file_entrys
+        cw_obj0 = Mock()
+        cw_obj0.first_day_of_week = date(2021, 10, 18)
+        day_mock = Mock()
+        day_mock.specialday = ""
+        cw_obj0.items = {
+            0: day_mock
+        }
+        get_new_calendarweek_obj.side_effect = [cw_obj0, ]
+
+        storage = FolderStorage(data_dir=self.data_dir, weekday_map={}, translate={})
+        result = storage.parse_week_dir(year="2021", year_dict={}, path="/".join([self.data_dir, "2021"]))
+
+        cw_obj0.init_log_for_day.assert_called_once_with(log=["logentry1", "logentry2"], day_num=4)
+        cw_obj0.add_file.assert_has_calls([
+            call(filepath="unittest/2021/42/0_Montag.txt", item_date=date(2021, 10, 18)),
+            call(filepath="unittest/2021/42/4_Freitag.txt", item_date=date(2021, 10, 22))
+        ])
+        get_new_calendarweek_obj.assert_called_once_with(year="2021", week="42")
+        list_dirs.assert_called_once_with(path="unittest/2021")
+        list_files.assert_called_once_with(path="unittest/2021/42")
+        lread_file.assert_called_once_with(path="unittest/2021/42/log.json", json=True)
+        join.assert_has_calls([
+            call('unittest/2021', '42'),
+            call('unittest/2021/42', 'log.json'),
+            call('unittest/2021/42', '0_Montag.txt'),
+            call('unittest/2021/42', '4_Freitag.txt')
+        ])
+        self.assertEqual({"42": cw_obj0}, result)
+
+    @patch("src.Tagesgericht.replace")
+    @patch("src.Tagesgericht.join", return_value="unittest/log.json")
+    @patch("src.Tagesgericht.write_file")
+    def test_write_week_logfile(self, lwrite_file, ljoin, lreplace):
+        day_0 = Mock()
+        day_0.logentrys = ["unittest logentry"]
+        day_1 = Mock()
+        day_1.logentrys = []
+
+        items = {
+            "0": day_0,
+            "1": day_1,
+        }
+        storage = FolderStorage(data_dir=self.data_dir, weekday_map={}, translate={})
+        storage.write_week_logfile(year="2021", week="42", items=items)
+        lwrite_file.assert_called_once_with(path="unittest/log.json.tmp", json=True,
+                                            data={"0": ["unittest logentry"]})
+        lreplace.assert_called_once_with("unittest/log.json.tmp", "unittest/log.json")
+        ljoin.assert_called_once_with("unittest", "2021", "42", "log.json")
+
+
+class DataTreeTestCase(TestCase):
+    """Base of the tests working on a data dir in a temporary directory"""
+
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.data_dir = join(self.tmp_dir.name, "Data")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def make_data_tree(self, weeks: list, days: dict, log: dict = None) -> None:
+        """creates the folders of weeks, given as (year, week), with the day files of days.
+        days maps a file name to its message, {year} and {week} in a message are filled in"""
+        for year, week in weeks:
+            week_dir = join(self.data_dir, str(year), str(week))
+            makedirs(week_dir, exist_ok=True)
+            for name, message in days.items():
+                write_file(path=join(week_dir, name), json=False, data=message.format(year=year, week=week))
+            if log is not None:
+                write_file(path=join(week_dir, "log.json"), json=True, data=log)
+
+    def make_manager(self, **overrides) -> TagesgerichtManager:
+        """returns a manager of the data dir with the german weekday names only, without specialdays and credentials"""
+        kwargs = {"active_days": [0, 1, 2, 3, 4], "data_dir": self.data_dir,
+                  "translation": {"weekday_map": WEEKDAY_MAP}, "specialdays": {}, "credentials": {}}
+        kwargs.update(overrides)
+        return TagesgerichtManager(**kwargs)
+
+
+class TestScanManifest(DataTreeTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.make_data_tree(weeks=[("2021", "42")], days={"0_Montag.txt": "Schnitzel", "1_Dienstag.txt": ""}, log={
+            "0": [{
+                "message_sent": True,
+                "log_date": "2021-10-18 11:00:00.000000",
+                "error": "",
+                "message": "Schnitzel",
+                "message_stopped": False,
+            }]})
+        self.week_dir = join(self.data_dir, "2021", "42")
+        self.age_week()
+
+    def get_manager(self, scan_manifest: bool) -> TagesgerichtManager:
+        return self.make_manager(specialdays={"18.10": "unittestday"}, scan_manifest=scan_manifest)
+
+    def age_week(self) -> None:
+        """moves the mtimes of the week folder and its files an hour back, so the week is not racy"""
+        mtime = time_ns() - 3600 * 10 ** 9
+        for name in listdir(self.week_dir) + [""]:
+            utime(join(self.week_dir, name), ns=(mtime, mtime))
+
+    def test_manifest_result_equals_full_parse(self):
+        """restoring weeks from the manifest must produce the same data as a full parse"""
+        full = self.get_manager(scan_manifest=False).load_weeks()
+        cwm = self.get_manager(scan_manifest=True)
+        first = cwm.load_weeks()
+        self.assertTrue(isfile(join(self.data_dir, "manifest.json")))
+        with patch("src.Tagesgericht.FolderStorage.load_calendarweek") as load_calendarweek:
+            second = cwm.load_weeks()
+            load_calendarweek.assert_not_called()
+        self.assertEqual(full, first)
+        self.assertEqual(full, second)
+        self.assertEqual("unittestday", second["2021"]["42"].items[0].specialday)
+
+    def test_manifest_reparses_changed_week(self):
+        """a changed day file makes the week stale, so it is parsed again"""
+        cwm = self.get_manager(scan_manifest=True)
+        cwm.load_weeks()
+        write_file(path=join(self.week_dir, "1_Dienstag.txt"), json=False, data="Gulasch mit Knödeln")
+        result = cwm.load_weeks()
+        self.assertEqual("Gulasch mit Knödeln", result["2021"]["42"].items[1].message)
+        self.assertEqual(self.get_manager(scan_manifest=False).load_weeks(), result)
+
+    def test_manifest_rereads_racy_week(self):
+        """a same size edit keeping the mtime is found as long as the week was scanned within the mtime granularity"""
+        path = join(self.week_dir, "0_Montag.txt")
+        write_file(path=path, json=False, data="Schnitzel")
+        cwm = self.get_manager(scan_manifest=True)
+        cwm.load_weeks()
+        file_stat = stat(path)
+        write_file(path=path, json=False, data="Bratwurst")
+        utime(path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+        self.assertEqual("Bratwurst", cwm.load_weeks()["2021"]["42"].items[0].message)
+        with patch("src.Tagesgericht.time_ns", return_value=time_ns() + ScanManifest.mtime_granularity + 10 ** 9):
+            cwm.load_weeks()
+            with patch("src.Tagesgericht.FolderStorage.load_calendarweek") as load_calendarweek:
+                self.assertEqual("Bratwurst", cwm.load_weeks()["2021"]["42"].items[0].message)
+            load_calendarweek.assert_not_called()
+
+    def test_manifest_prunes_removed_weeks(self):
+        """weeks whose folders are gone are removed from the manifest"""
+        cwm = self.get_manager(scan_manifest=True)
+        cwm.load_weeks()
+        self.assertEqual(["2021/42"], list(cwm.storage.manifest.weeks))
+        rmtree(join(self.data_dir, "2021"))
+        self.assertEqual({}, cwm.load_weeks())
+        self.assertEqual({}, ScanManifest(path=join(self.data_dir, "manifest.json")).load().weeks)
+
+    def test_manifest_ignores_broken_file(self):
+        """a broken manifest file is treated like an empty manifest"""
+        write_file(path=join(self.data_dir, "manifest.json"), json=False, data="{broken")
+        manifest = ScanManifest(path=join(self.data_dir, "manifest.json")).load()
+        self.assertEqual({}, manifest.weeks)
+
+
+class TestCurrentWeekLoader(DataTreeTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.make_data_tree(weeks=[("2021", "40"), ("2021", "41"), ("2021", "42")],
+                            days={"0_Montag.txt": "Essen {week}"})
+        self.cwm = self.make_manager()
+        self.cwm.current_year, self.cwm.current_week, self.cwm.day_num = "2021", "42", 0
+
+    def test_get_today_from_current_week(self):
+        """only the folder of the current week is parsed"""
+        with patch("src.Tagesgericht.FolderStorage.parse_year_dir") as parse_year_dir:
+            result = self.cwm.get_today_from_current_week()
+            parse_year_dir.assert_not_called()
+        self.assertEqual("Essen 42", result.message)
+        self.assertEqual(["42"], list(self.cwm.data["2021"]))
+        self.assertEqual(self.cwm.data["2021"]["42"], self.cwm.get_current_week_obj())
+
+    def test_get_today_from_current_week_missing_folder(self):
+        """the first send of a new calendarweek creates its day templates, like init_manager did before"""
+        self.cwm.current_week = "43"
+        result = self.cwm.get_today_from_current_week()
+        self.assertEqual("", result.message)
+        self.assertFalse(result.message_sendable)
+        self.assertTrue(isfile(join(self.data_dir, "2021", "43", "4_Freitag.txt")))
+        write_file(path=join(self.data_dir, "2021", "43", "0_Montag.txt"), json=False, data="Schnitzel")
+        self.assertEqual("Schnitzel", self.cwm.get_today_from_current_week().message)
+
+    def test_snapshot_creates_weeks(self):
+        """opening the menu in a new calendarweek creates the templates of it and the next calendarweek"""
+        self.cwm.year, self.cwm.month, self.cwm.day = 2021, 10, 25
+        self.cwm.current_week = "43"
+        self.assertFalse(self.cwm.show_send_message())
+        self.assertFalse(self.cwm.show_sold_out_message())
+        self.assertTrue(isfile(join(self.data_dir, "2021", "43", "0_Montag.txt")))
+        self.assertTrue(isfile(join(self.data_dir, "2021", "44", "0_Montag.txt")))
+        write_file(path=join(self.data_dir, "2021", "43", "0_Montag.txt"), json=False, data="Schnitzel")
+        self.cwm.invalidate_snapshot()
+        self.assertTrue(self.cwm.show_send_message())
+
+    @patch("src.Tagesgericht.TwitterPublisher.publish")
+    def test_send_sold_out_message_without_today(self, publish):
+        """sending a sold out message without a day item for today is not possible"""
+        self.cwm.day_num = 3
+        self.assertFalse(self.cwm.send_sold_out_message())
+        publish.assert_not_called()
+
+
+class TestSnapshot(TestCase):
+
+    def setUp(self) -> None:
+        self.cwm = TagesgerichtManager(
+            active_days=[0, 1, 2, 3, 4],
+            data_dir="unittest",
+            translation={},
+            specialdays={},
+            credentials={}
+        )
+
+    @patch("src.Tagesgericht.TagesgerichtManager.create_weeks")
+    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_current_week")
+    def test_snapshot_shared_by_status_queries(self, get_today_from_current_week, create_weeks):
+        """all status queries of one menu pass load the current day only once"""
+        day_mock = Mock()
+        day_mock.is_sent.return_value = True
+        day_mock.is_stopped.return_value = False
+        get_today_from_current_week.return_value = day_mock
+        self.assertFalse(self.cwm.show_send_message())
+        self.assertTrue(self.cwm.show_sold_out_message())
+        get_today_from_current_week.assert_called_once_with()
+        create_weeks.assert_called_once_with()
+        self.assertEqual(TagesgerichtSnapshot(today_item=day_mock), self.cwm.get_snapshot())
+
+    @patch("src.Tagesgericht.TagesgerichtManager.create_weeks")
+    @patch("src.Tagesgericht.TagesgerichtManager.get_today_from_current_week", return_value=False)
+    def test_invalidate_snapshot(self, get_today_from_current_week, create_weeks):
+        """after invalidating, the next status query loads the current day again"""
+        self.assertFalse(self.cwm.show_send_message())
+        self.cwm.invalidate_snapshot()
+        self.assertIsNone(self.cwm.snapshot)
+        self.assertFalse(self.cwm.show_sold_out_message())
+        self.assertEqual(2, get_today_from_current_week.call_count)
+
+
+class TestParallelParsing(DataTreeTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.make_data_tree(weeks=[("2021", week) for week in range(1, 11)],
+                            days={"0_Montag.txt": "Essen {week} 0", "2_Mittwoch.txt": "Essen {week} 2"}, log={"2": []})
+
+    def get_manager(self, parse_workers: int, scan_manifest: bool = False) -> TagesgerichtManager:
+        return self.make_manager(scan_manifest=scan_manifest, parse_workers=parse_workers)
+
+    def test_parallel_equals_serial(self):
+        """parallel parsing results in the same data, merged in the same order as serial parsing"""
+        serial = self.get_manager(parse_workers=0).load_weeks()
+        parallel = self.get_manager(parse_workers=4).load_weeks()
+        self.assertEqual(serial, parallel)
+        self.assertEqual(list(serial["2021"]), list(parallel["2021"]))
+        self.assertEqual(10, len(parallel["2021"]))
+
+    def test_parallel_with_manifest(self):
+        """parallel parsing stores every week in the scan manifest"""
+        cwm = self.get_manager(parse_workers=4, scan_manifest=True)
+        result = cwm.load_weeks()
+        self.assertEqual(10, len(cwm.storage.manifest.weeks))
+        self.assertEqual(result, cwm.load_weeks())
+
+    @patch("src.Tagesgericht.ThreadPoolExecutor")
+    def test_serial_mode_uses_no_pool(self, thread_pool_executor):
+        """with one parse worker no thread pool is started"""
+        self.get_manager(parse_workers=1).load_weeks()
+        thread_pool_executor.assert_not_called()
+
+
+class TestDirectoryWalker(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.data_dir = self.tmp_dir.name
+        makedirs(join(self.data_dir, "2021", "42"))
+        write_file(path=join(self.data_dir, "2021", "42", "0_Montag.txt"), json=False, data="Schnitzel")
+        write_file(path=join(self.data_dir, "manifest.json"), json=True, data={})
+        self.walker = DirectoryWalker()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_list_dirs_and_files(self):
+        """list_dirs and list_files split a folder listing by entry type"""
+        self.assertEqual(["2021"], [entry.name for entry in self.walker.list_dirs(path=self.data_dir)])
+        self.assertEqual(["manifest.json"], [entry.name for entry in self.walker.list_files(path=self.data_dir)])
+        self.assertEqual({"syscalls": 2, "legacy_syscalls": 6, "saved_syscalls": 4}, self.walker.get_report())
+
+    @patch("src.Tagesgericht.isfile")
+    def test_is_file_answered_from_cache(self, lisfile):
+        """checks for paths within a scanned folder need no further syscall"""
+        folder = join(self.data_dir, "2021", "42")
+        self.walker.scan(path=folder, legacy_syscalls=0)
+        self.assertTrue(self.walker.is_file(path=join(folder, "0_Montag.txt")))
+        self.assertFalse(self.walker.is_file(path=join(folder, "1_Dienstag.txt")))
+        lisfile.assert_not_called()
+        self.assertEqual({"syscalls": 1, "legacy_syscalls": 2, "saved_syscalls": 1}, self.walker.get_report())
+
+    def test_unknown_paths_fall_back_to_syscalls(self):
+        """paths of folders that were not scanned are checked on disk"""
+        self.assertTrue(self.walker.is_dir(path=join(self.data_dir, "2021")))
+        self.assertTrue(self.walker.stat(path=join(self.data_dir, "manifest.json")).st_size)
+        self.walker.scan(path=self.data_dir)
+        self.walker.clear()
+        self.assertEqual({}, self.walker.folders)
+        self.assertEqual({"syscalls": 3, "legacy_syscalls": 3, "saved_syscalls": 0}, self.walker.get_report())
+
+    def test_parser_saves_syscalls(self):
+        """parsing the data dir through the walker needs fewer syscalls than the former path"""
+        cwm = TagesgerichtManager(
+            active_days=[0, 1, 2, 3, 4],
+            data_dir=self.data_dir,
+            translation={},
+            specialdays={},
+            credentials={}
+        )
+        result = cwm.load_weeks()
+        self.assertEqual("Schnitzel", result["2021"]["42"].items[0].message)
+        self.assertGreater(cwm.storage.walker.get_report()["saved_syscalls"], 0)
+
+
+class TestDateWindow(DataTreeTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.make_data_tree(weeks=[("2019", "10"), ("2021", "40"), ("2021", "41"), ("2021", "42"), ("2021", "43")],
+                            days={"0_Montag.txt": "Essen {week}"})
+        self.cwm = self.make_manager()
+        self.cwm.today = date(2021, 10, 20)
+        self.cwm.day_num = self.cwm.today.weekday()
+
+    def test_get_window(self):
+        """the window starts weeks_back mondays ago and ends on the sunday weeks_ahead weeks ahead"""
+        self.assertEqual([date(2021, 10, 11), date(2021, 11, 7)], self.cwm.get_window(weeks_back=1))
+        self.assertEqual([date(2021, 10, 18), date(2021, 10, 24)], self.cwm.get_window(weeks_back=0, weeks_ahead=0))
+
+    def test_is_week_in_window(self):
+        first, last = date(2021, 10, 18), date(2021, 10, 24)
+        self.assertTrue(Calendarweek.is_week_in_window(first_day_of_week=first, last_day_of_week=last))
+        self.assertTrue(Calendarweek.is_week_in_window(first_day_of_week=first, last_day_of_week=last,
+                                                       since=date(2021, 10, 24), until=date(2021, 10, 30)))
+        self.assertFalse(Calendarweek.is_week_in_window(first_day_of_week=first, last_day_of_week=last,
+                                                        since=date(2021, 10, 25)))
+        self.assertFalse(Calendarweek.is_week_in_window(first_day_of_week=first, last_day_of_week=last,
+                                                        until=date(2021, 10, 17)))
+
+    def test_parse_year_dir_window(self):
+        """folders outside of the window are never opened"""
+        since, until = self.cwm.get_window(weeks_back=1, weeks_ahead=0)
+        with patch("src.Tagesgericht.DirectoryWalker.list_files", wraps=self.cwm.storage.walker.list_files) as list_files:
+            result = self.cwm.load_weeks(since=since, until=until)
+        self.assertEqual(["2021"], list(result))
+        self.assertEqual(["41", "42"], sorted(result["2021"]))
+        self.assertEqual(2, list_files.call_count)
+        self.assertNotIn(join(self.data_dir, "2019"), self.cwm.storage.walker.folders)
+
+    def test_parse_year_dir_full_history(self):
+        """without window every year and calendarweek is parsed"""
+        result = self.cwm.load_weeks()
+        self.assertEqual(["2019", "2021"], sorted(result))
+        self.assertEqual(4, len(result["2021"]))
+
+    @patch("src.Tagesgericht.print")
+    def test_print_data_window(self, lprint):
+        """print_data only reports calendarweeks within the window"""
+        self.cwm.data = self.cwm.load_weeks()
+        self.cwm.print_data(since=date(2021, 10, 18), until=date(2021, 10, 24))
+        lprint.assert_called_once()
+        self.assertIn("calendarweek 42", lprint.call_args[0][0])
+        self.assertNotIn("calendarweek 41", lprint.call_args[0][0])
+
+    def test_get_print_window(self):
+        self.cwm.today = date(2021, 10, 20)
+        self.cwm.day_num = 2
+        self.assertEqual([date(2021, 10, 18), date(2021, 11, 7)], self.cwm.get_print_window(option="upcoming"))
+        self.assertEqual([date(2021, 8, 23), date(2021, 10, 24)], self.cwm.get_print_window(option="8"))
+        self.assertEqual([date(2021, 1, 1), None], self.cwm.get_print_window(option="2021-01-01:"))
+        self.assertEqual([None, date(2021, 3, 31)], self.cwm.get_print_window(option=":2021-03-31"))
+        self.assertRaises(ValueError, self.cwm.get_print_window, option="yesterday")
+        self.assertRaises(ValueError, self.cwm.get_print_window, option="2021-13-01:")
+
+
+class TestStreaming(DataTreeTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.make_data_tree(weeks=[("2019", "10"), ("2021", "9"), ("2021", "10"), ("2021", "42")],
+                            days={"0_Montag.txt": "Essen {week}", "2_Mittwoch.txt": ""})
+        self.cwm = self.make_manager(active_days=[0, 2])
+        self.cwm.report_build_folder = join(self.tmp_dir.name, "report")
+        self.cwm.today = date(2021, 10, 20)
+        self.cwm.day_num = self.cwm.today.weekday()
+        self.cwm.current_week = "42"
+
+    def test_iter_items_is_chronological(self):
+        dates = [item.item_date for item in self.cwm.iter_items()]
+        self.assertEqual(sorted(dates), dates)
+        self.assertEqual(8, len(dates))
+        self.assertEqual(sorted(dates, reverse=True), [item.item_date for item in self.cwm.iter_items(order="desc")])
+        self.assertRaises(ValueError, list, self.cwm.iter_items(order="random"))
+
+    def test_iter_items_filter_and_window(self):
+        items = self.cwm.iter_items(item_filter=lambda item: item.message_sendable, since=date(2021, 1, 1))
+        self.assertEqual(["Essen 9", "Essen 10", "Essen 42"], [item.message for item in items])
+        self.assertEqual({}, self.cwm.data)
+
+    def test_iter_items_reads_archives(self):
+        self.cwm.storage.archive_year(year="2019")
+        self.assertEqual([date(2019, 3, 4), date(2019, 3, 6)],
+                         [item.item_date for item in self.cwm.iter_items(until=date(2020, 1, 1))])
+
+    def test_export_items(self):
+        output = StringIO()
+        self.assertEqual(8, self.cwm.export_items(output=output))
+        lines = [loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual({"date": "2019-03-04", "message": "Essen 10", "length": 8, "sendable": True, "sent_at": None,
+                          "stopped_at": None, "specialday": ""}, lines[0])
+        self.assertFalse(lines[1]["sendable"])
+        output = StringIO()
+        self.assertEqual(1, self.cwm.export_items(output=output, export_format="json", since=date(2021, 3, 2),
+                                                  until=date(2021, 3, 7)))
+        self.assertEqual(["2021-03-03"], [item["date"] for item in loads(output.getvalue())])
+        output = StringIO()
+        self.assertEqual(0, self.cwm.export_items(output=output, export_format="json", since=date(2030, 1, 1)))
+        self.assertEqual([], loads(output.getvalue()))
+        self.assertRaises(ValueError, self.cwm.export_items, output=output, export_format="csv")
+        self.assertFalse(isdir(join(self.data_dir, "2021", "43")))
+
+    def test_streamed_reports_match(self):
+        """streamed reports write the same files and print the same lines as reports from the data property"""
+        with patch("builtins.print") as lprint:
+            self.cwm.print_data(stream=True)
+        streamed_lines = lprint.call_args_list
+        self.cwm.create_rst_data(stream=True)
+        streamed = [read_file(path=join(self.cwm.report_build_folder, name), json=False)
+                    for name in ["planned_status.rst", "history.rst"]]
+        self.cwm.data = self.cwm.load_weeks()
+        with patch("builtins.print") as lprint:
+            self.cwm.print_data()
+        self.assertEqual(streamed_lines, lprint.call_args_list)
+        self.cwm.create_rst_data()
+        self.assertEqual(streamed, [read_file(path=join(self.cwm.report_build_folder, name), json=False)
+                                    for name in ["planned_status.rst", "history.rst"]])
+        history_days = [streamed[1].index(day) for day in ["04.03.2019", "01.03.2021", "08.03.2021"]]
+        self.assertEqual(sorted(history_days), history_days)
+        self.assertIn("20.10.2021", streamed[0])
+
+    def get_report_mtimes(self) -> list:
+        return [stat(join(self.cwm.report_build_folder, name)).st_mtime_ns
+                for name in ["planned_status.rst", "history.rst"]]
+
+    def get_report_files(self) -> list:
+        return [read_file(path=join(self.cwm.report_build_folder, name), json=False)
+                for name in ["planned_status.rst", "history.rst"]]
+
+    def test_unchanged_report_is_not_rewritten(self):
+        """a second report renders no week again and leaves the report files untouched"""
+        self.cwm.data = self.cwm.load_weeks()
+        self.cwm.create_rst_data()
+        mtimes = self.get_report_mtimes()
+        sleep(0.01)
+        with patch("src.Tagesgericht.TagesgerichtManager.return_week_as_rst_string") as return_week_as_rst_string:
+            self.cwm.create_rst_data()
+            self.cwm.create_rst_data(stream=True)
+        return_week_as_rst_string.assert_not_called()
+        self.assertEqual(mtimes, self.get_report_mtimes())
+
+    def test_changed_week_is_rendered_again(self):
+        self.cwm.create_rst_data(stream=True)
+        mtimes = self.get_report_mtimes()
+        sleep(0.01)
+        write_file(path=join(self.data_dir, "2021", "9", "0_Montag.txt"), json=False, data="Backfisch")
+        with patch("src.Tagesgericht.TagesgerichtManager.return_week_as_rst_string",
+                   wraps=self.cwm.return_week_as_rst_string) as return_week_as_rst_string:
+            self.cwm.create_rst_data(stream=True)
+        self.assertEqual(["9"], [week_call[1]["week"].week for week_call in return_week_as_rst_string.call_args_list])
+        self.assertEqual(mtimes[0], self.get_report_mtimes()[0])
+        self.assertNotEqual(mtimes[1], self.get_report_mtimes()[1])
+        self.assertIn("Backfisch", read_file(path=join(self.cwm.report_build_folder, "history.rst"), json=False))
+
+    def test_parallel_render_keeps_order(self):
+        """threads and processes render the same report as one after another, across batches"""
+        self.cwm.create_rst_data(stream=True)
+        serial = self.get_report_files()
+        self.cwm.render_workers = 2
+        self.cwm.render_crossover = 2
+        for process_crossover in [100, 2]:
+            self.cwm.process_crossover = process_crossover
+            rmtree(self.cwm.report_build_folder)
+            self.cwm.create_rst_data(stream=True)
+            self.assertEqual(serial, self.get_report_files())
+        pools = {}
+        self.assertEqual([], self.cwm.render_weeks(weeks=[], pools=pools))
+        self.assertEqual({}, pools)
+
+    def test_parallel_render_default_settings(self):
+        """with the default crossovers an empty report cache of more than process_crossover weeks uses processes"""
+        self.make_data_tree(weeks=[(year, week) for year in range(1980, 2021) for week in range(1, 53)],
+                            days={"0_Montag.txt": "Essen {week}/{year}"})
+        self.cwm.create_rst_data(stream=True)
+        serial = self.get_report_files()
+        rmtree(self.cwm.report_build_folder)
+        self.cwm.render_workers = 2
+        with patch("src.Tagesgericht.ProcessPoolExecutor", wraps=ProcessPoolExecutor) as process_pool:
+            self.cwm.create_rst_data(stream=True)
+        process_pool.assert_called_once()
+        self.assertEqual(serial, self.get_report_files())
+
+    def test_history_pages(self):
+        """past calendarweeks get a page each, linked from a page per year"""
+        self.cwm.create_rst_data(stream=True, pages=True)
+        history_folder = join(self.cwm.report_build_folder, "history")
+        history = read_file(path=join(self.cwm.report_build_folder, "history.rst"), json=False)
+        self.assertIn(".. toctree::\n   :maxdepth: 1\n\n   history/2019\n   history/2021\n", history)
+        self.assertNotIn("Essen", history)
+        self.assertIn("   2021/9\n   2021/10\n", read_file(path=join(history_folder, "2021.rst"), json=False))
+        self.assertIn("Essen 9", read_file(path=join(history_folder, "2021", "9.rst"), json=False))
+        self.assertFalse(isfile(join(history_folder, "2021", "42.rst")))
+        self.cwm.data = self.cwm.load_weeks(since=date(2021, 1, 1))
+        self.cwm.create_rst_data(pages=True, since=date(2021, 1, 1))
+        self.assertEqual(["2021", "2021.rst"], sorted(listdir(history_folder)))
+        self.cwm.create_rst_data()
+        self.assertFalse(isdir(history_folder))
+
+    def test_create_html_data(self):
+        """the html dashboard holds both sections with the report legend, escaped messages and the stylesheet"""
+        write_file(path=join(self.data_dir, "2021", "42", "0_Montag.txt"), json=False, data="Suppe & <Brot>")
+        self.cwm.html_build_folder = join(self.tmp_dir.name, "html-report")
+        index_path = self.cwm.create_html_data(stream=True)
+        page = read_file(path=index_path, json=False)
+        planned, history = page.split('<section id="history">')
+        for icon, text in self.cwm.get_legend(history=False):
+            self.assertIn("<dt>{}</dt><dd>{}</dd>".format(icon, text), planned)
+        self.assertIn("<dd>Message was sent</dd>", history)
+        self.assertIn('<pre class="message">Suppe &amp; &lt;Brot&gt;</pre>', planned)
+        self.assertIn("Essen 9", history)
+        self.assertNotIn("Essen 9", planned)
+        self.assertTrue(isfile(join(self.cwm.html_build_folder, "report.css")))
+        self.assertEqual(["index.html", "report.css"], sorted(listdir(self.cwm.html_build_folder)))
+        modified = stat(index_path).st_mtime_ns
+        self.cwm.create_html_data(stream=True)
+        self.assertEqual(modified, stat(index_path).st_mtime_ns)
+
+
+class TestSQLiteStorage(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.data_dir = join(self.tmp_dir.name, "Data")
+        self.weekday_map = {"0": "Montag", "1": "Dienstag", "2": "Mittwoch", "3": "Donnerstag", "4": "Freitag"}
+        for year, week in [("2019", "10"), ("2021", "41"), ("2021", "42")]:
+            makedirs(join(self.data_dir, year, week))
+            write_file(path=join(self.data_dir, year, week, "0_Montag.txt"), json=False, data="Essen " + week)
+            write_file(path=join(self.data_dir, year, week, "2_Mittwoch.txt"), json=False, data="")
+            write_file(path=join(self.data_dir, year, week, "log.json"), json=True, data={"0": [{
+                "message_sent": True,
+                "log_date": "2021-10-18 11:00:00.000000",
+                "error": "",
+                "message": "Essen " + week,
+                "message_stopped": False,
+            }]})
+        self.folder = FolderStorage(data_dir=self.data_dir, weekday_map=self.weekday_map, translate={})
+        self.sqlite = SQLiteStorage(path=join(self.tmp_dir.name, "tagesgericht.sqlite"), weekday_map=self.weekday_map)
+
+    def tearDown(self) -> None:
+        self.sqlite.close()
+        self.tmp_dir.cleanup()
+
+    @staticmethod
+    def get_content(weeks: dict) -> dict:
+        return {year: {week: cw_obj.get_content_hash() for week, cw_obj in yearcollection.items()}
+                for year, yearcollection in weeks.items()}
+
+    def test_wal_mode(self):
+        self.assertEqual("wal", self.sqlite.connection.execute("PRAGMA journal_mode").fetchone()[0])
+
+    def test_migrate_storage(self):
+        """a migrated storage holds the same messages and logentrys as its source"""
+        self.assertEqual(3, migrate_storage(source=self.folder, target=self.sqlite))
+        self.assertEqual(self.get_content(self.folder.load_weeks()), self.get_content(self.sqlite.load_weeks()))
+        self.assertEqual(sorted(self.folder.list_weeks()), sorted(self.sqlite.list_weeks()))
+        migrate_storage(source=self.folder, target=self.sqlite)
+        self.assertEqual(1, len(self.sqlite.load_week(year="2021", week="42").items[0].logentrys))
+
+    def test_migrate_back_to_folder(self):
+        migrate_storage(source=self.folder, target=self.sqlite)
+        folder = FolderStorage(data_dir=join(self.tmp_dir.name, "Copy"), weekday_map=self.weekday_map, translate={})
+        self.assertEqual(3, migrate_storage(source=self.sqlite, target=folder))
+        self.assertEqual(self.get_content(self.folder.load_weeks()), self.get_content(folder.load_weeks()))
+
+    def test_window(self):
+        migrate_storage(source=self.folder, target=self.sqlite)
+        since, until = date(2021, 10, 18), date(2021, 10, 24)
+        self.assertEqual([["2021", "42"]], self.sqlite.list_weeks(since=since, until=until))
+        self.assertEqual(["2021"], list(self.sqlite.load_weeks(since=date(2021, 1, 1))))
+        self.assertEqual(self.folder.list_weeks(since=since, until=until),
+                         self.sqlite.list_weeks(since=since, until=until))
+
+    def test_load_day_and_missing_week(self):
+        migrate_storage(source=self.folder, target=self.sqlite)
+        self.assertEqual("Essen 41", self.sqlite.load_day(year="2021", week="41", day_num=0).message)
+        self.assertFalse(self.sqlite.load_day(year="2021", week="41", day_num=4))
+        self.assertFalse(self.sqlite.load_week(year="2021", week="43"))
+        self.assertFalse(self.folder.load_day(year="2021", week="43", day_num=0))
+
+    def test_create_week_and_append_log(self):
+        """creating a week keeps existing days, appended logentrys are loaded in order"""
+        migrate_storage(source=self.folder, target=self.sqlite)
+        self.sqlite.create_week(year="2021", week="42", active_days=[0, 1])
+        cw_obj = self.sqlite.load_week(year="2021", week="42")
+        self.assertEqual(["Essen 42", "", ""], [cw_obj.items[day].message for day in [0, 1, 2]])
+        cw_obj.items[0].add_log(message_sent=True, message_stopped=True, translate={})
+        self.sqlite.append_log(cw_obj=cw_obj, day_num=0)
+        logentrys = self.sqlite.load_day(year="2021", week="42", day_num=0).logentrys
+        self.assertEqual([False, True], [logentry["message_stopped"] for logentry in logentrys])
+
+    def test_manager_with_sqlite_storage(self):
+        migrate_storage(source=self.folder, target=self.sqlite)
+        cwm = TagesgerichtManager(
+            active_days=[0, 1, 2, 3, 4],
+            data_dir=self.data_dir,
+            translation={},
+            specialdays={"18.10": "unittestday"},
+            credentials={},
+            storage=self.sqlite
+        )
+        cwm.current_year, cwm.current_week, cwm.day_num = "2021", "42", 0
+        self.assertEqual("unittestday", cwm.get_today_from_current_week().specialday)
+
+    def test_set_message(self):
+        """messages are edited with set_message, logentrys are kept and no made up filepath is stored"""
+        migrate_storage(source=self.folder, target=self.sqlite)
+        for storage in [self.folder, self.sqlite]:
+            storage.set_message(year="2021", week="42", day_num=0, message="Schnitzel")
+            storage.set_message(year="2021", week="43", day_num=1, message="Gulasch")
+            day_item = storage.load_day(year="2021", week="42", day_num=0)
+            self.assertEqual(["Schnitzel", 1], [day_item.message, len(day_item.logentrys)])
+            cw_obj = storage.load_week(year="2021", week="43")
+            self.assertEqual([1, "Gulasch", date(2021, 10, 26)],
+                             [len(cw_obj.items), cw_obj.items[1].message, cw_obj.items[1].item_date])
+        self.assertEqual("Schnitzel", read_file(path=join(self.data_dir, "2021", "42", "0_Montag.txt"), json=False))
+        self.assertEqual("", self.sqlite.load_day(year="2021", week="42", day_num=0).filepath)
+
+    def test_manager_set_message_and_print(self):
+        """the report of the sqlite storage shows the date of a day instead of a file"""
+        cwm = TagesgerichtManager(active_days=[0], data_dir=self.data_dir, translation={}, specialdays={},
+                                  credentials={}, storage=self.sqlite)
+        cwm.snapshot = "stale"
+        cwm.set_message(day=date(2021, 10, 19), message="Gulasch")
+        self.assertIsNone(cwm.snapshot)
+        self.assertEqual("Gulasch", self.sqlite.load_day(year="2021", week="42", day_num=1).message)
+        cwm.data = cwm.load_weeks()
+        with patch("sys.stdout", new_callable=StringIO) as stdout:
+            cwm.print_data()
+        self.assertIn("2021-10-19", stdout.getvalue())
+        self.assertNotIn("tagesgericht.sqlite", stdout.getvalue())
+
+    def test_connection_per_thread(self):
+        """the outbox worker thread gets its own connection, so its transactions dont mix with the menu"""
+        connections = []
+        thread = Thread(target=lambda: connections.append(self.sqlite.connection))
+        thread.start()
+        thread.join()
+        self.assertIsNot(self.sqlite.connection, connections[0])
+        self.assertIs(self.sqlite.connection, self.sqlite.connection)
+        self.sqlite.close()
+        self.assertEqual([], self.sqlite.connections)
+
+
+class TestSendJournal(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.data_dir = self.tmp_dir.name
+        self.week_dir = join(self.data_dir, "2021", "42")
+        makedirs(self.week_dir)
+        write_file(path=join(self.week_dir, "0_Montag.txt"), json=False, data="Schnitzel")
+        write_file(path=join(self.week_dir, "log.json"), json=True, data={"0": [{"message_sent": False}]})
+        self.storage = FolderStorage(data_dir=self.data_dir, weekday_map={"0": "Montag"}, translate={})
+        self.journal_path = join(self.week_dir, "journal.jsonl")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_append_log_leaves_snapshot_untouched(self):
+        """a send appends one record to the journal, the reader replays it after the snapshot"""
+        cw_obj = self.storage.load_week(year="2021", week="42")
+        cw_obj.items[0].add_log(message_sent=True, message_stopped=False, translate={})
+        self.storage.append_log(cw_obj=cw_obj, day_num=0)
+        self.assertEqual({"0": [{"message_sent": False}]}, read_file(path=join(self.week_dir, "log.json"), json=True))
+        self.assertEqual([{"day": "0", "logentry": cw_obj.items[0].logentrys[-1]}],
+                         read_lines(path=self.journal_path))
+        self.assertEqual(cw_obj.items[0].logentrys, self.storage.load_week(year="2021", week="42").items[0].logentrys)
+
+    def test_torn_line_is_skipped(self):
+        append_line(path=self.journal_path, data={"day": "0", "logentry": {"message_sent": True}})
+        with open(self.journal_path, mode="a", encoding="utf-8") as file:
+            file.write('{"day": "0", "logen')
+        logentrys = self.storage.load_week(year="2021", week="42").items[0].logentrys
+        self.assertEqual([{"message_sent": False}, {"message_sent": True}], logentrys)
+
+    def test_concurrent_appends_lose_no_records(self):
+        """appends from several processes at the same time all end up as complete records"""
+        records = [(self.journal_path, {"day": "0", "logentry": {"worker": worker, "record": record}})
+                   for worker in range(4) for record in range(50)]
+        with Pool(processes=4) as pool:
+            pool.starmap(append_line, records)
+        self.assertEqual(sorted(str(record[1]) for record in records),
+                         sorted(str(line) for line in read_lines(path=self.journal_path)))
+
+    def test_compact(self):
+        """compaction folds the journal into log.json and removes it"""
+        append_line(path=self.journal_path, data={"day": "0", "logentry": {"message_sent": True}})
+        before = self.storage.load_week(year="2021", week="42")
+        self.assertEqual(1, self.storage.compact())
+        self.assertFalse(isfile(self.journal_path))
+        self.assertEqual({"0": [{"message_sent": False}, {"message_sent": True}]},
+                         read_file(path=join(self.week_dir, "log.json"), json=True))
+        self.assertEqual(before, self.storage.load_week(year="2021", week="42"))
+        self.assertEqual(0, self.storage.compact())
+
+    def test_interrupted_compaction(self):
+        """a renamed journal is replayed without duplicates and folded by the next compaction"""
+        write_file(path=join(self.week_dir, "log.json"), json=True,
+                   data={"0": [{"message_sent": False}, {"message_sent": True}]})
+        append_line(path=self.journal_path + ".compacting", data={"day": "0", "logentry": {"message_sent": True}})
+        append_line(path=self.journal_path, data={"day": "0", "logentry": {"message_stopped": True}})
+        expected = [{"message_sent": False}, {"message_sent": True}, {"message_stopped": True}]
+        self.assertEqual(expected, self.storage.load_week(year="2021", week="42").items[0].logentrys)
+        self.storage.compact()
+        self.assertFalse(isfile(self.journal_path + ".compacting"))
+        self.assertTrue(isfile(self.journal_path))
+        self.assertEqual(expected, self.storage.load_week(year="2021", week="42").items[0].logentrys)
+
+    def test_replay_skips_records_in_any_key_order(self):
+        """a replayed record equals the one in log.json regardless of the order its keys were written in"""
+        write_file(path=join(self.week_dir, "log.json"), json=True,
+                   data={"0": [{"message_sent": True, "error": ""}]})
+        append_line(path=self.journal_path, data={"day": "0", "logentry": {"error": "", "message_sent": True}})
+        append_line(path=self.journal_path, data={"day": "1", "logentry": {"message_sent": True}})
+        append_line(path=self.journal_path, data={"day": "1", "logentry": {"message_sent": True}})
+        day_logs = self.storage.read_week_logs(path=self.week_dir, filenames=["log.json", "journal.jsonl"])
+        self.assertEqual({"0": [{"message_sent": True, "error": ""}], "1": [{"message_sent": True}]}, day_logs)
+
+
+class TestYearArchive(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.data_dir = self.tmp_dir.name
+        for week, meal in [("41", "Gulasch"), ("42", "Schnitzel")]:
+            week_dir = join(self.data_dir, "2020", week)
+            makedirs(week_dir)
+            write_file(path=join(week_dir, "0_Montag.txt"), json=False, data=meal)
+            write_file(path=join(week_dir, "log.json"), json=True, data={"0": [{"message_sent": False}]})
+        append_line(path=join(self.data_dir, "2020", "42", "journal.jsonl"),
+                    data={"day": "0", "logentry": {"message_sent": True}})
+        write_file(path=join(self.data_dir, "2020", "42", "0_send.key"), json=False, data="")
+        self.storage = FolderStorage(data_dir=self.data_dir, weekday_map={"0": "Montag"}, translate={})
+        self.weeks = self.storage.load_weeks()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def assertWeeksEqual(self, expected: dict, result: dict) -> None:
+        self.assertEqual(
+            {year: {week: [[item.message, item.item_date, item.logentrys] for item in cw_obj.items.values()]
+                    for week, cw_obj in weeks.items()} for year, weeks in expected.items()},
+            {year: {week: [[item.message, item.item_date, item.logentrys] for item in cw_obj.items.values()]
+                    for week, cw_obj in weeks.items()} for year, weeks in result.items()})
+
+    def test_archived_year_loads_like_folders(self):
+        """an archived year replaces its folders by one file and loads the same calendarweeks"""
+        self.assertEqual(4, self.storage.archive_year(year="2020"))
+        self.assertEqual(["2020.zip"], sorted(entry for entry in listdir(self.data_dir)))
+        self.assertWeeksEqual(self.weeks, self.storage.load_weeks())
+        self.assertEqual([["2020", "41"], ["2020", "42"]], sorted(self.storage.list_weeks()))
+        self.assertEqual("Schnitzel", self.storage.load_day(year="2020", week="42", day_num=0).message)
+        self.assertFalse(self.storage.load_week(year="2020", week="43"))
+
+    def test_archive_reads_single_weeks(self):
+        self.storage.archive_year(year="2020")
+        with YearArchive(path=join(self.data_dir, "2020.zip")) as archive:
+            self.assertEqual(["41", "42"], sorted(archive.list_weeks()))
+            self.assertEqual({"0_Montag.txt": "Gulasch", "log.json": '{"0": [{"message_sent": false}]}'},
+                             archive.read_week(week="41"))
+        since = date(2020, 10, 12)
+        self.assertEqual(["42"], list(self.storage.load_weeks(since=since, until=since)["2020"]))
+
+    def test_folders_take_precedence_over_the_archive(self):
+        self.storage.archive_year(year="2020")
+        week_dir = join(self.data_dir, "2020", "42")
+        makedirs(week_dir)
+        write_file(path=join(week_dir, "0_Montag.txt"), json=False, data="Backfisch")
+        weeks = self.storage.load_weeks()
+        self.assertEqual("Gulasch", weeks["2020"]["41"].items[0].message)
+        self.assertEqual("Backfisch", weeks["2020"]["42"].items[0].message)
+        self.assertEqual(2, len(self.storage.list_weeks()))
+
+    def test_unpack_restores_the_folders(self):
+        self.storage.archive_year(year="2020")
+        self.assertEqual(4, self.storage.unpack_year(year="2020"))
+        self.assertFalse(isfile(join(self.data_dir, "2020.zip")))
+        self.assertTrue(isfile(join(self.data_dir, "2020", "42", "0_Montag.txt")))
+        self.assertWeeksEqual(self.weeks, self.storage.load_weeks())
+        self.assertEqual(0, self.storage.unpack_year(year="2020"))
+
+    def test_manager_archives_past_years_only(self):
+        write_file(path=join(self.data_dir, "2021.txt"), json=False, data="")
+        makedirs(join(self.data_dir, "2021", "1"))
+        cwm = TagesgerichtManager(active_days=[], data_dir=self.data_dir, translation={}, specialdays={},
+                                  credentials={}, storage=self.storage)
+        cwm.current_year = "2021"
+        self.assertEqual(["2020"], cwm.archive_past_years())
+        self.assertTrue(isdir(join(self.data_dir, "2021", "1")))
+        self.assertEqual(["2020"], cwm.unpack_archives())
+        self.assertTrue(isdir(join(self.data_dir, "2020", "41")))
+
+
+def send_in_process(data_dir: str, posts_path: str) -> bool:
+    """sends the message of monday in calendarweek 42 with a slow fake network call, used by TestSendGuard"""
+    def slow_publish(message: str) -> PublishResult:
+        append_line(path=posts_path, data={"message": message})
+        sleep(0.05)
+        return PublishResult(success=True)
+
+    cwm = TagesgerichtManager(
+        active_days=[0, 1, 2, 3, 4],
+        data_dir=data_dir,
+        translation={"weekday_map": WEEKDAY_MAP},
+        specialdays={},
+        credentials={}
+    )
+    cwm.current_year, cwm.current_week, cwm.day_num = "2021", "42", 0
+    with patch("src.Tagesgericht.TwitterPublisher.publish", side_effect=slow_publish):
+        return cwm.send_message_for_today()
+
+
+class TestSendGuard(DataTreeTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.make_data_tree(weeks=[("2021", "42")], days={"0_Montag.txt": "Schnitzel"})
+        self.posts_path = join(self.tmp_dir.name, "posts.jsonl")
+        self.storage = FolderStorage(data_dir=self.data_dir, weekday_map={}, translate={})
+
+    def test_concurrent_sends_post_once(self):
+        """many concurrent invocations result in exactly one post and one logentry"""
+        with Pool(processes=8) as pool:
+            results = pool.starmap(send_in_process, [(self.data_dir, self.posts_path)] * 24)
+        self.assertEqual(1, results.count(True))
+        self.assertEqual([{"message": "Schnitzel"}], read_lines(path=self.posts_path))
+        logentrys = self.storage.load_week(year="2021", week="42").items[0].logentrys
+        self.assertEqual([True], [logentry["message_sent"] for logentry in logentrys])
+
+    def test_file_lock_does_not_wait(self):
+        first = self.storage.get_lock()
+        second = self.storage.get_lock()
+        self.assertTrue(first.acquire())
+        self.assertFalse(second.acquire())
+        first.release()
+        self.assertTrue(second.acquire())
+        second.release()
+        self.assertIsNone(second.fd)
+
+    @patch("src.Tagesgericht.TwitterPublisher.publish")
+    @patch("src.Tagesgericht.print")
+    def test_locked_send_returns_right_away(self, lprint, publish):
+        lock = FileLock(path=join(self.data_dir, "tagesgericht.lock"))
+        lock.acquire()
+        self.assertFalse(send_in_process(data_dir=self.data_dir, posts_path=self.posts_path))
+        lock.release()
+        lprint.assert_called_once_with("another send is in progress")
+        self.assertFalse(isfile(self.posts_path))
+
+    def test_idempotency_key_survives_lost_log(self):
+        """a post whose logentry got lost, like after a crash, is not repeated"""
+        self.assertTrue(self.storage.claim_action(year="2021", week="42", day_num=0, action="send"))
+        self.assertFalse(send_in_process(data_dir=self.data_dir, posts_path=self.posts_path))
+        self.assertFalse(isfile(self.posts_path))
+
+    def test_failed_post_releases_key(self):
+        cwm = self.make_manager(active_days=[0])
+        cwm.current_year, cwm.current_week, cwm.day_num = "2021", "42", 0
+        with patch("src.Tagesgericht.TwitterPublisher.publish", side_effect=ConnectionError("offline")):
+            self.assertRaises(ConnectionError, cwm.send_message_for_today)
+        with patch("src.Tagesgericht.TwitterPublisher.publish",
+                   return_value=PublishResult(success=False, error="ConnectionError: offline")):
+            self.assertFalse(cwm.send_message_for_today())
+        self.assertEqual("ConnectionError: offline", cwm.publish_result.error)
+        self.assertTrue(self.storage.claim_action(year="2021", week="42", day_num=0, action="send"))
+
+    def test_publisher_per_credentials(self):
+        cwm = self.make_manager(active_days=[0], credentials={"API_KEY": "a"}, connect_timeout=1, read_timeout=2)
+        publisher = cwm.get_publisher()
+        self.assertIs(publisher, cwm.get_publisher())
+        self.assertEqual((1, 2), publisher.timeout)
+        cwm.credentials = {"API_KEY": "b"}
+        self.assertIsNot(publisher, cwm.get_publisher())
+
+    def test_sqlite_claim_action(self):
+        storage = SQLiteStorage(path=join(self.tmp_dir.name, "tagesgericht.sqlite"), weekday_map={})
+        self.assertTrue(storage.claim_action(year="2021", week="42", day_num=0, action="send"))
+        self.assertFalse(storage.claim_action(year="2021", week="42", day_num=0, action="send"))
+        self.assertTrue(storage.claim_action(year="2021", week="42", day_num=0, action="stop"))
+        storage.release_action(year="2021", week="42", day_num=0, action="send")
+        self.assertTrue(storage.claim_action(year="2021", week="42", day_num=0, action="send"))
+        storage.close()
+
+
+class TestOutbox(DataTreeTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.make_data_tree(weeks=[("2021", "42")], days={"0_Montag.txt": "Schnitzel"})
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeTwitterHandler)
+        self.server.posts = []
+        self.server.failures = 0
+        self.server.delay = 0
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        self.cwm = self.get_manager()
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def get_manager(self) -> TagesgerichtManager:
+        cwm = self.make_manager(active_days=[0], credentials={
+            "API_KEY": "key", "API_KEY_SECRET": "secret", "ACCESS_TOKEN": "token", "ACCESS_TOKEN_SECRET": "secret",
+            "BASE_URL": "http://127.0.0.1:{}".format(self.server.server_port)}, connect_timeout=1, read_timeout=2)
+        cwm.current_year, cwm.current_week, cwm.day_num = "2021", "42", 0
+        return cwm
+
+    def get_logentrys(self) -> list:
+        return self.cwm.storage.load_week(year="2021", week="42").items[0].logentrys
+
+    def test_queue_survives_restart_and_backs_off(self):
+        self.server.failures = 2
+        self.assertTrue(self.cwm.queue_message_for_today())
+        self.assertFalse(self.cwm.queue_message_for_today())
+        self.assertEqual([], self.server.posts)
+        results = []
+        self.assertEqual(0, self.cwm.deliver_outbox(now=100, results=results))
+        self.assertEqual([False], [result.success for result in results])
+        self.assertEqual(0, self.cwm.deliver_outbox(now=101))
+        self.assertEqual(0, self.cwm.deliver_outbox(now=102))
+        post = self.cwm.get_outbox().list_pending()[0]
+        self.assertEqual([2, 106], [post["attempts"], post["next_attempt"]])
+        self.assertIn("Over capacity", post["error"])
+        self.assertEqual([], self.get_logentrys())
+
+        self.cwm = self.get_manager()
+        self.assertEqual(0, self.cwm.deliver_outbox(now=105))
+        self.assertEqual(1, self.cwm.deliver_outbox(now=106))
+        self.assertEqual(["Schnitzel"] * 3, self.server.posts)
+        self.assertEqual([True], [logentry["message_sent"] for logentry in self.get_logentrys()])
+        self.assertFalse(isfile(join(self.data_dir, "outbox.jsonl")))
+        self.assertEqual(0, self.cwm.deliver_outbox(now=107))
+        self.assertFalse(self.cwm.queue_message_for_today())
+
+    def test_worker_delivers_in_order(self):
+        self.assertFalse(self.cwm.queue_sold_out_message())
+        self.assertTrue(self.cwm.queue_message_for_today())
+        self.assertTrue(self.cwm.queue_sold_out_message())
+        worker = self.cwm.start_outbox_worker(interval=0.01)
+        for _ in range(500):
+            if not isfile(join(self.data_dir, "outbox.jsonl")):
+                break
+            sleep(0.01)
+        worker.stop()
+        self.assertIsNone(self.cwm.publish_result)
+        self.assertEqual(["Schnitzel", "Meal of the day is sold-out!"], self.server.posts)
+        self.assertEqual([False, True], [logentry["message_stopped"] for logentry in self.get_logentrys()])
+
+    def test_lost_log_is_not_posted_again(self):
+        self.assertTrue(self.cwm.queue_message_for_today())
+        self.assertTrue(self.cwm.storage.claim_action(year="2021", week="42", day_num=0, action="send"))
+        self.assertEqual(0, self.cwm.deliver_outbox())
+        self.assertEqual([], self.server.posts)
+        self.assertEqual([], self.cwm.get_outbox().list_pending())
+
+    def test_send_tweet_prints_status(self):
+        """send_tweet tells if the queued message was delivered right away or is still queued"""
+        lconfig = {"outbox": True, "translate": {}}
+        with patch("builtins.print") as lprint:
+            send_tweet(tm=self.cwm, lconfig=lconfig, sold_out=False)
+        self.assertEqual(["fake just posted: Schnitzel", "Tweet was queued", "delivered: 1, still queued: 0"],
+                         [args[0] for args, kwargs in lprint.call_args_list])
+        self.server.posts, self.server.failures = [], 1
+        with patch("builtins.print") as lprint:
+            send_tweet(tm=self.cwm, lconfig=lconfig, sold_out=True)
+        printed = [args[0] for args, kwargs in lprint.call_args_list]
+        self.assertIn("Over capacity", printed[0])
+        self.assertEqual(["Tweet was queued", "delivered: 0, still queued: 1"], printed[1:])
+
+
+class TestBuildHtml(TestCase):
+
+    def setUp(self) -> None:
+        self.calls = Mock()
+        self.tm = self.calls.tm
+        self.tm.report_build_folder = join("Sphinx-docs", "report")
+        self.tm.get_window.return_value = (date(2021, 9, 20), None)
+        self.app = self.calls.Sphinx.return_value
+        self.app.statuscode = 0
+        self.lconfig = {"TagesgerichtManager": self.tm, "weeks_back": 4, "sphinx_parallel": 2}
+        self.modules = {"sphinx": Mock(), "sphinx.application": Mock(Sphinx=self.calls.Sphinx)}
+
+    def test_build_html(self):
+        """the report is created first, then sphinx builds it in this process and reuses its environment"""
+        with patch.dict(sys.modules, self.modules), patch("builtins.print"):
+            timings = build_html(lconfig=self.lconfig)
+        self.calls.Sphinx.assert_called_once_with(
+            srcdir="Sphinx-docs", confdir="Sphinx-docs", outdir=join("Sphinx-docs", "_build", "html"),
+            doctreedir=join("Sphinx-docs", "_build", "doctrees"), buildername="html", freshenv=False, parallel=2)
+        self.app.build.assert_called_once_with(force_all=False)
+        self.tm.create_rst_data.assert_called_once_with(stream=False, pages=False, since=date(2021, 9, 20), until=None)
+        self.assertEqual(["load", "report", "sphinx setup", "sphinx build", "total"], list(timings.keys()))
+        names = [name for name, _, _ in self.calls.mock_calls]
+        self.assertLess(names.index("tm.create_rst_data"), names.index("Sphinx().build"))
+
+    def test_build_html_failed(self):
+        """a failed sphinx build is reported instead of the timings"""
+        self.app.statuscode = 1
+        with patch.dict(sys.modules, self.modules), patch("builtins.print") as lprint:
+            self.assertEqual({}, build_html(lconfig=self.lconfig))
+        lprint.assert_called_once_with("sphinx build failed with status 1, see the messages above")